@@ -156,7 +156,26 @@ def parse_args(argv, codemod_registry: CodemodRegistry):
         "--max-workers",
         type=int,
         default=1,
-        help="maximum number of workers (threads) to use for processing files in parallel",
+        help="maximum number of workers to use for processing files in parallel",
+    )
+    parser.add_argument(
+        "--executor",
+        type=str,
+        default="thread",
+        choices=["thread", "process"],
+        help="whether parallel workers are threads or processes",
+    )
+    parser.add_argument(
+        "--schedule",
+        type=str,
+        default="codemod-major",
+        choices=["codemod-major", "file-major"],
+        help="apply each codemod to all files in turn (codemod-major) or all codemods to each file in turn (file-major, not supported for remediation)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="directory for caching results between runs so that unchanged files can be skipped by codemods and semgrep",
     )
 
     parser.add_argument(
@@ -1,5 +1,8 @@
 import fnmatch
-import itertools
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Sequence
 
@@ -28,39 +31,169 @@ DEFAULT_EXCLUDED_PATHS = [
 ]
 
 
+@lru_cache(maxsize=64)
+def compile_patterns(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    """
+    Compile a set of UNIX glob patterns into a single regular expression that matches any of them.
+
+    Returns `None` if there are no patterns, in which case nothing matches.
+    """
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(
+            f"(?:{fnmatch.translate(os.path.normcase(pattern))})"
+            for pattern in dict.fromkeys(patterns)
+        )
+    )
+
+
+@lru_cache(maxsize=64)
+def compile_line_patterns(
+    patterns: tuple[str, ...],
+) -> tuple[tuple[re.Pattern[str], int], ...]:
+    """
+    Index the `file:line` patterns among a set of patterns by their compiled file glob.
+    """
+    return tuple(
+        (
+            re.compile(fnmatch.translate(os.path.normcase(result[0]))),
+            int(result[1]),
+        )
+        for pattern in patterns
+        if len(result := pattern.split(":")) == 2
+    )
+
+
 def file_line_patterns(file_path: str | Path, patterns: Sequence[str]):
     """
     Find the lines included or excluded for a given file_path among the patterns
     """
-    return [
-        int(result[1])
-        for pat in patterns
-        if len(result := pat.split(":")) == 2
-        and fnmatch.fnmatch(str(file_path), result[0])
-    ]
+    if not (line_patterns := compile_line_patterns(tuple(patterns))):
+        return []
 
+    name = os.path.normcase(str(file_path))
+    return [line for regex, line in line_patterns if regex.match(name)]
 
-def filter_files(names: list[Path], patterns: Sequence[str], exclude: bool = False):
-    patterns = (
+
+def glob_patterns(patterns: Sequence[str], exclude: bool = False) -> tuple[str, ...]:
+    """
+    Return the file globs of include or exclude patterns, which may also refer to lines as `file:line`.
+    """
+    return tuple(
         [x.split(":")[0] for x in (patterns or [])]
         if not exclude
         # An excluded line should not cause the entire file to be excluded
         else [x for x in (patterns or []) if ":" not in x]
     )
-    return itertools.chain(
-        *[fnmatch.filter((str(x) for x in names), pattern) for pattern in patterns]
+
+
+def filter_files(names: list[Path], patterns: Sequence[str], exclude: bool = False):
+    if (matcher := compile_patterns(glob_patterns(patterns, exclude))) is None:
+        return iter(())
+    return (
+        name
+        for name in (str(x) for x in names)
+        if matcher.match(os.path.normcase(name))
     )
 
 
-def files_for_directory(parent_path: Path) -> list[Path]:
+def directory_exclude_patterns(patterns: Sequence[str]) -> list[str]:
+    """
+    Reduce the exclude patterns that exclude everything below a directory (e.g. `build/**`) to the part that the
+    directory itself has to match (e.g. `build/`).
+
+    Any file whose path starts with a directory matching one of the reduced patterns is excluded by the original pattern,
+    so there is no need to walk such a directory at all.
+    """
+    prefixes = []
+    for pattern in patterns:
+        if ":" in pattern:
+            # An excluded line should not cause the entire file to be excluded
+            continue
+        if (prefix := pattern.rstrip("*")) != pattern and prefix.endswith("/"):
+            prefixes.append(prefix)
+    return prefixes
+
+
+def in_pruned_directory(path: Path, exclude_paths: Sequence[str]) -> bool:
+    """
+    Whether a path relative to the walked directory lies within a directory that `list_directory` prunes for
+    `exclude_paths`.
+    """
+    if (
+        prune := compile_patterns(tuple(directory_exclude_patterns(exclude_paths)))
+    ) is None:
+        return False
+    prefix = ""
+    for part in path.parts[:-1]:
+        prefix = f"{prefix}{part}/"
+        if prune.match(os.path.normcase(prefix)):
+            return True
+    return False
+
+
+@dataclass
+class DirectoryListing:
+    """
+    Files found within a directory, recursively.
+
+    `files` are the regular files, which are the only ones that codemods analyze. `all_files` also includes symbolic
+    links to files, in the same order as they were found.
+    """
+
+    files: list[Path] = field(default_factory=list)
+    all_files: list[Path] = field(default_factory=list)
+
+
+def list_directory(
+    parent_path: Path, exclude_paths: Optional[Sequence[str]] = None
+) -> DirectoryListing:
+    """
+    List the files within a directory, recursively, without following symbolic links to directories.
+
+    Directories that are entirely excluded by `exclude_paths` are pruned without being walked. Files are listed in the
+    same order as `Path.rglob`: the entries of each directory before those of its subdirectories.
+    """
+    prune = compile_patterns(tuple(directory_exclude_patterns(exclude_paths or [])))
+    listing = DirectoryListing()
+    # Each directory is paired with its path relative to the parent, which is what the patterns are matched against
+    stack: list[tuple[Path, str]] = [(Path(parent_path), "")]
+    while stack:
+        directory, relative = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            # Use the type information from the directory listing rather than an extra stat call
+            if entry.is_file(follow_symlinks=False):
+                listing.files.append(path := directory / entry.name)
+                listing.all_files.append(path)
+            elif entry.is_dir(follow_symlinks=False):
+                child = f"{relative}{entry.name}/"
+                if prune is None or not prune.match(os.path.normcase(child)):
+                    subdirectories.append((directory / entry.name, child))
+            elif entry.is_symlink() and entry.is_file():
+                listing.all_files.append(directory / entry.name)
+        stack.extend(reversed(subdirectories))
+
+    return listing
+
+
+def files_for_directory(
+    parent_path: Path, exclude_paths: Optional[Sequence[str]] = None
+) -> list[Path]:
     """
     Return list of all (non-symlink) file paths within a directory, recursively.
+
+    Directories that are entirely excluded by `exclude_paths` are pruned without being walked. Files are listed in the
+    same order as `Path.rglob`: the entries of each directory before those of its subdirectories.
     """
-    return [
-        path
-        for path in Path(parent_path).rglob("*")
-        if Path(path).is_file() and not Path(path).is_symlink()
-    ]
+    return list_directory(parent_path, exclude_paths).files
 
 
 def match_files(
@@ -82,21 +215,26 @@ def match_files(
     :return: list of <pathlib.PosixPath> files found within (including recursively) the parent directory
     that match the criteria of both exclude and include patterns.
     """
-    paths = [p.relative_to(parent_path) for p in input_paths]
-    included_files = set(
-        filter_files(
-            paths,
-            include_paths if include_paths is not None else DEFAULT_INCLUDED_PATHS,
+    include = compile_patterns(
+        glob_patterns(
+            include_paths if include_paths is not None else DEFAULT_INCLUDED_PATHS
         )
     )
-    excluded_files = set(
-        filter_files(
-            paths,
+    exclude = compile_patterns(
+        glob_patterns(
             exclude_paths if exclude_paths is not None else DEFAULT_EXCLUDED_PATHS,
             exclude=True,
         )
     )
+    if include is None:
+        return []
+
+    # A single pass over the paths no matter how many patterns there are
+    matched = set()
+    for path in input_paths:
+        name = str(path.relative_to(parent_path))
+        normalized = os.path.normcase(name)
+        if include.match(normalized) and not (exclude and exclude.match(normalized)):
+            matched.add(name)
 
-    return [
-        parent_path.joinpath(p) for p in sorted(list(included_files - excluded_files))
-    ]
+    return [parent_path.joinpath(p) for p in sorted(matched)]
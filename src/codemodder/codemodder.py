@@ -4,23 +4,34 @@ import logging
 import os
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import DefaultDict, Sequence
 
 from codemodder import __version__, providers, registry
 from codemodder.cli import parse_args
 from codemodder.codemods.api import BaseCodemod
-from codemodder.codemods.semgrep import SemgrepRuleDetector
+from codemodder.codemods.process_pool import chunksize, transform_chain
+from codemodder.codemods.semgrep import (
+    SemgrepRuleDetector,
+    codemod_rules,
+    rescan,
+    semgrep_rule_file,
+)
 from codemodder.codetf import CodeTF
+from codemodder.codetf.common import ResultSpool
 from codemodder.context import CodemodExecutionContext
 from codemodder.dependency import Dependency
+from codemodder.file_context import FileContext, ProcessedFile
+from codemodder.incremental_cache import IncrementalCache, run_fingerprint
 from codemodder.llm import TokenUsage, log_token_usage
 from codemodder.logging import configure_logger, log_list, log_section, logger
 from codemodder.project_analysis.file_parsers.package_store import PackageStore
 from codemodder.project_analysis.python_repo_manager import PythonRepoManager
-from codemodder.result import ResultSet
-from codemodder.sarifs import detect_sarif_tools
+from codemodder.result import Result, ResultSet
+from codemodder.sarifs import SarifDocumentCache, detect_sarif_tools
 from codemodder.semgrep import run as run_semgrep
+from codemodder.semgrep_cache import SemgrepResultCache
 
 
 def find_semgrep_results(
@@ -28,22 +39,11 @@ def find_semgrep_results(
     codemods: Sequence[BaseCodemod],
     files_to_analyze: list[Path] | None = None,
 ) -> ResultSet:
-    """Run semgrep once with all configuration files from all codemods and return a set of applicable rule IDs"""
-    if not (
-        yaml_files := list(
-            itertools.chain.from_iterable(
-                [
-                    codemod.detector.get_yaml_files(codemod._internal_name)
-                    for codemod in codemods
-                    if codemod.detector
-                    and isinstance(codemod.detector, SemgrepRuleDetector)
-                ]
-            )
-        )
-    ):
+    """Run semgrep once with the rules from all codemods merged into one configuration file and return a set of applicable rule IDs"""
+    if not (rules := codemod_rules(codemods)):
         return ResultSet()
 
-    return run_semgrep(context, yaml_files, files_to_analyze)
+    return run_semgrep(context, [semgrep_rule_file(rules)], files_to_analyze)
 
 
 def log_report(context, output, elapsed_ms, files_to_analyze, token_usage):
@@ -66,14 +66,37 @@ def log_report(context, output, elapsed_ms, files_to_analyze, token_usage):
     logger.info("total elapsed: %s ms", elapsed_ms)
     logger.info("  semgrep:     %s ms", context.timer.get_time_ms("semgrep"))
     logger.info("  parse:       %s ms", context.timer.get_time_ms("parse"))
+    logger.debug(
+        "  parse cache: %s hits, %s misses",
+        context.module_cache.hits,
+        context.module_cache.misses,
+    )
     logger.info("  transform:   %s ms", context.timer.get_time_ms("transform"))
     logger.info("  write:       %s ms", context.timer.get_time_ms("write"))
+    logger.debug(
+        "  result set cache: %s hits, %s misses",
+        context.result_sets.hits,
+        context.result_sets.misses,
+    )
+    if context.incremental_cache is not None:
+        logger.info(
+            "incremental cache: %s hits, %s misses",
+            context.incremental_cache.hits,
+            context.incremental_cache.misses,
+        )
+    if context.semgrep_cache is not None:
+        logger.info(
+            "semgrep cache: %s hits, %s misses",
+            context.semgrep_cache.hits,
+            context.semgrep_cache.misses,
+        )
 
 
 def apply_codemods(
     context: CodemodExecutionContext,
     codemods_to_run: Sequence[BaseCodemod],
     remediation: bool,
+    schedule: str = "codemod-major",
 ) -> TokenUsage:
     log_section("scanning")
     token_usage = TokenUsage()
@@ -86,6 +109,13 @@ def apply_codemods(
         logger.info("no codemods to run")
         return token_usage
 
+    if schedule == "file-major":
+        if not remediation:
+            apply_codemods_file_major(context, codemods_to_run)
+            context.write_dependencies()
+            return token_usage
+        logger.info("file-major schedule is not supported for remediation")
+
     # run codemods one at a time making sure to respect the given sequence
     for codemod in codemods_to_run:
         # NOTE: this may be used as a progress indicator by upstream tools
@@ -94,11 +124,135 @@ def apply_codemods(
             log_token_usage(f"Codemod {codemod.id}", codemod_token_usage)
             token_usage += codemod_token_usage
 
-        record_dependency_update(context.process_dependencies(codemod.id))
-        context.log_changes(codemod.id)
+        process_dependencies(context, codemod)
+
+    context.write_dependencies()
     return token_usage
 
 
+def apply_codemods_file_major(
+    context: CodemodExecutionContext,
+    codemods_to_run: Sequence[BaseCodemod],
+):
+    """
+    Apply every codemod to one file before moving on to the next file
+
+    All detectors are run up front, so detector results reflect the state of the
+    files before any codemod was applied. Each file is then passed through the
+    ordered chain of applicable codemods in a single pass, which keeps its parsed
+    tree warm in the module cache. Once a codemod in the chain has changed the file,
+    it is scanned again with the semgrep rules of the rest of the chain in a single
+    run, so that their results match the current contents, as they would with the
+    codemod-major schedule. Results are
+    still reported per codemod in the order each codemod would have produced them.
+    """
+    prepared: list[tuple[BaseCodemod, ResultSet | None, list[Path]]] = []
+    for codemod in codemods_to_run:
+        # NOTE: this may be used as a progress indicator by upstream tools
+        logger.info("running codemod %s", codemod.id)
+        if plan := codemod.prepare(context):
+            results, files_to_analyze = plan
+            prepared.append((codemod, results, files_to_analyze))
+
+    chains: dict[Path, list[tuple[BaseCodemod, ResultSet | None]]] = {}
+    for codemod, results, files_to_analyze in prepared:
+        for path in files_to_analyze:
+            chains.setdefault(path, []).append((codemod, results))
+
+    def process_chain(path: Path) -> list[tuple[str, FileContext | ProcessedFile]]:
+        contexts: list[tuple[str, FileContext | ProcessedFile]] = []
+        changed = False
+        rescanned: ResultSet | None = None
+        for index, (codemod, results) in enumerate(chains[path]):
+            if changed and isinstance(codemod.detector, SemgrepRuleDetector):
+                # Results found before an earlier codemod changed the file are stale
+                if rescanned is None:
+                    logger.debug("rescanning %s", path)
+                    rescanned = rescan(
+                        context,
+                        [codemod for codemod, _ in chains[path][index:]],
+                        [path],
+                    )
+                results = rescanned
+            file_context = codemod._process_file(path, context, results, codemod.rules)
+            if file_context.changesets and not context.dry_run:
+                changed = True
+                rescanned = None
+            contexts.append((codemod.id, file_context))
+        return contexts
+
+    def chain_steps(
+        path: Path,
+    ) -> tuple[list[tuple[BaseCodemod, list[Result] | None, bool]], str | None]:
+        steps: list[tuple[BaseCodemod, list[Result] | None, bool]] = []
+        digest = None
+        for codemod, results in chains[path]:
+            skip, digest = codemod._check_incremental_cache(context, path)
+            findings = codemod._findings_for_file(path, context, results, codemod.rules)
+            steps.append((codemod, findings, skip))
+        return steps, digest
+
+    processed: list[list[tuple[str, FileContext | ProcessedFile]]] = []
+    if context.max_workers == 1:
+        logger.debug("processing files serially")
+        processed.extend([process_chain(path) for path in chains])
+    # Providers are not available to worker processes
+    elif context.executor == "process" and not any(
+        codemod.provider for codemod, _, _ in prepared
+    ):
+        logger.debug("using process pool with %s workers", context.max_workers)
+        plans = [chain_steps(path) for path in chains]
+        for path, (steps, _), step_results in zip(
+            chains,
+            plans,
+            context.process_pool.map(
+                transform_chain,
+                chains,
+                [steps for steps, _ in plans],
+                [digest for _, digest in plans],
+                chunksize=chunksize(context, len(chains)),
+            ),
+        ):
+            contexts: list[tuple[str, FileContext | ProcessedFile]] = []
+            for (codemod, _, _), (digest, processed_file) in zip(steps, step_results):
+                codemod._record_incremental_cache(context, path, digest, processed_file)
+                contexts.append((codemod.id, processed_file))
+            processed.append(contexts)
+    else:
+        with ThreadPoolExecutor(max_workers=context.max_workers) as executor:
+            logger.debug("using executor with %s workers", context.max_workers)
+            processed.extend(executor.map(process_chain, chains))
+
+    file_contexts: dict[str, dict[Path, FileContext | ProcessedFile]] = defaultdict(
+        dict
+    )
+    for path, chain_contexts in zip(chains, processed):
+        for codemod_id, file_context in chain_contexts:
+            file_contexts[codemod_id][path] = file_context
+
+    for codemod, _, files_to_analyze in prepared:
+        context.process_results(
+            codemod.id,
+            [file_contexts[codemod.id][path] for path in files_to_analyze],
+        )
+
+    for codemod in codemods_to_run:
+        process_dependencies(context, codemod)
+
+
+def process_dependencies(context: CodemodExecutionContext, codemod: BaseCodemod):
+    """
+    Add the dependencies of a codemod once it has made all its code changes
+
+    The dependency files are only written by `write_dependencies` at the end of the run, so each is written once no
+    matter how many codemods add dependencies to it. The result of the codemod is complete once its dependencies are
+    added, so it is spooled right away.
+    """
+    record_dependency_update(context.process_dependencies(codemod.id))
+    context.log_changes(codemod.id)
+    context.spool_result(codemod)
+
+
 def record_dependency_update(dependency_results: dict[Dependency, PackageStore | None]):
     # TODO populate dependencies in CodeTF here
     inverse: dict[None | str, list[Dependency]] = {}
@@ -131,11 +285,15 @@ def run(
     codemod_include: list[str] | None = None,
     codemod_exclude: list[str] | None = None,
     max_workers: int = 1,
+    executor: str = "thread",
     original_cli_args: list[str] | None = None,
     codemod_registry: registry.CodemodRegistry | None = None,
     sast_only: bool = False,
     log_matched_files: bool = False,
     remediation: bool = False,
+    schedule: str = "codemod-major",
+    cache_dir: Path | str | None = None,
+    sarif_documents: SarifDocumentCache | None = None,
 ) -> tuple[CodeTF | None, int, TokenUsage]:
     start = datetime.datetime.now()
 
@@ -172,9 +330,11 @@ def run(
         path_exclude,
         tool_result_files_map,
         max_workers,
+        executor,
+        sarif_documents,
     )
 
-    context.repo_manager.parse_project()
+    context.repo_manager.parse_project(context.directory_listing.all_files)
 
     # TODO: this should be a method of CodemodExecutionContext
     codemods_to_run = codemod_registry.match_codemods(
@@ -195,26 +355,62 @@ def run(
             (str(path) for path in context.files_to_analyze),
         )
 
+    if cache_dir:
+        context.semgrep_cache = SemgrepResultCache(Path(cache_dir))
+
     context.semgrep_prefilter_results = find_semgrep_results(
         context,
         codemods_to_run,
         context.find_and_fix_paths,
     )
 
-    token_usage = apply_codemods(context, codemods_to_run, remediation)
-
-    elapsed = datetime.datetime.now() - start
-    elapsed_ms = int(elapsed.total_seconds() * 1000)
+    if cache_dir:
+        context.incremental_cache = IncrementalCache.load(
+            Path(cache_dir),
+            run_fingerprint(
+                __version__,
+                [codemod.id for codemod in codemods_to_run],
+                path_include,
+                path_exclude,
+                itertools.chain(*tool_result_files_map.values()),
+            ),
+            context.directory,
+        )
 
-    logger.debug("Output format %s", output_format)
-    codetf = CodeTF.build(
-        context,
-        elapsed_ms,
-        original_cli_args or [],
-        context.compile_results(codemods_to_run),
-    )
     if output:
-        codetf.write_report(output)
+        # Results are spooled as each codemod finishes rather than kept in memory until the report is written
+        context.result_spool = ResultSpool(Path(output).parent)
+
+    try:
+        try:
+            token_usage = apply_codemods(
+                context, codemods_to_run, remediation, schedule
+            )
+        finally:
+            context.shutdown_process_pool()
+
+        if context.incremental_cache is not None:
+            try:
+                context.incremental_cache.save()
+            except OSError as err:
+                logger.warning("failed to save incremental cache: %s", err)
+
+        elapsed = datetime.datetime.now() - start
+        elapsed_ms = int(elapsed.total_seconds() * 1000)
+
+        logger.debug("Output format %s", output_format)
+        # Spooled results are only in the report
+        codetf = CodeTF.build(
+            context,
+            elapsed_ms,
+            original_cli_args or [],
+            context.compile_results(codemods_to_run),
+        )
+        if output:
+            codetf.write_report(output, context.result_spool)
+    finally:
+        if context.result_spool is not None:
+            context.result_spool.close()
 
     log_report(
         context,
@@ -236,9 +432,15 @@ def _run_cli(original_args, remediation=False) -> int:
         )
         return 1
 
+    if remediation and argv.schedule == "file-major":
+        logger.error("the file-major schedule is not supported for remediation")
+        return 1
+
+    # Documents parsed while detecting tools are reused when loading their results
+    sarif_documents = SarifDocumentCache()
     try:
         tool_result_files_map: DefaultDict[str, list[Path]] = detect_sarif_tools(
-            [Path(name) for name in argv.sarif or []]
+            [Path(name) for name in argv.sarif or []], sarif_documents
         )
     except FileNotFoundError as err:
         logger.error(err)
@@ -276,6 +478,7 @@ def _run_cli(original_args, remediation=False) -> int:
         argv.codemod_include,
         argv.codemod_exclude,
         max_workers=argv.max_workers,
+        executor=argv.executor,
         original_cli_args=original_args,
         codemod_registry=codemod_registry,
         sast_only=argv.sonar_issues_json
@@ -284,6 +487,9 @@ def _run_cli(original_args, remediation=False) -> int:
         or argv.sonar_json,
         log_matched_files=True,
         remediation=remediation,
+        schedule=argv.schedule,
+        cache_dir=argv.cache_dir,
+        sarif_documents=sarif_documents,
     )
     return status
 
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import functools
 import importlib.resources
 import sys
 from abc import ABCMeta, abstractmethod
@@ -18,13 +17,14 @@ else:
 from codemodder.code_directory import file_line_patterns
 from codemodder.codemods.base_detector import BaseDetector
 from codemodder.codemods.base_transformer import BaseTransformerPipeline
+from codemodder.codemods.process_pool import chunksize, transform_file
 from codemodder.codemods.semgrep import SemgrepRuleDetector
 from codemodder.codetf import DetectionTool, Reference
 from codemodder.context import CodemodExecutionContext
-from codemodder.file_context import FileContext
+from codemodder.file_context import FileContext, ProcessedFile
 from codemodder.llm import TokenUsage
 from codemodder.logging import logger
-from codemodder.result import ResultSet
+from codemodder.result import Result, ResultSet
 
 
 class ReviewGuidance(Enum):
@@ -190,13 +190,18 @@ class BaseCodemod(metaclass=ABCMeta):
         """
         ...
 
-    def _apply_remediation(
-        self,
-        context: CodemodExecutionContext,
-        rules: list[str],
-    ) -> None | TokenUsage:
+    @property
+    def rules(self) -> list[str]:
+        """Rule IDs of the results that this codemod will apply."""
+        return [self._internal_name]
+
+    def prepare(
+        self, context: CodemodExecutionContext
+    ) -> tuple[ResultSet | None, list[Path]] | None:
         """
-        Applies remediation behavior to a codemod, that is, each changeset will only be associated with a single finging and no files will be written.
+        Run the detector (if any) and determine which files the codemod should be applied to
+
+        Returns `None` if the codemod has nothing to do, otherwise the detector results and the files to analyze.
         """
         if self._should_skip(context):
             return None
@@ -210,6 +215,20 @@ class BaseCodemod(metaclass=ABCMeta):
             logger.debug("No files matched for %s", self.id)
             return None
 
+        return results, files_to_analyze
+
+    def _apply_remediation(
+        self,
+        context: CodemodExecutionContext,
+        rules: list[str],
+    ) -> None | TokenUsage:
+        """
+        Applies remediation behavior to a codemod, that is, each changeset will only be associated with a single finging and no files will be written.
+        """
+        if not (prepared := self.prepare(context)):
+            return None
+        results, files_to_analyze = prepared
+
         # Do each result independently and outputs the diffs
         # gather positional arguments for the map
         resultset_arguments: list[ResultSet | None] = []
@@ -229,19 +248,14 @@ class BaseCodemod(metaclass=ABCMeta):
             resultset_arguments = [None]
             path_arguments = files_to_analyze
 
-        contexts: list = []
-        with ThreadPoolExecutor() as executor:
-            logger.debug("using executor with %s workers", context.max_workers)
-            contexts.extend(
-                executor.map(
-                    lambda path, resultset: self._process_file(
-                        path, context, resultset, rules
-                    ),
-                    path_arguments,
-                    resultset_arguments or [None],
-                )
-            )
-            executor.shutdown(wait=True)
+        # Files beyond the number of result sets are not processed
+        pairs = list(zip(path_arguments, resultset_arguments or [None]))
+        contexts = self._process_files(
+            context,
+            [path for path, _ in pairs],
+            [resultset for _, resultset in pairs],
+            rules,
+        )
 
         context.process_results(self.id, contexts)
         return None
@@ -254,35 +268,85 @@ class BaseCodemod(metaclass=ABCMeta):
         """
         Applies hardening behavior to a codemod with the goal of integrating all fixes for each finding into the files.
         """
-        if self._should_skip(context):
-            return None
-        results: ResultSet | None = self._apply_detector(context)
-
-        if results is not None and not results:
-            logger.debug("No results for %s", self.id)
-            return None
-
-        if not (files_to_analyze := self.get_files_to_analyze(context, results)):
-            logger.debug("No files matched for %s", self.id)
+        if not (prepared := self.prepare(context)):
             return None
+        results, files_to_analyze = prepared
 
         # Hardens all findings per file at once and writes the fixed code into the file
-        process_file = functools.partial(
-            self._process_file, context=context, results=results, rules=rules
+        contexts = self._process_files(
+            context,
+            files_to_analyze,
+            [results] * len(files_to_analyze),
+            rules,
         )
 
-        contexts = []
+        context.process_results(self.id, contexts)
+        return None
+
+    def _process_files(
+        self,
+        context: CodemodExecutionContext,
+        paths: list[Path],
+        resultsets: list[ResultSet | None],
+        rules: list[str],
+    ) -> list[FileContext | ProcessedFile]:
+        """
+        Process each path with its corresponding result set according to the `max_workers` and `executor` settings.
+
+        Every path gets a result in the same order, with an empty `FileContext` for files skipped by the incremental
+        cache.
+        """
         if context.max_workers == 1:
             logger.debug("processing files serially")
-            contexts.extend([process_file(file) for file in files_to_analyze])
-        else:
-            with ThreadPoolExecutor() as executor:
-                logger.debug("using executor with %s workers", context.max_workers)
-                contexts.extend(executor.map(process_file, files_to_analyze))
-                executor.shutdown(wait=True)
+            return [
+                self._process_file(path, context, results, rules)
+                for path, results in zip(paths, resultsets)
+            ]
 
-        context.process_results(self.id, contexts)
-        return None
+        # Providers are not available to worker processes
+        if context.executor == "process" and not self.provider:
+            contexts: list[FileContext | ProcessedFile] = [
+                FileContext(context.directory, path) for path in paths
+            ]
+            pending: list[int] = []
+            findings: list[list[Result] | None] = []
+            digests: list[str | None] = []
+            for index, (path, results) in enumerate(zip(paths, resultsets)):
+                skip, digest = self._check_incremental_cache(context, path)
+                if not skip:
+                    pending.append(index)
+                    findings.append(
+                        self._findings_for_file(path, context, results, rules)
+                    )
+                    digests.append(digest)
+
+            logger.debug("using process pool with %s workers", context.max_workers)
+            processed = context.process_pool.map(
+                transform_file,
+                [self] * len(pending),
+                [paths[index] for index in pending],
+                findings,
+                chunksize=chunksize(context, len(pending)),
+            )
+
+            for index, digest, processed_file in zip(pending, digests, processed):
+                self._record_incremental_cache(
+                    context, paths[index], digest, processed_file
+                )
+                contexts[index] = processed_file
+            return contexts
+
+        with ThreadPoolExecutor(max_workers=context.max_workers) as executor:
+            logger.debug("using executor with %s workers", context.max_workers)
+            return list(
+                executor.map(
+                    lambda path, results: self._process_file(
+                        path, context, results, rules
+                    ),
+                    paths,
+                    resultsets,
+                )
+            )
 
     def _should_skip(self, context: CodemodExecutionContext):
         if self.provider and (
@@ -337,8 +401,26 @@ class BaseCodemod(metaclass=ABCMeta):
         :param context: The codemod execution context
         """
         if remediation:
-            return self._apply_remediation(context, [self._internal_name])
-        return self._apply_hardening(context, [self._internal_name])
+            return self._apply_remediation(context, self.rules)
+        return self._apply_hardening(context, self.rules)
+
+    def _findings_for_file(
+        self,
+        filename: Path,
+        context: CodemodExecutionContext,
+        results: ResultSet | None,
+        rules: list[str],
+    ) -> list[Result] | None:
+        if results is None:
+            return None
+
+        findings_for_rule = []
+        for rule in rules:
+            findings_for_rule.extend(
+                results.results_for_rule_and_file(context, rule, filename)
+            )
+        logger.debug("%d findings for %s", len(findings_for_rule), filename)
+        return findings_for_rule
 
     def _process_file(
         self,
@@ -347,17 +429,49 @@ class BaseCodemod(metaclass=ABCMeta):
         results: ResultSet | None,
         rules: list[str],
     ):
+        skip, digest = self._check_incremental_cache(context, filename)
+        if skip:
+            return FileContext(context.directory, filename)
+
+        file_context = self._transform_file(
+            filename,
+            context,
+            self._findings_for_file(filename, context, results, rules),
+        )
+        self._record_incremental_cache(context, filename, digest, file_context)
+        return file_context
+
+    def _check_incremental_cache(
+        self, context: CodemodExecutionContext, filename: Path
+    ) -> tuple[bool, str | None]:
+        if context.incremental_cache is None:
+            return False, None
+
+        skip, digest = context.incremental_cache.check(self.id, filename)
+        if skip:
+            logger.debug(
+                "%s is unchanged since it was last processed, skipping", filename
+            )
+        return skip, digest
+
+    def _record_incremental_cache(
+        self,
+        context: CodemodExecutionContext,
+        filename: Path,
+        digest: str | None,
+        result: FileContext | ProcessedFile,
+    ):
+        if context.incremental_cache is not None and digest is not None:
+            context.incremental_cache.record(self.id, filename, digest, result)
+
+    def _transform_file(
+        self,
+        filename: Path,
+        context: CodemodExecutionContext,
+        findings_for_rule: list[Result] | None,
+    ) -> FileContext:
         line_exclude = file_line_patterns(filename, context.path_exclude)
         line_include = file_line_patterns(filename, context.path_include)
-        findings_for_rule = None
-        if results is not None:
-            findings_for_rule = []
-            for rule in rules:
-                findings_for_rule.extend(
-                    results.results_for_rule_and_file(context, rule, filename)
-                )
-            logger.debug("%d findings for %s", len(findings_for_rule), filename)
-
         file_context = FileContext(
             context.directory,
             filename,
@@ -365,7 +479,7 @@ class BaseCodemod(metaclass=ABCMeta):
             line_include,
             findings_for_rule,
         )
-        if results is not None and not findings_for_rule:
+        if findings_for_rule is not None and not findings_for_rule:
             logger.debug("no findings for %s, short-circuiting analysis", filename)
             return file_context
 
@@ -436,12 +550,9 @@ class RemediationCodemod(BaseCodemod, metaclass=ABCMeta):
         if requested_rules:
             self.requested_rules.extend(requested_rules)
 
-    def apply(
-        self, context: CodemodExecutionContext, remediation: bool = False
-    ) -> None | TokenUsage:
-        if remediation:
-            return self._apply_remediation(context, self.requested_rules)
-        return self._apply_hardening(context, self.requested_rules)
+    @property
+    def rules(self) -> list[str]:
+        return self.requested_rules
 
     def get_files_to_analyze(
         self,
@@ -451,19 +562,16 @@ class RemediationCodemod(BaseCodemod, metaclass=ABCMeta):
         """
         Get the list of files to analyze based on which files have findings associated with the requested rules
 
-        Using `context.files_to_analyze` includes all files in the directory. These paths are filtered by locations that are
-        associated with findings for the requested rules. Finally these paths are filtered according to user-provided `path_include`
-        and `path_exclude` settings using `context.filter_paths`.
+        The files associated with findings for the requested rules are looked up in the result set and restricted to regular
+        files within the directory using `context.is_project_file`. Finally these paths are filtered according to
+        user-provided `path_include` and `path_exclude` settings using `context.filter_paths`.
         """
         return context.filter_paths(
             [
                 path
-                for path in context.files_to_analyze
+                for path in results.files_for_rules(context, self.requested_rules)
                 if path.suffix in (self.default_extensions or [])
-                and any(
-                    results.results_for_rule_and_file(context, rule_id, path)
-                    for rule_id in self.requested_rules
-                )
+                and context.is_project_file(path)
             ]
             if results
             else []
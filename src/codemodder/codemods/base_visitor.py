@@ -1,4 +1,3 @@
-from functools import cache
 from typing import ClassVar, Collection, cast
 
 import libcst as cst
@@ -7,12 +6,13 @@ from libcst._position import CodePosition, CodeRange
 from libcst.codemod import ContextAwareVisitor, VisitorBasedCodemodCommand
 from libcst.metadata import PositionProvider, ProviderT
 
-from codemodder.result import Result
+from codemodder.result import Result, ResultLineIndex
 
 
 # TODO: this should just be part of BaseTransformer and BaseVisitor?
 class UtilsMixin(MetadataDependent):
     METADATA_DEPENDENCIES: ClassVar[Collection[ProviderT]] = (PositionProvider,)
+    _results_index: ResultLineIndex | None = None
 
     def __init__(
         self,
@@ -28,18 +28,28 @@ class UtilsMixin(MetadataDependent):
         # Codemods with detectors will only run their transformations if there are results.
         return self.results is None or any(self.results_for_node(node))
 
-    @cache
     def results_for_node(self, node: cst.CSTNode) -> list[Result]:
+        if not self.results:
+            return []
         pos_to_match = self.node_position(node)
-        return (
-            [
-                result
-                for result in self.results
-                if result.match_location(pos_to_match, node)
-            ]
-            if self.results
-            else []
-        )
+        return [
+            result
+            for result in self.results_index().candidates(pos_to_match)
+            if result.match_location(pos_to_match, node)
+        ]
+
+    def results_index(self) -> ResultLineIndex:
+        """
+        Index of the results by line, built once for this transform.
+
+        The index is rebuilt if the results are replaced.
+        """
+        if (
+            self._results_index is None
+            or self._results_index.results is not self.results
+        ):
+            self._results_index = ResultLineIndex(self.results or [])
+        return self._results_index
 
     def filter_by_path_includes_or_excludes(self, pos_to_match):
         """
@@ -1,9 +1,11 @@
-from functools import cache
+from pathlib import Path
+from typing import Sequence
 
 from codemodder.codemods.base_detector import BaseDetector
 from codemodder.codeql import CodeQLResultSet
 from codemodder.context import CodemodExecutionContext
 from codemodder.result import ResultSet
+from codemodder.sarifs import SarifDocumentCache
 
 
 class CodeQLSarifFileDetector(BaseDetector):
@@ -13,14 +15,19 @@ class CodeQLSarifFileDetector(BaseDetector):
         context: CodemodExecutionContext,
     ) -> ResultSet:
         del codemod_id
-        return process_codeql_findings(
-            tuple(context.tool_result_files_map.get("codeql", ()))
-        )  # Convert list to tuple for cache hashability
+        files = context.tool_result_files_map.get("codeql", [])
+        return context.result_sets.get(
+            "codeql",
+            files,
+            lambda: process_codeql_findings(files, context.sarif_documents),
+        )
 
 
-@cache
-def process_codeql_findings(codeql_sarif_files: tuple[str]) -> ResultSet:
+def process_codeql_findings(
+    codeql_sarif_files: Sequence[str | Path],
+    documents: SarifDocumentCache | None = None,
+) -> ResultSet:
     results = CodeQLResultSet()
     for file in codeql_sarif_files or ():
-        results |= CodeQLResultSet.from_sarif(file)
+        results |= CodeQLResultSet.from_sarif(file, documents=documents)
     return results
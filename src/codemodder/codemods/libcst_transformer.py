@@ -1,4 +1,6 @@
 from collections import namedtuple
+from contextlib import contextmanager
+from typing import Generator
 
 import libcst as cst
 from libcst import matchers
@@ -57,9 +59,17 @@ class LibcstResultTransformer(BaseTransformer):
 
     @classmethod
     def transform(
-        cls, module: cst.Module, results: list[Result] | None, file_context: FileContext
+        cls,
+        module: cst.Module,
+        results: list[Result] | None,
+        file_context: FileContext,
+        wrapper: cst.MetadataWrapper | None = None,
     ) -> cst.Module:
-        wrapper = cst.MetadataWrapper(module)
+        """
+        Transform the module, reusing the metadata already resolved by `wrapper` if it wraps this exact module.
+        """
+        if wrapper is None or wrapper.module is not module:
+            wrapper = cst.MetadataWrapper(module)
         codemod = cls(
             CodemodContext(wrapper=wrapper),
             results,
@@ -67,7 +77,21 @@ class LibcstResultTransformer(BaseTransformer):
             _transformer=True,
         )
 
-        return codemod.transform_module(module)
+        return codemod.transform_module(wrapper.module)
+
+    @contextmanager
+    def _handle_metadata_reference(
+        self, module: cst.Module
+    ) -> Generator[cst.Module, None, None]:
+        # libcst wraps (and copies) the module again on every pass, which throws away any metadata that has
+        # already been resolved for it
+        if (wrapper := self.context.wrapper) is None or wrapper.module is not module:
+            with super()._handle_metadata_reference(module) as tree:
+                yield tree
+            return
+
+        with self.resolve(wrapper):
+            yield module
 
     def _new_or_updated_node(self, original_node, updated_node):
         if self.node_is_selected(original_node):
@@ -263,17 +287,26 @@ class LibcstTransformerPipeline(BaseTransformerPipeline):
 
         try:
             with file_context.timer.measure("parse"):
-                source_tree = cst.parse_module(file_path.read_bytes().decode("utf-8"))
+                source_wrapper = context.module_cache.get(file_path).wrapper
         except Exception:
             file_context.add_failure(file_path, reason := "Failed to parse file")
             logger.exception("%s %s", reason, file_path)
             return None
 
-        tree = source_tree
+        source_tree = tree = source_wrapper.module
+        wrapper: cst.MetadataWrapper | None = source_wrapper
         try:
             with file_context.timer.measure("transform"):
                 for transformer in self.transformers:
-                    tree = transformer.transform(tree, results, file_context)
+                    # Metadata is shared by every transformer until one of them actually changes the tree
+                    if wrapper is None:
+                        wrapper = cst.MetadataWrapper(tree)
+                        tree = wrapper.module
+                    new_tree = transformer.transform(
+                        tree, results, file_context, wrapper
+                    )
+                    if not new_tree.deep_equals(tree):
+                        tree, wrapper = new_tree, None
         except Exception:
             file_context.add_failure(file_path, reason := "Failed to transform file")
             logger.exception("%s %s", reason, file_path)
@@ -298,6 +331,7 @@ class LibcstTransformerPipeline(BaseTransformerPipeline):
         if not context.dry_run:
             with file_context.timer.measure("write"):
                 update_code(file_context.file_path, tree.code)
+            context.module_cache.update(file_context.file_path, tree)
 
         return change_set
 
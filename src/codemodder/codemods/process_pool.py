@@ -0,0 +1,128 @@
+"""
+Helpers for transforming files in a pool of worker processes.
+
+A single pool is started the first time a run needs it and is shared by every codemod in the run. Each worker builds
+its own lightweight execution context once, so only codemods, file paths and findings are sent to the workers and
+only compact `ProcessedFile` summaries are sent back.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from codemodder.codemods.semgrep import SemgrepRuleDetector, rescan
+from codemodder.context import CodemodExecutionContext
+from codemodder.file_context import FileContext, ProcessedFile
+from codemodder.module_cache import content_digest
+from codemodder.project_analysis.python_repo_manager import PythonRepoManager
+from codemodder.providers import ProviderRegistry
+from codemodder.registry import CodemodRegistry
+from codemodder.result import Result, ResultSet
+
+if TYPE_CHECKING:
+    from codemodder.codemods.base_codemod import BaseCodemod
+
+_worker_context: CodemodExecutionContext | None = None
+
+
+def worker_args(
+    context: CodemodExecutionContext,
+) -> tuple[Path, bool, bool, list[str], list[str]]:
+    return (
+        context.directory,
+        context.dry_run,
+        context.verbose,
+        context.path_include,
+        context.path_exclude,
+    )
+
+
+def create_process_pool(context: CodemodExecutionContext) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=context.max_workers,
+        initializer=init_worker,
+        initargs=worker_args(context),
+    )
+
+
+def chunksize(context: CodemodExecutionContext, items: int) -> int:
+    """Number of items sent to a worker at a time, so that each worker gets several chunks to balance the load."""
+    return max(1, items // (context.max_workers * 4))
+
+
+def init_worker(
+    directory: Path,
+    dry_run: bool,
+    verbose: bool,
+    path_include: list[str],
+    path_exclude: list[str],
+):
+    global _worker_context
+
+    _worker_context = CodemodExecutionContext(
+        directory,
+        dry_run,
+        verbose,
+        # Workers only transform files so there is no need to load any plugins
+        registry=CodemodRegistry(),
+        providers=ProviderRegistry(),
+        repo_manager=PythonRepoManager(directory),
+        path_include=path_include,
+        path_exclude=path_exclude,
+    )
+
+
+def _context() -> CodemodExecutionContext:
+    if _worker_context is None:
+        raise RuntimeError("Worker process was not initialized")
+    return _worker_context
+
+
+def transform_file(
+    codemod: BaseCodemod, path: Path, findings: list[Result] | None
+) -> ProcessedFile:
+    return codemod._transform_file(path, _context(), findings).compact()
+
+
+def transform_chain(
+    path: Path,
+    steps: list[tuple[BaseCodemod, list[Result] | None, bool]],
+    digest: str | None,
+) -> list[tuple[str | None, ProcessedFile]]:
+    """
+    Apply each codemod in the chain to the file in turn, for the file-major schedule.
+
+    Each step says whether the incremental cache allows it to be skipped given the original contents of the file, which
+    only holds until a step changes the file. The digest of the contents each codemod saw is returned with its result
+    so that the parent process can record it.
+    """
+    context = _context()
+    processed: list[tuple[str | None, ProcessedFile]] = []
+    changed = False
+    rescanned: ResultSet | None = None
+    for index, (codemod, findings, skip) in enumerate(steps):
+        if changed:
+            if isinstance(codemod.detector, SemgrepRuleDetector):
+                # Results found before an earlier codemod changed the file are stale, and the rest of the chain is
+                # scanned again in one semgrep run
+                if rescanned is None:
+                    rescanned = rescan(
+                        context, [codemod for codemod, _, _ in steps[index:]], [path]
+                    )
+                findings = codemod._findings_for_file(
+                    path, context, rescanned, codemod.rules
+                )
+            if digest is not None:
+                digest = content_digest(path.read_bytes())
+        elif skip:
+            processed.append((None, FileContext(context.directory, path).compact()))
+            continue
+
+        file_context = codemod._transform_file(path, context, findings)
+        if file_context.changesets and not context.dry_run:
+            changed = True
+            rescanned = None
+        processed.append((digest, file_context.compact()))
+    return processed
@@ -1,34 +1,67 @@
+from __future__ import annotations
+
+import atexit
+import functools
+import hashlib
 import io
 import os
+import shutil
 import tempfile
-from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 import yaml
 
 from codemodder.codemods.base_detector import BaseDetector
 from codemodder.context import CodemodExecutionContext
-from codemodder.result import ResultSet
-from codemodder.semgrep import SemgrepResultSet
+from codemodder.logging import logger
+from codemodder.result import ResultSet, normalize_path
+from codemodder.sarifs import SarifDocumentCache
+from codemodder.semgrep import InternalSemgrepResultSet, SemgrepResultSet
 from codemodder.semgrep import run as semgrep_run
 
+if TYPE_CHECKING:
+    from codemodder.codemods.base_codemod import BaseCodemod
+
 
-def _populate_yaml(rule: str, codemod_id: str) -> str:
+@functools.cache
+def _populate_rules(rule: str, codemod_id: str) -> tuple[dict, ...]:
     rule_yaml = yaml.safe_load(io.StringIO(rule))
     config = {"rules": rule_yaml} if "rules" not in rule_yaml else rule_yaml
     config["rules"][0].setdefault("id", codemod_id)
     config["rules"][0].setdefault("message", "Semgrep found a match")
     config["rules"][0].setdefault("severity", "WARNING")
     config["rules"][0].setdefault("languages", ["python"])
-    return yaml.safe_dump(config)
-
-
-def _create_temp_yaml_file(rule: str, codemod_id: str):
-    fd, path = tempfile.mkstemp()
-    with os.fdopen(fd, "w") as ff:
-        ff.write(_populate_yaml(rule, codemod_id))
-
-    return [Path(path)]
+    return tuple(config["rules"])
+
+
+@functools.cache
+def _rule_directory() -> Path:
+    directory = tempfile.mkdtemp(prefix="codemodder-semgrep-")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    return Path(directory)
+
+
+def semgrep_rule_file(rules: Iterable[dict]) -> Path:
+    """
+    Return the path of a semgrep config file with the given rules.
+
+    Files are named after a digest of their contents, so each distinct set of rules is only written once per process
+    and the same file is reused by every run. All files are removed when the process exits.
+    """
+    contents = yaml.safe_dump(
+        {"rules": sorted(rules, key=lambda rule: str(rule.get("id")))}
+    )
+    digest = hashlib.sha256(contents.encode("utf-8")).hexdigest()
+    path = _rule_directory() / f"{digest}.yaml"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so that concurrent callers never see a partial file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as ff:
+            ff.write(contents)
+        os.replace(tmp_name, path)
+    return path
 
 
 class SemgrepRuleDetector(BaseDetector):
@@ -37,18 +70,94 @@ class SemgrepRuleDetector(BaseDetector):
     def __init__(self, rule: str):
         self.rule = rule
 
+    def get_rules(self, codemod_id: str) -> tuple[dict, ...]:
+        return _populate_rules(self.rule, codemod_id)
+
     def get_yaml_files(self, codemod_id: str) -> list[Path]:
-        return _create_temp_yaml_file(self.rule, codemod_id)
+        return [semgrep_rule_file(self.get_rules(codemod_id))]
 
     def apply(
         self,
         codemod_id: str,
         context: CodemodExecutionContext,
     ) -> ResultSet:
-        yaml_files = self.get_yaml_files(codemod_id)
         with context.timer.measure("semgrep"):
-            files_to_analyze = context.semgrep_results_for_rule(codemod_id)
-            return semgrep_run(context, yaml_files, files_to_analyze)
+            if context.semgrep_prefilter_results is None:
+                yaml_files = self.get_yaml_files(codemod_id)
+                files_to_analyze = context.semgrep_results_for_rule(codemod_id)
+                return semgrep_run(context, yaml_files, files_to_analyze)
+
+            return self._results_from_prefilter(
+                codemod_id, context, context.semgrep_prefilter_results
+            )
+
+    def _results_from_prefilter(
+        self,
+        codemod_id: str,
+        context: CodemodExecutionContext,
+        prefilter: ResultSet,
+    ) -> ResultSet:
+        """
+        Take the results for this rule from the prefilter run, which already used the same rule.
+
+        Results in files that an earlier codemod has modified since the prefilter run are stale, so
+        only those files are scanned again.
+        """
+        modified = (
+            set()
+            if context.dry_run
+            else {
+                normalize_path(context.directory / path)
+                for path in context.get_changed_files()
+            }
+        )
+        stale = [
+            path
+            for path in prefilter.files_for_rule(codemod_id)
+            if normalize_path(path) in modified
+        ]
+
+        results = InternalSemgrepResultSet()
+        for result in prefilter.results_for_rule.get(codemod_id, []):
+            if not any(
+                normalize_path(loc.file) in modified for loc in result.locations
+            ):
+                results.add_result(result)
+        for tool in prefilter.tools:
+            results.store_tool_data(tool)
+
+        if not stale:
+            logger.debug("using prefilter semgrep results for %s", codemod_id)
+            return results
+
+        logger.debug(
+            "running semgrep for %s on %s modified files", codemod_id, len(stale)
+        )
+        return results | semgrep_run(context, self.get_yaml_files(codemod_id), stale)
+
+
+def codemod_rules(codemods: Iterable[BaseCodemod]) -> list[dict]:
+    """Rules of every given codemod that has a semgrep rule detector, to be merged into one configuration file."""
+    return [
+        rule
+        for codemod in codemods
+        if isinstance(codemod.detector, SemgrepRuleDetector)
+        for rule in codemod.detector.get_rules(codemod._internal_name)
+    ]
+
+
+def rescan(
+    context: CodemodExecutionContext,
+    codemods: Sequence[BaseCodemod],
+    files: Sequence[Path],
+) -> ResultSet:
+    """
+    Scan files that have been modified since the detectors were applied again, with the rules of all the given
+    codemods in a single semgrep run.
+    """
+    if not (rules := codemod_rules(codemods)):
+        return ResultSet()
+    return semgrep_run(context, [semgrep_rule_file(rules)], files)
 
 
 class SemgrepSarifFileDetector(BaseDetector):
@@ -58,14 +167,19 @@ class SemgrepSarifFileDetector(BaseDetector):
         context: CodemodExecutionContext,
     ) -> ResultSet:
         del codemod_id
-        return process_semgrep_findings(
-            tuple(context.tool_result_files_map.get("semgrep", ()))
-        )  # Convert list to tuple for cache hashability
-
-
-@cache
-def process_semgrep_findings(semgrep_sarif_files: tuple[str]) -> ResultSet:
+        files = context.tool_result_files_map.get("semgrep", [])
+        return context.result_sets.get(
+            "semgrep",
+            files,
+            lambda: process_semgrep_findings(files, context.sarif_documents),
+        )
+
+
+def process_semgrep_findings(
+    semgrep_sarif_files: Sequence[str | Path],
+    documents: SarifDocumentCache | None = None,
+) -> ResultSet:
     results = SemgrepResultSet()
     for file in semgrep_sarif_files or ():
-        results |= SemgrepResultSet.from_sarif(file)
+        results |= SemgrepResultSet.from_sarif(file, documents=documents)
     return results
@@ -1,5 +1,5 @@
 import itertools
-from typing import ClassVar, Collection, Optional, Union
+from typing import ClassVar, Collection, Iterable, Mapping, Optional, Union
 
 import libcst as cst
 from libcst import MetadataDependent, matchers
@@ -22,6 +22,9 @@ from codemodder.utils.utils import extract_targets_of_assignment
 
 class NameResolutionMixin(MetadataDependent):
     METADATA_DEPENDENCIES: ClassVar[Collection[ProviderT]] = (ScopeProvider,)
+    _scope_index: Optional[
+        tuple[Mapping[cst.CSTNode, Optional[Scope]], "ScopeIndex"]
+    ] = None
 
     def _find_imported_name(self, node: cst.Name) -> Optional[str]:
         match self.find_single_assignment(node):
@@ -190,20 +193,20 @@ class NameResolutionMixin(MetadataDependent):
             name = preference[0] + f"_{count}"
         return name
 
+    def scope_index(self) -> "ScopeIndex":
+        """
+        Return the index of the scopes of the module being visited, building it the first time it is needed.
+        """
+        scopes = self.context.wrapper.resolve(ScopeProvider)
+        if self._scope_index is None or self._scope_index[0] is not scopes:
+            self._scope_index = (scopes, ScopeIndex(scopes.values()))
+        return self._scope_index[1]
+
     def find_used_names_in_module(self):
         """
         Find all the used names in the scope of a libcst Module.
         """
-        names = []
-        if (scope := self.find_global_scope()) is None:
-            return []  # pragma: no cover
-
-        nodes = [x.node for x in scope.assignments]
-        for other_nodes in nodes:
-            visitor = GatherNamesVisitor()
-            other_nodes.visit(visitor)
-            names.extend(visitor.names)
-        return names
+        return list(self.scope_index().module_names())
 
     def find_used_names_within_nodes_scope(self, node: cst.CSTNode) -> set[str]:
         """
@@ -217,54 +220,11 @@ class NameResolutionMixin(MetadataDependent):
         """
         Find all the names used within all the ancestor and descendent scopes for a given scope.
         """
-        related = itertools.chain(
-            self._find_ancestor_scopes(scope), self._find_descendent_scopes(scope)
-        )
-        names: set[str] = set()
-        for s in related:
-            names.update(self._find_used_names_scope_only(s))
-        return names
-
-    def _find_ancestor_scopes(self, scope: Scope) -> set[Scope]:
-        ancestors: set[Scope] = {scope}
-        current = scope
-        while not isinstance(current, GlobalScope):
-            current = current.parent
-            ancestors.add(current)
-        return ancestors
-
-    def _build_scopes_child_tree(self) -> dict[Scope, list[Scope]]:
-        all_scopes = {
-            scope
-            for scope in self.context.wrapper.resolve(ScopeProvider).values()
-            if scope
-        }
-        tree: dict[Scope, list[Scope]] = {k: [] for k in all_scopes if k}
-        for s in all_scopes:
-            if not isinstance(s, GlobalScope):
-                tree.get(s.parent, []).append(s)
-        return tree
-
-    def _find_descendent_scopes(self, scope: Scope):
-        tree = self._build_scopes_child_tree()
-        descendents = set()
-        stack = [scope]
-        while stack:
-            current = stack.pop()
-            descendents.update(tree[current])
-            stack.extend(tree[current])
-        return descendents
-
-    def _find_used_names_scope_only(self, scope: Scope) -> set[str]:
-        return {ass.name for ass in scope.assignments}
+        return set(self.scope_index().used_names_within(scope))
 
     def find_global_scope(self):
         """Find the global scope for a libcst Module node."""
-        scopes = self.context.wrapper.resolve(ScopeProvider).values()
-        for scope in scopes:
-            if isinstance(scope, GlobalScope):
-                return scope
-        return None  # pragma: no cover
+        return self.scope_index().global_scope
 
     def find_single_assignment(
         self,
@@ -710,3 +670,77 @@ class GatherNamesVisitor(cst.CSTVisitor):
 
     def visit_Name(self, node: cst.Name) -> None:
         self.names.append(node.value)
+
+
+class ScopeIndex:
+    """
+    Index of all the scopes of a module, built once from its scope metadata
+
+    The names used within a scope and its relatives are answered from the index instead of walking every scope of the
+    module for each query. Answers are memoized per scope.
+    """
+
+    global_scope: Optional[GlobalScope]
+    children: dict[Scope, list[Scope]]
+
+    def __init__(self, scopes: Iterable[Optional[Scope]]):
+        all_scopes = {scope for scope in scopes if scope}
+        self.global_scope = None
+        self.children = {scope: [] for scope in all_scopes}
+        for scope in all_scopes:
+            if isinstance(scope, GlobalScope):
+                self.global_scope = scope
+            elif scope.parent in self.children:
+                self.children[scope.parent].append(scope)
+        self._names: dict[Scope, frozenset[str]] = {}
+        self._used_names: dict[Scope, frozenset[str]] = {}
+        self._module_names: Optional[list[str]] = None
+
+    def names(self, scope: Scope) -> frozenset[str]:
+        """Names assigned directly within the scope."""
+        if (names := self._names.get(scope)) is None:
+            names = self._names[scope] = frozenset(
+                assignment.name for assignment in scope.assignments
+            )
+        return names
+
+    def ancestors(self, scope: Scope) -> set[Scope]:
+        ancestors: set[Scope] = {scope}
+        current = scope
+        while not isinstance(current, GlobalScope):
+            current = current.parent
+            ancestors.add(current)
+        return ancestors
+
+    def descendants(self, scope: Scope) -> set[Scope]:
+        descendants: set[Scope] = set()
+        stack = [scope]
+        while stack:
+            children = self.children.get(stack.pop(), [])
+            descendants.update(children)
+            stack.extend(children)
+        return descendants
+
+    def used_names_within(self, scope: Scope) -> frozenset[str]:
+        """Names assigned within all the ancestor and descendent scopes of the scope."""
+        if (names := self._used_names.get(scope)) is None:
+            names = self._used_names[scope] = frozenset(
+                itertools.chain.from_iterable(
+                    self.names(related)
+                    for related in self.ancestors(scope) | self.descendants(scope)
+                )
+            )
+        return names
+
+    def module_names(self) -> list[str]:
+        """All the names within the nodes assigned in the global scope."""
+        if self._module_names is None:
+            self._module_names = []
+            for assignment in (
+                self.global_scope.assignments if self.global_scope else ()
+            ):
+                if isinstance(assignment, Assignment):
+                    visitor = GatherNamesVisitor()
+                    assignment.node.visit(visitor)
+                    self._module_names.extend(visitor.names)
+        return self._module_names
@@ -1,9 +1,11 @@
+import re
 from dataclasses import dataclass, field
-from tempfile import TemporaryFile
+from io import BytesIO, StringIO
+from typing import ClassVar
 from xml.sax import handler
 from xml.sax.handler import LexicalHandler
 from xml.sax.saxutils import XMLGenerator
-from xml.sax.xmlreader import AttributesImpl, Locator
+from xml.sax.xmlreader import AttributesImpl, InputSource, Locator
 
 from defusedxml.sax import make_parser
 
@@ -22,6 +24,8 @@ class XMLTransformer(XMLGenerator, LexicalHandler):
     """
 
     change_description = ""
+    # Whether elements are only changed where they match a result, so files without matching lines can be skipped
+    changes_require_results: ClassVar[bool] = False
 
     def __init__(
         self,
@@ -106,6 +110,8 @@ class ElementAttributeXMLTransformer(XMLTransformer):
     Changes the element and its attributes to the values provided in a given dict. For any attribute missing in the dict will stay the same as the original.
     """
 
+    changes_require_results = True
+
     def __init__(
         self,
         out,
@@ -179,6 +185,25 @@ class NewElementXMLTransformer(XMLTransformer):
         super().endElement(new_element.name)
 
 
+# The start of a start tag, as opposed to an end tag, comment, declaration or processing instruction
+_START_TAG = re.compile(rb"<[^/!?]")
+
+
+def has_result_lines(source: bytes, results: list[Result]) -> bool:
+    """
+    Returns True if any result starts on a line of the source that has a start tag.
+
+    Elements are matched to results by the line their start tag is on, so if this is False no element can match.
+    """
+    lines = source.splitlines()
+    return any(
+        1 <= (line := location.start.line) <= len(lines)
+        and _START_TAG.search(lines[line - 1])
+        for result in results
+        for location in result.locations
+    )
+
+
 class XMLTransformerPipeline(BaseTransformerPipeline):
 
     def __init__(self, xml_transformer: type[XMLTransformer]):
@@ -191,51 +216,60 @@ class XMLTransformerPipeline(BaseTransformerPipeline):
         file_context: FileContext,
         results: list[Result] | None,
     ) -> ChangeSet | None:
-        with TemporaryFile("w+") as output_file:
-            # this will fail fast for files that are not XML
-            try:
-                transformer_instance = self.xml_transformer(
-                    out=output_file,
-                    file_context=file_context,
-                    results=results,
-                )
-                parser = make_parser()
-                parser.setContentHandler(transformer_instance)
-                parser.setProperty(
-                    handler.property_lexical_handler, transformer_instance
-                )
-                parser.parse(file_path := file_context.file_path)
-                changes = transformer_instance.changes
-                output_file.seek(0)
-            except Exception:
-                file_context.add_failure(
-                    file_context.file_path, reason := "Failed to parse XML file"
-                )
-                logger.exception("%s %s", reason, file_context.file_path)
-                return None
-
-            if not changes:
-                return None
-
-            new_lines = output_file.readlines()
-            # TODO there's a failure potential here for very large files
-            original_lines = (
-                file_context.file_path.read_bytes()
-                .decode("utf-8")
-                .splitlines(keepends=True)
-            )
-            diff = create_diff(
-                original_lines,
-                new_lines,
+        # The source is read once and shared by the parser and the diff
+        file_path = file_context.file_path
+        try:
+            source = file_path.read_bytes()
+        except OSError:
+            file_context.add_failure(file_path, reason := "Failed to read XML file")
+            logger.exception("%s %s", reason, file_path)
+            return None
+
+        if (
+            results is not None
+            and self.xml_transformer.changes_require_results
+            and not has_result_lines(source, results)
+        ):
+            return None
+
+        output_file = StringIO(newline=None)
+        # this will fail fast for files that are not XML
+        try:
+            transformer_instance = self.xml_transformer(
+                out=output_file,
+                file_context=file_context,
+                results=results,
             )
+            parser = make_parser()
+            parser.setContentHandler(transformer_instance)
+            parser.setProperty(handler.property_lexical_handler, transformer_instance)
+            input_source = InputSource(str(file_path))
+            input_source.setByteStream(BytesIO(source))
+            parser.parse(input_source)
+            changes = transformer_instance.changes
+        except Exception:
+            file_context.add_failure(file_path, reason := "Failed to parse XML file")
+            logger.exception("%s %s", reason, file_path)
+            return None
+
+        if not changes:
+            return None
+
+        output_file.seek(0)
+        new_lines = output_file.readlines()
+        original_lines = source.decode("utf-8").splitlines(keepends=True)
+        diff = create_diff(
+            original_lines,
+            new_lines,
+        )
 
-            if not context.dry_run:
-                file_context.file_path.write_bytes("".join(new_lines).encode("utf-8"))
+        if not context.dry_run:
+            file_path.write_bytes("".join(new_lines).encode("utf-8"))
 
-            return ChangeSet(
-                path=str(file_path.relative_to(context.directory)),
-                diff=diff,
-                changes=changes,
-                strategy=Strategy.deterministic,
-                provisional=False,
-            )
+        return ChangeSet(
+            path=str(file_path.relative_to(context.directory)),
+            diff=diff,
+            changes=changes,
+            strategy=Strategy.deterministic,
+            provisional=False,
+        )
@@ -2,11 +2,16 @@ from pathlib import Path
 
 from sarif_pydantic import Location as LocationModel
 from sarif_pydantic import Result as ResultModel
-from sarif_pydantic import Sarif
 from typing_extensions import Self
 
 from codemodder.result import LineInfo, ResultSet, SarifLocation, SarifResult
-from codemodder.sarifs import AbstractSarifToolDetector, Run
+from codemodder.sarifs import (
+    AbstractSarifToolDetector,
+    Run,
+    SarifDocumentCache,
+    iter_run_results,
+    iter_sarif_runs,
+)
 
 
 class CodeQLSarifToolDetector(AbstractSarifToolDetector):
@@ -57,15 +62,20 @@ class CodeQLResult(SarifResult):
 
 class CodeQLResultSet(ResultSet):
     @classmethod
-    def from_sarif(cls, sarif_file: str | Path, truncate_rule_id: bool = False) -> Self:
-        data = Sarif.model_validate_json(
-            Path(sarif_file).read_text(encoding="utf-8-sig")
-        )
-
+    def from_sarif(
+        cls,
+        sarif_file: str | Path,
+        truncate_rule_id: bool = False,
+        documents: SarifDocumentCache | None = None,
+    ) -> Self:
         result_set = cls()
-        for sarif_run in data.runs:
+        for sarif_run, results in (
+            documents.iter_runs(sarif_file)
+            if documents
+            else iter_sarif_runs(sarif_file)
+        ):
             if CodeQLSarifToolDetector.detect(sarif_run):
-                for sarif_result in sarif_run.results or []:
+                for sarif_result in iter_run_results(results):
                     codeql_result = CodeQLResult.from_sarif(
                         sarif_result, sarif_run, truncate_rule_id
                     )
@@ -1,9 +1,13 @@
+import functools
+import json
+import os
+import tempfile
 from abc import ABCMeta
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import ClassVar, Iterator, Optional, get_args
 
-from pydantic import BaseModel, ConfigDict, model_validator
+from pydantic import BaseModel, ConfigDict, TypeAdapter, model_validator
 
 from codemodder.logging import logger
 
@@ -17,10 +21,103 @@ class CaseInsensitiveEnum(str, Enum):
         return cls.__members__.get(value.upper())
 
 
+@functools.cache
+def _item_adapter(model: type[BaseModel], field: str) -> TypeAdapter:
+    (item_type,) = get_args(model.model_fields[field].annotation)
+    return TypeAdapter(item_type)
+
+
+class ResultSpool:
+    """
+    Results of a report that are serialized as soon as they are known and kept in a temporary file until the report is
+    written.
+
+    This lets the results come before the run header, which is only known once the run has finished, without holding
+    either the results or their serialized form in memory.
+    """
+
+    # Number of characters copied from the spool at a time
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, directory: Path | str | None = None):
+        # The report directory is preferred since the default temporary directory may be held in memory
+        if directory is not None and not os.path.isdir(directory):
+            directory = None
+        self._file = tempfile.TemporaryFile("w+", encoding="utf-8", dir=directory)
+        # Keys of the spooled results, in order
+        self.keys: list[str] = []
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, result: BaseModel):
+        if key in self.keys:
+            raise ValueError(f"result {key!r} is already spooled")
+        if self.keys:
+            self._file.write(",")
+        self._file.write(result.model_dump_json(exclude_none=True))
+        self.keys.append(key)
+
+    def __iter__(self) -> Iterator[str]:
+        self._file.seek(0)
+        while chunk := self._file.read(self.CHUNK_SIZE):
+            yield chunk
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "ResultSpool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 class CodeTFWriter(BaseModel, metaclass=ABCMeta):
-    def write_report(self, outfile: Path | str) -> int:
+    # List of results that is serialized one item at a time, which must be the last field of the report
+    _streamed_field: ClassVar[str] = "results"
+
+    def iter_json(self, spool: ResultSpool | None = None) -> Iterator[str]:
+        """
+        Serialize the report as compact JSON, one result at a time.
+
+        The results already serialized to `spool` come first, followed by the report's own results. The chunks add up
+        to exactly `model_dump_json(exclude_none=True)` of the report with all of those results, but only a single
+        result is serialized in memory at any time rather than the whole report.
+        """
+        name = self._streamed_field
+        *_, last_field = type(self).model_fields
+        items = getattr(self, name)
+        if spool and last_field != name:
+            raise TypeError(f"{type(self).__name__} cannot be written from a spool")
+        if last_field != name or (items is None and not spool):
+            yield self.model_dump_json(exclude_none=True)
+            return
+
+        head = self.model_dump_json(exclude_none=True, exclude={name})
+        yield f"{head[:-1]}{',' if head != '{}' else ''}{json.dumps(name)}:["
+        separator = False
+        if spool:
+            yield from spool
+            separator = True
+        for item in items or ():
+            adapter = _item_adapter(type(self), name)
+            if separator:
+                yield ","
+            yield adapter.dump_json(item, exclude_none=True).decode("utf-8")
+            separator = True
+        yield "]}"
+
+    def write_report(
+        self, outfile: Path | str, spool: ResultSpool | None = None
+    ) -> int:
         try:
-            Path(outfile).write_text(self.model_dump_json(exclude_none=True))
+            with open(outfile, "w", encoding="utf-8") as f:
+                for chunk in self.iter_json(spool):
+                    f.write(chunk)
         except Exception:
             logger.exception("failed to write report file.")
             # Any issues with writing the output file should exit status 2.
@@ -2,32 +2,46 @@ from __future__ import annotations
 
 import itertools
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from functools import cached_property
 from pathlib import Path
 from textwrap import indent
-from typing import TYPE_CHECKING, Iterator, List
-
-from codemodder.code_directory import files_for_directory, match_files
+from typing import TYPE_CHECKING, Iterable, List
+
+from codemodder.code_directory import (
+    DEFAULT_EXCLUDED_PATHS,
+    DirectoryListing,
+    in_pruned_directory,
+    list_directory,
+    match_files,
+)
 from codemodder.codetf import ChangeSet
 from codemodder.codetf import Result as CodeTFResult
 from codemodder.codetf import UnfixedFinding
+from codemodder.codetf.common import ResultSpool
 from codemodder.dependency import (
     Dependency,
     build_dependency_notification,
     build_failed_dependency_notification,
 )
-from codemodder.file_context import FileContext
+from codemodder.file_context import FileContext, ProcessedFile
+from codemodder.incremental_cache import IncrementalCache
 from codemodder.logging import log_list, logger
+from codemodder.module_cache import ModuleCache
 from codemodder.project_analysis.file_parsers.package_store import PackageStore
 from codemodder.project_analysis.python_repo_manager import PythonRepoManager
 from codemodder.providers import ProviderRegistry, load_providers
 from codemodder.registry import CodemodRegistry, load_registered_codemods
 from codemodder.result import ResultSet
+from codemodder.result_cache import ResultSetCache
+from codemodder.sarifs import SarifDocumentCache
+from codemodder.semgrep_cache import SemgrepResultCache
 from codemodder.utils.timer import Timer
 from codemodder.utils.update_finding_metadata import update_finding_metadata
 
 if TYPE_CHECKING:
     from codemodder.codemods.base_codemod import BaseCodemod
+    from codemodder.dependency_management import DependencyManager
 
 
 class CodemodExecutionContext:
@@ -42,11 +56,18 @@ class CodemodExecutionContext:
     providers: ProviderRegistry
     repo_manager: PythonRepoManager
     timer: Timer
+    module_cache: ModuleCache
     path_include: list[str]
     path_exclude: list[str]
     max_workers: int = 1
+    executor: str = "thread"
     tool_result_files_map: dict[str, list[Path]]
+    sarif_documents: SarifDocumentCache
+    result_sets: ResultSetCache
     semgrep_prefilter_results: ResultSet | None = None
+    incremental_cache: IncrementalCache | None = None
+    semgrep_cache: SemgrepResultCache | None = None
+    result_spool: ResultSpool | None = None
 
     def __init__(
         self,
@@ -60,6 +81,8 @@ class CodemodExecutionContext:
         path_exclude: list[str] | None = None,
         tool_result_files_map: dict[str, list[Path]] | None = None,
         max_workers: int = 1,
+        executor: str = "thread",
+        sarif_documents: SarifDocumentCache | None = None,
     ):
         self.directory = directory
         self.dry_run = dry_run
@@ -67,17 +90,45 @@ class CodemodExecutionContext:
         self._changesets_by_codemod: dict[str, list[ChangeSet]] = {}
         self._failures_by_codemod = {}
         self._dependency_update_by_codemod = {}
+        self._dependency_managers: dict[Path, DependencyManager] = {}
         self._unfixed_findings_by_codemod = {}
+        # Paths changed by the codemods whose changesets were released after spooling their results
+        self._spooled_changed_files: list[str] = []
         self.dependencies = {}
         self.registry = registry or load_registered_codemods()
-        self.providers = providers or load_providers()
+        self.providers = providers if providers is not None else load_providers()
         self.repo_manager = repo_manager or PythonRepoManager(directory)
         self.timer = Timer()
+        self.module_cache = ModuleCache()
         self.path_include = path_include or []
         self.path_exclude = path_exclude or []
         self.max_workers = max_workers
+        self.executor = executor
         self.tool_result_files_map = tool_result_files_map or {}
+        self.sarif_documents = sarif_documents or SarifDocumentCache()
+        self.result_sets = ResultSetCache()
         self.semgrep_prefilter_results = None
+        self.incremental_cache = None
+        self.semgrep_cache = None
+        self.result_spool = None
+        self._process_pool: ProcessPoolExecutor | None = None
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        """
+        Pool of worker processes shared by every codemod in the run, which is started the first time it is needed.
+        """
+        from codemodder.codemods.process_pool import create_process_pool
+
+        if self._process_pool is None:
+            logger.debug("starting process pool with %s workers", self.max_workers)
+            self._process_pool = create_process_pool(self)
+        return self._process_pool
+
+    def shutdown_process_pool(self):
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
 
     def add_changesets(self, codemod_name: str, change_sets: List[ChangeSet]):
         self._changesets_by_codemod.setdefault(codemod_name, []).extend(change_sets)
@@ -92,7 +143,7 @@ class CodemodExecutionContext:
         return self._changesets_by_codemod.get(codemod_name, [])
 
     def get_changed_files(self):
-        return [
+        return self._spooled_changed_files + [
             change_set.path
             for changes in self._changesets_by_codemod.values()
             for change_set in changes
@@ -114,8 +165,11 @@ class CodemodExecutionContext:
     def process_dependencies(
         self, codemod_id: str
     ) -> dict[Dependency, PackageStore | None]:
-        """Write the dependencies a codemod added to the appropriate dependency
+        """Add the dependencies a codemod added to the appropriate dependency
         file in the project. Returns a dict listing the locations the dependencies were added.
+
+        The changes to each dependency file are kept in memory until `write_dependencies` is called, so that every file
+        is parsed and written only once no matter how many codemods add dependencies to it.
         """
         if not (dependencies := self.dependencies.get(codemod_id)):
             return {}
@@ -133,10 +187,8 @@ class CodemodExecutionContext:
             self._dependency_update_by_codemod[codemod_id] = None
             return record
 
-        from codemodder.dependency_management import DependencyManager
-
         for package_store in store_list:
-            dm = DependencyManager(package_store, self.directory)
+            dm = self._dependency_manager(package_store)
             if (changeset := dm.write(list(dependencies), self.dry_run)) is not None:
                 self.add_changesets(codemod_id, [changeset])
                 self._dependency_update_by_codemod[codemod_id] = package_store
@@ -146,6 +198,27 @@ class CodemodExecutionContext:
 
         return record
 
+    def write_dependencies(self):
+        """Write every dependency file updated by `process_dependencies`."""
+        for dm in self._dependency_managers.values():
+            try:
+                dm.flush()
+            except OSError as err:
+                logger.warning(
+                    "failed to write dependencies to %s: %s",
+                    dm.dependencies_store.file,
+                    err,
+                )
+
+    def _dependency_manager(self, package_store: PackageStore) -> DependencyManager:
+        from codemodder.dependency_management import DependencyManager
+
+        if (dm := self._dependency_managers.get(package_store.file)) is None:
+            dm = self._dependency_managers[package_store.file] = DependencyManager(
+                package_store, self.directory, deferred=True
+            )
+        return dm
+
     def add_description(self, codemod: BaseCodemod):
         description = codemod.description
         if dependencies := list(self.dependencies.get(codemod.id, [])):
@@ -166,7 +239,7 @@ class CodemodExecutionContext:
         )
 
     def process_results(
-        self, codemod_id: str, results: Iterator[FileContext] | list[FileContext]
+        self, codemod_id: str, results: Iterable[FileContext | ProcessedFile]
     ):
         for file_context in results:
             self.add_changesets(codemod_id, file_context.changesets)
@@ -175,29 +248,47 @@ class CodemodExecutionContext:
             self.add_unfixed_findings(codemod_id, file_context.unfixed_findings)
             self.timer.aggregate(file_context.timer)
 
-    def compile_results(self, codemods: list[BaseCodemod]) -> list[CodeTFResult]:
-        results = []
-        for codemod in codemods:
-            changesets = update_finding_metadata(
-                codemod.detection_tool_rules,
-                self.get_changesets(codemod.id),
-            )
+    def compile_result(self, codemod: BaseCodemod) -> CodeTFResult:
+        changesets = update_finding_metadata(
+            codemod.detection_tool_rules,
+            self.get_changesets(codemod.id),
+        )
 
-            result = CodeTFResult(
-                codemod=codemod.id,
-                summary=codemod.summary,
-                description=self.add_description(codemod),
-                detectionTool=codemod.detection_tool,
-                references=codemod.references,
-                properties={},
-                failedFiles=[str(file) for file in self.get_failures(codemod.id)],
-                changeset=changesets,
-                unfixedFindings=self.get_unfixed_findings(codemod.id),
-            )
+        return CodeTFResult(
+            codemod=codemod.id,
+            summary=codemod.summary,
+            description=self.add_description(codemod),
+            detectionTool=codemod.detection_tool,
+            references=codemod.references,
+            properties={},
+            failedFiles=[str(file) for file in self.get_failures(codemod.id)],
+            changeset=changesets,
+            unfixedFindings=self.get_unfixed_findings(codemod.id),
+        )
 
-            results.append(result)
+    def compile_results(self, codemods: list[BaseCodemod]) -> list[CodeTFResult]:
+        """Compile the results of the codemods that have not been written to `result_spool`."""
+        return [
+            self.compile_result(codemod)
+            for codemod in codemods
+            if self.result_spool is None or codemod.id not in self.result_spool
+        ]
 
-        return results
+    def spool_result(self, codemod: BaseCodemod):
+        """
+        Write the result of a finished codemod to `result_spool`, if there is one.
+
+        The changes and unfixed findings of the codemod are released once they are spooled, since they are no longer
+        needed except for the paths of the changed files.
+        """
+        if self.result_spool is None:
+            return
+        self.result_spool.add(codemod.id, self.compile_result(codemod))
+        self._spooled_changed_files.extend(
+            change_set.path
+            for change_set in self._changesets_by_codemod.pop(codemod.id, [])
+        )
+        self._unfixed_findings_by_codemod.pop(codemod.id, None)
 
     def log_changes(self, codemod_id: str):
         if failures := self.get_failures(codemod_id):
@@ -212,16 +303,53 @@ class CodemodExecutionContext:
     def included_paths(self) -> list[str]:
         return self.path_include or self.registry.default_include_paths
 
+    @property
+    def effective_path_exclude(self) -> list[str]:
+        return self.path_exclude or DEFAULT_EXCLUDED_PATHS
+
+    @cached_property
+    def directory_listing(self) -> DirectoryListing:
+        """
+        Listing of the target directory shared by everything that needs to know which files it contains.
+
+        Directories excluded by `path_exclude`, or by the default excluded paths if there are none, are never walked,
+        since `find_and_fix_paths` never includes any of their files.
+        """
+        return list_directory(self.directory, self.effective_path_exclude)
+
     @cached_property
     def files_to_analyze(self) -> list[Path]:
-        return files_for_directory(self.directory)
+        return self.directory_listing.files
+
+    @cached_property
+    def files_to_analyze_set(self) -> frozenset[Path]:
+        return frozenset(self.files_to_analyze)
+
+    def is_project_file(self, path: Path) -> bool:
+        """
+        Whether a path is a regular file within the target directory.
+
+        Tool findings may refer to files in excluded directories, which are missing from `files_to_analyze` because those
+        directories are never walked, so such files are looked up on disk instead.
+        """
+        if path in self.files_to_analyze_set:
+            return True
+        try:
+            relative = path.relative_to(self.directory)
+        except ValueError:
+            return False
+        return (
+            in_pruned_directory(relative, self.effective_path_exclude)
+            and path.is_file()
+            and not path.is_symlink()
+        )
 
     @cached_property
     def find_and_fix_paths(self) -> list[Path]:
+        # None is effectively a sentinel value to indicate that the default include/exclude paths should be used
         return match_files(
             self.directory,
             self.files_to_analyze,
-            # None is effectively a sentinel value to indicate that the default include/exclude paths should be used
             self.path_exclude or None,
             self.path_include or None,
         )
@@ -1,6 +1,8 @@
+import errno
+import os
 from abc import ABCMeta, abstractmethod
 from pathlib import Path
-from typing import Callable, List, Optional, Union
+from typing import Any, Callable, List, Optional, TypeVar, Union
 
 from packaging.requirements import Requirement
 
@@ -8,14 +10,33 @@ from codemodder.codetf import Action, Change, ChangeSet, PackageAction, PackageR
 from codemodder.dependency import Dependency
 from codemodder.project_analysis.file_parsers.package_store import PackageStore
 
+T = TypeVar("T")
+
 
 class DependencyWriter(metaclass=ABCMeta):
+    """
+    Adds dependencies to a dependency file
+
+    By default the file is read and written again every time dependencies are added. A deferred writer reads and parses
+    the file only once, keeps every update in memory and writes the final contents when `flush` is called. The
+    changesets are the same either way.
+    """
+
     dependency_store: PackageStore
+    deferred: bool
 
-    def __init__(self, dependency_store: PackageStore, parent_directory: Path):
+    def __init__(
+        self,
+        dependency_store: PackageStore,
+        parent_directory: Path,
+        deferred: bool = False,
+    ):
         self.dependency_store = dependency_store
         self.path = Path(dependency_store.file)
         self.parent_directory = parent_directory
+        self.deferred = deferred
+        self._document: Any = None
+        self._pending: str | None = None
 
     @abstractmethod
     def add_to_file(
@@ -30,6 +51,42 @@ class DependencyWriter(metaclass=ABCMeta):
             return self.add_to_file(new_dependencies, dry_run)
         return None
 
+    def flush(self):
+        """
+        Write the contents of the file kept by a deferred writer, if it has been updated.
+        """
+        if self._pending is None:
+            return
+        content, self._pending = self._pending, None
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def _load(self, parse: Callable[[], T]) -> T:
+        """
+        Return the parsed file, which a deferred writer only parses the first time.
+        """
+        if not self.deferred:
+            return parse()
+        if self._document is None:
+            self._document = parse()
+        return self._document
+
+    def _save(self, content: str, document: Any):
+        """
+        Write the updated contents of the file, or keep them along with the updated `document` if writes are deferred.
+        """
+        if not self.deferred:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(content)
+            return
+        # Fail now rather than when the file is flushed, so that another store can be used instead
+        if not os.access(self.path, os.W_OK):
+            raise PermissionError(
+                errno.EACCES, os.strerror(errno.EACCES), str(self.path)
+            )
+        self._pending = content
+        self._document = document
+
     def add(self, dependencies: list[Dependency]) -> list[Dependency]:
         """add any number of dependencies to the end of list of dependencies."""
         new = []
@@ -1,8 +1,10 @@
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
 from codemodder.codetf import ChangeSet
 from codemodder.dependency import Dependency
+from codemodder.dependency_management.base_dependency_writer import DependencyWriter
 from codemodder.dependency_management.pyproject_writer import PyprojectWriter
 from codemodder.dependency_management.requirements_txt_writer import (
     RequirementsTxtWriter,
@@ -18,32 +20,50 @@ from codemodder.project_analysis.file_parsers.package_store import (
 class DependencyManager:
     dependencies_store: PackageStore
     parent_directory: Path
+    deferred: bool
 
-    def __init__(self, dependencies_store: PackageStore, parent_directory: Path):
+    def __init__(
+        self,
+        dependencies_store: PackageStore,
+        parent_directory: Path,
+        deferred: bool = False,
+    ):
         self.dependencies_store = dependencies_store
         self.parent_directory = parent_directory
+        self.deferred = deferred
+
+    @cached_property
+    def writer(self) -> Optional[DependencyWriter]:
+        match self.dependencies_store.type:
+            case FileType.REQ_TXT:
+                writer_class: type[DependencyWriter] = RequirementsTxtWriter
+            case FileType.TOML:
+                writer_class = PyprojectWriter
+            case FileType.SETUP_PY:
+                writer_class = SetupPyWriter
+            case FileType.SETUP_CFG:
+                writer_class = SetupCfgWriter
+            case _:
+                return None
+        return writer_class(
+            self.dependencies_store, self.parent_directory, deferred=self.deferred
+        )
 
     def write(
         self, dependencies: list[Dependency], dry_run: bool = False
     ) -> Optional[ChangeSet]:
         """
         Write `dependencies` to the appropriate location in the project.
+
+        If writes are deferred the file is only updated once `flush` is called.
         """
-        match self.dependencies_store.type:
-            case FileType.REQ_TXT:
-                return RequirementsTxtWriter(
-                    self.dependencies_store, self.parent_directory
-                ).write(dependencies, dry_run)
-            case FileType.TOML:
-                return PyprojectWriter(
-                    self.dependencies_store, self.parent_directory
-                ).write(dependencies, dry_run)
-            case FileType.SETUP_PY:
-                return SetupPyWriter(
-                    self.dependencies_store, self.parent_directory
-                ).write(dependencies, dry_run)
-            case FileType.SETUP_CFG:
-                return SetupCfgWriter(
-                    self.dependencies_store, self.parent_directory
-                ).write(dependencies, dry_run)
-        return None
+        if (writer := self.writer) is None:
+            return None
+        return writer.write(dependencies, dry_run)
+
+    def flush(self):
+        """
+        Write any deferred updates to the dependency file.
+        """
+        if (writer := self.writer) is not None:
+            writer.flush()
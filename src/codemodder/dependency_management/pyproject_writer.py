@@ -20,8 +20,10 @@ class PyprojectWriter(DependencyWriter):
     def add_to_file(
         self, dependencies: list[Dependency], dry_run: bool = False
     ) -> Optional[ChangeSet]:
-        pyproject = self._parse_file()
-        original = deepcopy(pyproject)
+        document = self._load(self._parse_file)
+        original = tomlkit.dumps(document)
+        # The document kept by a deferred writer must not change unless the file is updated
+        pyproject = deepcopy(document) if self.deferred and dry_run else document
 
         if pyproject.get("tool", {}).get("poetry", {}):
             # It's unlikely and bad practice to declare dependencies under [project].dependencies
@@ -37,13 +39,13 @@ class PyprojectWriter(DependencyWriter):
                 logger.debug("Unable to add dependencies to pyproject.toml file.")
                 return None
 
+        updated = tomlkit.dumps(pyproject)
         diff, added_line_nums = create_diff_and_linenums(
-            tomlkit.dumps(original).split("\n"), tomlkit.dumps(pyproject).split("\n")
+            original.split("\n"), updated.split("\n")
         )
 
         if not dry_run:
-            with open(self.path, "w", encoding="utf-8") as f:
-                tomlkit.dump(pyproject, f)
+            self._save(updated, pyproject)
 
         changes = self.build_changes(
             dependencies, added_line_nums_strategy, added_line_nums
@@ -14,7 +14,7 @@ class RequirementsTxtWriter(DependencyWriter):
     def add_to_file(
         self, dependencies: list[Dependency], dry_run: bool = False
     ) -> Optional[ChangeSet]:
-        if (lines := self._parse_file()) is None:
+        if (lines := self._load(self._parse_file)) is None:
             return None
 
         original_lines = lines.copy()
@@ -31,8 +31,7 @@ class RequirementsTxtWriter(DependencyWriter):
 
         if not dry_run:
             try:
-                with open(self.path, "w", encoding="utf-8") as f:
-                    f.writelines(updated_lines)
+                self._save("".join(updated_lines), updated_lines)
             except Exception:
                 return None
 
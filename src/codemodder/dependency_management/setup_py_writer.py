@@ -23,7 +23,7 @@ class SetupPyWriter(DependencyWriter):
     def add_to_file(
         self, dependencies: list[Dependency], dry_run: bool = False
     ) -> Optional[ChangeSet]:
-        input_tree = self._parse_file()
+        input_tree = self._load(self._parse_file)
         wrapper = cst.MetadataWrapper(input_tree)
         file_context = FileContext(self.parent_directory, self.path, [], [], [])
 
@@ -41,8 +41,7 @@ class SetupPyWriter(DependencyWriter):
         diff = create_diff_from_tree(input_tree, output_tree)
 
         if not dry_run:
-            with open(self.path, "w", encoding="utf-8") as f:
-                f.write(output_tree.code)
+            self._save(output_tree.code, output_tree)
 
         changes = self.build_changes(
             dependencies, fixed_line_number_strategy, codemod.line_num_changed
@@ -23,10 +23,13 @@ class SetupCfgWriter(DependencyWriter):
     def add_to_file(
         self, dependencies: list[Dependency], dry_run: bool = False
     ) -> Optional[ChangeSet]:
-        config = configparser.ConfigParser()
+        if (original_lines := self._load(self._parse_file)) is None:
+            logger.debug("Unable to read setup.cfg file.")
+            return None
 
+        config = configparser.ConfigParser()
         try:
-            config.read(self.path)
+            config.read_string("".join(original_lines), source=str(self.path))
         except configparser.ParsingError:
             logger.debug("Unable to parse setup.cfg file.")
             return None
@@ -37,9 +40,6 @@ class SetupCfgWriter(DependencyWriter):
             logger.debug("Unable to add dependencies to setup.cfg file.")
             return None
 
-        with open(self.path, "r", encoding="utf-8") as f:
-            original_lines = f.readlines()
-
         if not (
             new_lines := self.build_new_lines(
                 original_lines, defined_dependencies, dependencies
@@ -50,8 +50,7 @@ class SetupCfgWriter(DependencyWriter):
 
         if not dry_run:
             try:
-                with open(self.path, "w", encoding="utf-8") as f:
-                    f.writelines(new_lines)
+                self._save("".join(new_lines), new_lines)
             except Exception:
                 logger.debug("Unable to add dependencies to setup.cfg file.")
                 return None
@@ -67,6 +66,13 @@ class SetupCfgWriter(DependencyWriter):
             changes=changes,
         )
 
+    def _parse_file(self) -> Optional[list[str]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return f.readlines()
+        except OSError:
+            return None
+
     def build_new_lines(
         self,
         original_lines: list[str],
@@ -8,6 +8,19 @@ from codemodder.result import Result
 from codemodder.utils.timer import Timer
 
 
+@dataclass
+class ProcessedFile:
+    """
+    Compact, picklable summary of a `FileContext` once a file has been processed.
+    """
+
+    changesets: list[ChangeSet]
+    failures: list[Path]
+    dependencies: set[Dependency]
+    unfixed_findings: list[UnfixedFinding]
+    timer: Timer
+
+
 @dataclass
 class FileContext:
     """
@@ -100,3 +113,12 @@ class FileContext:
             for result in (self.results or [])
             if result.finding is not None
         ]
+
+    def compact(self) -> ProcessedFile:
+        return ProcessedFile(
+            changesets=self.changesets,
+            failures=self.failures,
+            dependencies=self.dependencies,
+            unfixed_findings=self.unfixed_findings,
+            timer=self.timer,
+        )
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable
+
+from codemodder.file_context import FileContext, ProcessedFile
+from codemodder.logging import logger
+from codemodder.module_cache import content_digest
+
+CACHE_FILE_NAME = "codemodder-incremental.json"
+CACHE_FORMAT_VERSION = 2
+
+
+def run_fingerprint(
+    codemodder_version: str,
+    codemod_ids: Iterable[str],
+    path_include: list[str],
+    path_exclude: list[str],
+    tool_result_files: Iterable[Path],
+) -> str:
+    """
+    Digest of every input other than file contents that can affect the outcome of a codemod.
+
+    Codemods are versioned together with codemodder itself, so the codemodder version stands in
+    for the version of each codemod. Tool result files (e.g. SARIF) are identified by their contents.
+    """
+    fingerprint = hashlib.sha256()
+    fingerprint.update(
+        json.dumps(
+            {
+                "format": CACHE_FORMAT_VERSION,
+                "version": codemodder_version,
+                "codemods": list(codemod_ids),
+                "include": path_include,
+                "exclude": path_exclude,
+            }
+        ).encode("utf-8")
+    )
+    for path in sorted(Path(name) for name in tool_result_files):
+        fingerprint.update(content_digest(path.read_bytes()).encode("utf-8"))
+    return fingerprint.hexdigest()
+
+
+class IncrementalCache:
+    """
+    Persistent record of files that a codemod has already processed without making any change
+
+    Entries are keyed by codemod ID and the path of the file relative to the project directory, and
+    hold the sha256 digest of the file contents, so a file is only skipped while its contents are
+    exactly the same as when the codemod last saw it. Only entries loaded from the previous run are
+    used to skip files, so a file is never skipped because of another file processed in the same
+    run. The whole cache is discarded whenever the fingerprint of the run differs from the one it
+    was saved with. Only entries that were used or recorded during the current run are saved, so
+    entries for files that no longer exist do not accumulate.
+    """
+
+    path: Path
+    fingerprint: str
+    directory: Path | None
+    hits: int
+    misses: int
+
+    def __init__(self, path: Path, fingerprint: str, directory: Path | None = None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._previous: dict[str, dict[str, str]] = {}
+        self._seen: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls, cache_dir: Path, fingerprint: str, directory: Path | None = None
+    ) -> "IncrementalCache":
+        cache = cls(cache_dir / CACHE_FILE_NAME, fingerprint, directory)
+        try:
+            data = json.loads(cache.path.read_text("utf-8"))
+        except FileNotFoundError:
+            return cache
+        except (OSError, ValueError) as err:
+            logger.debug(
+                "ignoring unreadable incremental cache %s: %s", cache.path, err
+            )
+            return cache
+
+        if data.get("fingerprint") != fingerprint:
+            logger.debug("incremental cache %s is stale, starting over", cache.path)
+            return cache
+
+        cache._previous = {
+            codemod_id: dict(files)
+            for codemod_id, files in data.get("unchanged", {}).items()
+            if isinstance(files, dict)
+        }
+        return cache
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {
+                "fingerprint": self.fingerprint,
+                "unchanged": {
+                    codemod_id: dict(sorted(files.items()))
+                    for codemod_id, files in sorted(self._seen.items())
+                },
+            }
+
+        # Write to a temporary file first so that an interrupted run never leaves a corrupt cache
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _key(self, path: Path) -> str:
+        path = path.absolute()
+        if self.directory is not None and path.is_relative_to(
+            directory := self.directory.absolute()
+        ):
+            return path.relative_to(directory).as_posix()
+        return path.as_posix()
+
+    def check(self, codemod_id: str, path: Path) -> tuple[bool, str | None]:
+        """
+        Return whether `path` can be skipped for the given codemod along with the digest of its contents.
+
+        The digest is `None` if the file could not be read, in which case it is never skipped.
+        """
+        try:
+            digest = content_digest(path.read_bytes())
+        except OSError:
+            return False, None
+
+        key = self._key(path)
+        with self._lock:
+            if self._previous.get(codemod_id, {}).get(key) == digest:
+                self.hits += 1
+                self._seen.setdefault(codemod_id, {})[key] = digest
+                return True, digest
+            self.misses += 1
+        return False, digest
+
+    def record(
+        self,
+        codemod_id: str,
+        path: Path,
+        digest: str,
+        result: FileContext | ProcessedFile,
+    ):
+        """
+        Remember that the codemod left `path` alone while it had contents with the given digest.
+
+        Only results with nothing at all to report are recorded: a file with changes, failures,
+        dependencies or unfixed findings has to be processed again to reproduce them.
+        """
+        if (
+            result.changesets
+            or result.failures
+            or result.dependencies
+            or result.unfixed_findings
+        ):
+            return
+
+        with self._lock:
+            self._seen.setdefault(codemod_id, {})[self._key(path)] = digest
@@ -0,0 +1,158 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+import libcst as cst
+
+# Parsed CSTs are roughly an order of magnitude larger than their source and the
+# metadata resolved by their wrapper takes about as much again, so each entry is
+# charged this many times the size of its source against the cap.
+MODULE_MEMORY_FACTOR = 20
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class CachedModule:
+    path: Path
+    digest: str
+    size: int
+    module: cst.Module
+    parsed: bool = True
+    mtime_ns: int | None = None
+
+    @property
+    def memory_size(self) -> int:
+        """Estimated memory used by the module and the metadata of its wrapper."""
+        return self.size * MODULE_MEMORY_FACTOR
+
+    @cached_property
+    def wrapper(self) -> cst.MetadataWrapper:
+        """
+        Metadata wrapper for the cached module, shared by every transformer that runs on it.
+
+        Each provider is only resolved the first time it is needed. A freshly parsed module is never mutated and has no
+        shared nodes, so there is no need for the wrapper to make a defensive copy. Trees produced by a transformer may
+        reuse the same node in more than one place, so they are copied first as libcst does by default.
+        """
+        return cst.MetadataWrapper(self.module, unsafe_skip_copy=self.parsed)
+
+
+class ModuleCache:
+    """
+    Run-scoped cache of parsed libcst modules
+
+    Entries are keyed by path and validated against the modification time and size of the
+    file, falling back to the digest of its contents when those have changed, so a file that
+    is changed on disk is always parsed again. When a codemod rewrites a file the entry is
+    updated in place with the new tree. Least recently used entries are evicted once the
+    estimated memory used by the cached modules and their metadata exceeds `max_bytes`.
+    """
+
+    max_bytes: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Path, CachedModule] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, path: Path) -> CachedModule:
+        """
+        Return the parsed module for the current contents of `path`, parsing it if necessary.
+
+        Parse errors are propagated to the caller and nothing is cached.
+        """
+        stat = path.stat()
+        with self._lock:
+            if (
+                (entry := self._entries.get(path))
+                and entry.mtime_ns == stat.st_mtime_ns
+                and entry.size == stat.st_size
+            ):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+
+        data = path.read_bytes()
+        digest = content_digest(data)
+        with self._lock:
+            if (entry := self._entries.get(path)) and entry.digest == digest:
+                # Touched but not changed, so only the modification time is out of date
+                entry.mtime_ns = stat.st_mtime_ns
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        module = cst.parse_module(data.decode("utf-8"))
+        return self._store(
+            CachedModule(path, digest, len(data), module, mtime_ns=stat.st_mtime_ns)
+        )
+
+    def update(self, path: Path, module: cst.Module) -> CachedModule:
+        """
+        Replace the cached module for `path` with a tree that has just been written to it.
+        """
+        data = module.code.encode("utf-8")
+        try:
+            stat = path.stat()
+            # The modification time is only trusted if the file really has the new contents
+            mtime_ns = stat.st_mtime_ns if path.read_bytes() == data else None
+        except OSError:
+            mtime_ns = None
+        return self._store(
+            CachedModule(
+                path,
+                content_digest(data),
+                len(data),
+                module,
+                parsed=False,
+                mtime_ns=mtime_ns,
+            )
+        )
+
+    def invalidate(self, path: Path):
+        with self._lock:
+            if (entry := self._entries.pop(path, None)) is not None:
+                self._total_bytes -= entry.memory_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _store(self, entry: CachedModule) -> CachedModule:
+        with self._lock:
+            if (previous := self._entries.pop(entry.path, None)) is not None:
+                self._total_bytes -= previous.memory_size
+            if entry.memory_size > self.max_bytes:
+                # Too large to be worth keeping; hand it out without caching it
+                return entry
+
+            self._entries[entry.path] = entry
+            self._total_bytes += entry.memory_size
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.memory_size
+        return entry
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List
+from typing import List, Sequence
 
 from codemodder.logging import logger
 
@@ -22,15 +22,23 @@ class BaseParser(ABC):
     def _parse_file(self, file: Path) -> PackageStore | None:
         pass
 
-    def find_file_locations(self) -> List[Path]:
-        return list(Path(self.parent_directory).rglob(self.file_type.value))
+    def find_file_locations(self, files: Sequence[Path] | None = None) -> List[Path]:
+        """
+        Find the files of this type within the project.
+
+        If a listing of the files in the project is given, the files are matched by name against it instead of walking
+        the project directory.
+        """
+        if files is None:
+            return list(Path(self.parent_directory).rglob(self.file_type.value))
+        return [file for file in files if file.name == self.file_type.value]
 
-    def parse(self) -> list[PackageStore]:
+    def parse(self, files: Sequence[Path] | None = None) -> list[PackageStore]:
         """
         Find 0 or more project config or dependency files within a project repo.
         """
         stores = []
-        req_files = self.find_file_locations()
+        req_files = self.find_file_locations(files)
         for file in req_files:
             try:
                 store = self._parse_file(file)
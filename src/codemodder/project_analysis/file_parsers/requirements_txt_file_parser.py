@@ -1,7 +1,7 @@
+import codecs
+import re
 from pathlib import Path
 
-import chardet
-
 from codemodder.logging import logger
 from codemodder.project_analysis.file_parsers.package_store import (
     FileType,
@@ -10,6 +10,54 @@ from codemodder.project_analysis.file_parsers.package_store import (
 
 from .base_parser import BaseParser
 
+# Only this much of a file is given to chardet, which is slow on large inputs
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+_BOMS = (
+    # The UTF-32 marks have to be checked before the UTF-16 ones that they start with
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_CONTROL_CHARACTERS = re.compile("[\x00-\x08\x0e-\x1f\x7f-\x9f]")
+
+
+def decode_text(data: bytes) -> str | None:
+    """
+    Decode the contents of a text file of unknown encoding, returning `None` if the encoding cannot be determined.
+
+    Files with a byte order mark and files that are valid UTF-8 text are decoded directly. Only the rest are given to
+    chardet, which is imported the first time it is needed.
+    """
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            try:
+                return data.decode(encoding)
+            except UnicodeDecodeError:
+                return None
+
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    else:
+        # Binary data can be valid UTF-8 by chance, but it is unlikely to be free of control characters
+        if not _CONTROL_CHARACTERS.search(text):
+            return text
+
+    import chardet
+
+    enc = chardet.detect(data[:ENCODING_SAMPLE_SIZE])
+    if enc["confidence"] <= 0.9:
+        return None
+    detected = enc.get("encoding") or "utf-8"
+    try:
+        return data.decode(detected.lower())
+    except (UnicodeDecodeError, LookupError):
+        return None
+
 
 class RequirementsTxtParser(BaseParser):
     @property
@@ -20,14 +68,10 @@ class RequirementsTxtParser(BaseParser):
         with open(file, "rb") as f:
             whole_file = f.read()
 
-        enc = chardet.detect(whole_file)
-        if enc["confidence"] > 0.9:
-            encoding = enc.get("encoding")
-            decoded = whole_file.decode(encoding.lower()) if encoding else ""
-            lines = decoded.splitlines() if decoded else []
-        else:
+        if (decoded := decode_text(whole_file)) is None:
             logger.debug("Unknown encoding for file: %s", file)
             return None
+        lines = decoded.splitlines()
 
         dependencies = self._clean_lines(lines)
 
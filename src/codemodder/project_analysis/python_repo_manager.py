@@ -1,6 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 
 from codemodder.project_analysis.file_parsers import (
     PyprojectTomlParser,
@@ -20,6 +21,7 @@ class PythonRepoManager:
             RequirementsTxtParser,
             SetupCfgParser,
         ]
+        self._package_stores: list[PackageStore] | None = None
 
     @cached_property
     def dependencies_store(self) -> Optional[PackageStore]:
@@ -30,18 +32,29 @@ class PythonRepoManager:
             return self.package_stores[0]
         return None
 
-    @cached_property
+    @property
     def package_stores(self) -> list[PackageStore]:
-        return self._parse_all_stores()
+        if self._package_stores is None:
+            self._package_stores = self._parse_all_stores()
+        return self._package_stores
+
+    def parse_project(self, files: Sequence[Path] | None = None) -> list[PackageStore]:
+        """Find the package stores of the project, which are kept for `package_stores`.
 
-    def parse_project(self) -> list[PackageStore]:
-        """Wrapper around cached-property for clarity when calling it the first time."""
-        return self.package_stores
+        `files` is a listing of every file in the project that the parsers match against, so that the project
+        directory does not have to be walked again.
+        """
+        self._package_stores = self._parse_all_stores(files)
+        return self._package_stores
 
-    def _parse_all_stores(self) -> list[PackageStore]:
-        discovered_pkg_stores: list[PackageStore] = []
-        for store in self._potential_stores:
-            discovered_pkg_stores.extend(
-                store(self.parent_directory).parse()  # type: ignore
+    def _parse_all_stores(
+        self, files: Sequence[Path] | None = None
+    ) -> list[PackageStore]:
+        # Each parser reads and parses its own files, so they can all run at once
+        with ThreadPoolExecutor(max_workers=len(self._potential_stores)) as executor:
+            parsed = executor.map(
+                lambda store: store(self.parent_directory).parse(files),  # type: ignore
+                self._potential_stores,
             )
-        return discovered_pkg_stores
+            # Stores are kept in the order of _potential_stores
+            return [pkg_store for stores in parsed for pkg_store in stores]
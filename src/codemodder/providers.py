@@ -1,7 +1,9 @@
+import threading
+import time
 from abc import ABCMeta, abstractmethod
 from collections import UserDict
-from importlib.metadata import entry_points
-from typing import Any
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any, Callable, Iterator
 
 from codemodder.logging import logger
 
@@ -29,33 +31,97 @@ class BaseProvider(metaclass=ABCMeta):
         return self._resource
 
 
+ProviderFactory = Callable[[str], BaseProvider]
+
+
 class ProviderRegistry(UserDict):
+    """
+    Registry of providers by name
+
+    Providers can be registered as factories, which are only called the first time the provider is requested. A
+    factory that fails is logged and the provider is treated as unavailable from then on. Providers that have not been
+    loaded yet are still listed by `keys()` and `len()`, and are loaded when their value is accessed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._factories: dict[str, ProviderFactory] = {}
+        self._lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def __contains__(self, name) -> bool:
+        return name in self.data or name in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        # Iterate over a copy since accessing a value loads its provider
+        with self._lock:
+            names = [*self.data, *self._factories]
+        return iter(names)
+
+    def __len__(self) -> int:
+        return len(self.data) + len(self._factories)
+
+    def __missing__(self, name: str) -> BaseProvider:
+        if (provider := self._load(name)) is None:
+            raise KeyError(name)
+        return provider
+
     def add_provider(self, name: str, provider: BaseProvider):
+        self._factories.pop(name, None)
         self[name] = provider
 
+    def add_factory(self, name: str, factory: ProviderFactory):
+        self.data.pop(name, None)
+        self._factories[name] = factory
+
     def get_provider(self, name: str) -> BaseProvider | None:
-        return self.get(name)
+        if (provider := self.data.get(name)) is not None:
+            return provider
+        return self._load(name)
+
+    def _load(self, name: str) -> BaseProvider | None:
+        with self._lock:
+            if name in self.data:
+                return self.data[name]
+            if (factory := self._factories.pop(name, None)) is None:
+                return None
+
+            start = time.perf_counter()
+            try:
+                provider = factory(name)
+            except Exception:
+                logger.exception('Failed to load provider "%s"', name)
+                return None
+
+            logger.debug(
+                'loaded provider "%s" in %.1f ms',
+                name,
+                (time.perf_counter() - start) * 1000,
+            )
+            self.data[name] = provider
+            return provider
+
+
+def _entry_point_factory(entry_point: EntryPoint) -> ProviderFactory:
+    def factory(name: str) -> BaseProvider:
+        logger.debug(
+            '- loading provider "%s" from "%s"',
+            entry_point.name,
+            entry_point.module,
+        )
+        return entry_point.load()(name)
+
+    return factory
 
 
 def load_providers() -> ProviderRegistry:
     registry = ProviderRegistry()
-    logger.debug("loading registered providers")
+    logger.debug("registering providers")
     for entry_point in entry_points().select(group="codemod_providers"):
         logger.debug(
-            '- loading provider "%s" from "%s"',
+            '- registering provider "%s" from "%s"',
             entry_point.name,
             entry_point.module,
         )
-        try:
-            provider = entry_point.load()
-        except Exception:
-            logger.exception(
-                'Failed to load provider "%s" from "%s": %s',
-                entry_point.name,
-                entry_point.module,
-            )
-            continue
-
-        registry.add_provider(entry_point.name, provider(entry_point.name))
+        registry.add_factory(entry_point.name, _entry_point_factory(entry_point))
 
     return registry
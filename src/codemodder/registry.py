@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import importlib
 import os
 import re
 from collections import defaultdict
 from dataclasses import dataclass
 from importlib.metadata import EntryPoint, entry_points
 from itertools import chain
-from typing import TYPE_CHECKING, Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
 
 from codemodder.logging import logger
 
@@ -23,21 +24,54 @@ DEFAULT_EXCLUDED_CODEMODS = [
 ]
 
 
+@dataclass(frozen=True)
+class CodemodEntry:
+    """
+    A codemod listed in a static manifest, which is only imported when it is needed.
+
+    `module` and `name` locate the codemod, which may be a codemod class or instance. Everything the registry needs in
+    order to select codemods is part of the entry itself.
+    """
+
+    id: str
+    module: str
+    name: str
+    default_extensions: Sequence[str] = (".py",)
+
+    @property
+    def origin(self) -> str:
+        return self.id.partition(":")[0]
+
+    def load(self) -> BaseCodemod:
+        codemod = getattr(importlib.import_module(self.module), self.name)
+        wrapper = codemod() if isinstance(codemod, type) else codemod
+        if wrapper.id != self.id:
+            raise ValueError(
+                f"Codemod {self.module}.{self.name} has id {wrapper.id} but is registered as {self.id}."
+            )
+        return wrapper
+
+
 @dataclass
 class CodemodCollection:
-    """A collection of codemods that all share the same origin and documentation."""
+    """A collection of codemods that all share the same origin and documentation.
+
+    Codemods can be given as codemod classes or instances, or as manifest entries that are loaded on demand.
+    """
 
     origin: str
     codemods: list
 
 
 class CodemodRegistry:
-    _codemods_by_id: dict[str, BaseCodemod]
+    # Entries are replaced by the codemods they refer to once they are loaded
+    _codemods_by_id: dict[str, BaseCodemod | CodemodEntry]
+    _ids_by_tool: defaultdict[str, list[str]]
     _default_include_paths: set[str]
 
     def __init__(self):
         self._codemods_by_id = {}
-        self._codemods_by_tool = defaultdict(list)
+        self._ids_by_tool = defaultdict(list)
         self._default_include_paths = set()
 
     @property
@@ -46,7 +80,16 @@ class CodemodRegistry:
 
     @property
     def codemods(self):
-        return list(self._codemods_by_id.values())
+        return [self.get(codemod_id) for codemod_id in self._codemods_by_id]
+
+    def get(self, codemod_id: str) -> BaseCodemod:
+        """
+        Return the codemod with the given id, importing it first if necessary.
+        """
+        if isinstance(codemod := self._codemods_by_id[codemod_id], CodemodEntry):
+            logger.debug('- loading codemod "%s"', codemod_id)
+            codemod = self._codemods_by_id[codemod_id] = codemod.load()
+        return codemod
 
     @property
     def default_include_paths(self) -> list[str]:
@@ -54,27 +97,37 @@ class CodemodRegistry:
 
     @property
     def all_tool_rules(self) -> list[str]:
+        # Imported here so that loading the registry does not import any codemods
+        from codemodder.codemods.base_codemod import RemediationCodemod
+
         return [
             rule
-            for key, values in self._codemods_by_tool.items()
+            for key in self._ids_by_tool
             if key != "pixee"
-            for codemod in values
+            for codemod in self.codemods_by_tool(key)
+            if isinstance(codemod, RemediationCodemod)
             for rule in codemod.requested_rules
         ]
 
     def codemods_by_tool(self, tool_name: str) -> list[BaseCodemod]:
-        return self._codemods_by_tool.get(tool_name, [])
+        return [
+            self.get(codemod_id) for codemod_id in self._ids_by_tool.get(tool_name, [])
+        ]
 
     def add_codemod_collection(self, collection: CodemodCollection):
         for codemod in collection.codemods:
-            wrapper = codemod() if isinstance(codemod, type) else codemod
+            wrapper = (
+                codemod
+                if isinstance(codemod, CodemodEntry)
+                else codemod() if isinstance(codemod, type) else codemod
+            )
             if wrapper.id in self._codemods_by_id:
                 raise KeyError(
                     f"Codemod with id {wrapper.id} is already registered. Consider changing the codemod name or origin."
                 )
 
             self._codemods_by_id[wrapper.id] = wrapper
-            self._codemods_by_tool[collection.origin].append(wrapper)
+            self._ids_by_tool[collection.origin].append(wrapper.id)
             self._default_include_paths.update(
                 chain(
                     *[
@@ -93,6 +146,7 @@ class CodemodRegistry:
         codemod_include = codemod_include or []
         codemod_exclude = codemod_exclude or DEFAULT_EXCLUDED_CODEMODS
 
+        # Codemods are selected by their id and origin, so only the ones that match are loaded
         if codemod_exclude and not codemod_include:
             base_codemods = {}
             patterns = [
@@ -102,14 +156,14 @@ class CodemodRegistry:
             ]
             names = set(name for name in codemod_exclude if "*" not in name)
 
-            for codemod in self.codemods:
+            for codemod in self._codemods_by_id.values():
                 if codemod.id in names or any(
                     pat.match(codemod.id) for pat in patterns
                 ):
                     continue
 
                 if bool(sast_only) != bool(codemod.origin == "pixee"):
-                    base_codemods[codemod.id] = codemod
+                    base_codemods[codemod.id] = self.get(codemod.id)
 
             # Remove duplicates and preserve order
             return list(base_codemods.values())
@@ -118,7 +172,11 @@ class CodemodRegistry:
         for name in codemod_include:
             if "*" in name:
                 pat = re.compile(name.replace("*", ".*"))
-                pattern_matches = [code for code in self.codemods if pat.match(code.id)]
+                pattern_matches = [
+                    self.get(codemod_id)
+                    for codemod_id in self._codemods_by_id
+                    if pat.match(codemod_id)
+                ]
                 matched_codemods.extend(pattern_matches)
                 if not pattern_matches:
                     logger.warning(
@@ -126,10 +184,10 @@ class CodemodRegistry:
                     )
                 continue
 
-            try:
-                matched_codemods.append(self._codemods_by_id[name])
-            except KeyError:
+            if name not in self._codemods_by_id:
                 logger.warning(f"Requested codemod to include '{name}' does not exist.")
+                continue
+            matched_codemods.append(self.get(name))
         return matched_codemods
 
     def describe_codemods(
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import itertools
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar, Sequence, Type, TypeVar
@@ -100,6 +101,14 @@ class Result(ABCDataclass):
             for location in self.locations
         )
 
+    def match_lines(self) -> set[tuple[int, int]] | None:
+        """
+        The (start line, end line) pairs that a node must span in order to match this result.
+
+        `None` means that the result may match a node at any position, so it is always checked with `match_location`.
+        """
+        return {(location.start.line, location.end.line) for location in self.locations}
+
     def __hash__(self):
         return hash(self.rule_id)
 
@@ -250,7 +259,42 @@ def fuzzy_column_match(pos: CodeRange, location: Location) -> bool:
 ResultType = TypeVar("ResultType", bound=Result)
 
 
+class ResultLineIndex:
+    """
+    Index of results by the lines that a matching node must span
+
+    Only the results indexed under the lines of a node, along with any results that can match anywhere, need to be
+    checked against it. Candidates are always returned in the original order of the results.
+    """
+
+    def __init__(self, results: Sequence[Result]):
+        self.results = results
+        self._by_lines: dict[tuple[int, int], list[int]] = {}
+        self._anywhere: list[int] = []
+        for index, result in enumerate(results):
+            if (lines := result.match_lines()) is None:
+                self._anywhere.append(index)
+                continue
+            for key in lines:
+                self._by_lines.setdefault(key, []).append(index)
+
+    def candidates(self, pos: CodeRange) -> list[Result]:
+        indices = self._by_lines.get((pos.start.line, pos.end.line), [])
+        if self._anywhere:
+            indices = sorted(set(indices).union(self._anywhere))
+        return [self.results[index] for index in indices]
+
+
+def normalize_path(path: Path) -> Path:
+    """Collapse redundant separators and up-level references so equivalent paths compare equal."""
+    return Path(os.path.normpath(path))
+
+
 class ResultSet(dict[str, dict[Path, list[ResultType]]]):
+    """
+    Results indexed by rule ID and then by the (normalized) path of each location.
+    """
+
     results_for_rule: dict[str, list[ResultType]]
     # stores SARIF runs.tool data
     tools: list[dict[str, dict]]
@@ -263,7 +307,9 @@ class ResultSet(dict[str, dict[Path, list[ResultType]]]):
     def add_result(self, result: ResultType):
         self.results_for_rule.setdefault(result.rule_id, []).append(result)
         for loc in result.locations:
-            self.setdefault(result.rule_id, {}).setdefault(loc.file, []).append(result)
+            self.setdefault(result.rule_id, {}).setdefault(
+                normalize_path(loc.file), []
+            ).append(result)
 
     def store_tool_data(self, tool_data: dict):
         if tool_data:
@@ -281,7 +327,29 @@ class ResultSet(dict[str, dict[Path, list[ResultType]]]):
 
         Some implementers may need to use the context to compute paths that are relative to the target directory.
         """
-        return self.get(rule_id, {}).get(file.relative_to(context.directory), [])
+        return self.get(rule_id, {}).get(self.index_path(context, file), [])
+
+    def files_for_rules(
+        self, context: CodemodExecutionContext, rule_ids: list[str]
+    ) -> set[Path]:
+        """
+        Return the set of files that have results for any of the given rule IDs.
+
+        Paths are resolved against the target directory so that they can be compared with `context.files_to_analyze`.
+        """
+        return {
+            self.target_path(context, file)
+            for rule_id in rule_ids
+            for file in self.get(rule_id, {})
+        }
+
+    def index_path(self, context: CodemodExecutionContext, file: Path) -> Path:
+        """Convert a path within the target directory to the form used as a key of the index."""
+        return file.relative_to(context.directory)
+
+    def target_path(self, context: CodemodExecutionContext, file: Path) -> Path:
+        """Convert a key of the index to a path within the target directory."""
+        return context.directory / file
 
     def results_for_rules(self, rule_ids: list[str]) -> list[ResultType]:
         """
@@ -0,0 +1,89 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Sequence, TypeVar
+
+from codemodder.logging import logger
+from codemodder.result import ResultSet
+
+DEFAULT_MAX_RESULT_SETS = 16
+_DIGEST_CHUNK_SIZE = 1024 * 1024
+
+ResultSetType = TypeVar("ResultSetType", bound=ResultSet)
+
+FileKey = tuple[Path, str]
+
+
+class ResultSetCache:
+    """
+    Run-scoped cache of result sets loaded from tool result files
+
+    Every detector that reads the same tool result files shares a single loaded result set. Entries are keyed by the
+    path and content digest of each file, so a file that is rewritten in place under the same name is loaded again. The
+    digest of a file is only computed again when its modification time or size changes. At most `max_entries` result
+    sets are kept, least recently used first out.
+    """
+
+    max_entries: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_RESULT_SETS):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, tuple[FileKey, ...]], ResultSet] = (
+            OrderedDict()
+        )
+        self._digests: dict[tuple[Path, int, int], str] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        tool: str,
+        files: Sequence[str | Path],
+        load: Callable[[], ResultSetType],
+    ) -> ResultSetType:
+        """
+        Return the result set for the given tool and files, calling `load` to build it if it is not cached.
+        """
+        # Hold the lock while loading so that concurrent detectors do not load the same files twice
+        with self._lock:
+            key = (tool, tuple(self._file_key(Path(file)) for file in files))
+            if (result_set := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result_set  # type: ignore[return-value]
+
+            self.misses += 1
+            logger.debug("loading %s results from %s files", tool, len(files))
+            result_set = load()
+            self._entries[key] = result_set
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return result_set
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+
+    def _file_key(self, path: Path) -> FileKey:
+        stat = path.stat()
+        stat_key = (path, stat.st_mtime_ns, stat.st_size)
+        if (digest := self._digests.get(stat_key)) is None:
+            digest = self._digests[stat_key] = file_digest(path)
+        return path, digest
+
+
+def file_digest(path: Path) -> str:
+    # Tool result files can be very large so avoid reading them into memory all at once
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_DIGEST_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
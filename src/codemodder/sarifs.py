@@ -1,14 +1,29 @@
+import json
+import re
+import threading
+import time
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
+from dataclasses import dataclass
 from importlib.metadata import entry_points
 from pathlib import Path
-from typing import DefaultDict
+from typing import IO, Any, DefaultDict, Iterator
 
 from pydantic import ValidationError
+from sarif_pydantic import Result as ResultModel
 from sarif_pydantic import Run, Sarif
 
 from codemodder.logging import logger
 
+# Number of characters read from a SARIF file at a time
+SARIF_READ_SIZE = 1024 * 1024
+# Documents are kept in memory after they are first parsed as long as their estimated total size stays below this limit
+DEFAULT_MAX_SARIF_CACHE_BYTES = 256 * 1024 * 1024
+# Parsed JSON takes roughly this many times the size of the file in memory
+SARIF_MEMORY_FACTOR = 10
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
 
 class AbstractSarifToolDetector(metaclass=ABCMeta):
     @classmethod
@@ -17,7 +32,310 @@ class AbstractSarifToolDetector(metaclass=ABCMeta):
         pass
 
 
-def detect_sarif_tools(filenames: list[Path]) -> DefaultDict[str, list[Path]]:
+class _JsonStream:
+    """
+    Minimal incremental reader for the structure of a JSON document
+
+    Values are decoded one at a time with the standard library decoder, reading more of the
+    file whenever a value is not complete yet. Consumed input is discarded as soon as a value
+    has been decoded, so only the value that is currently being decoded is kept in memory.
+    """
+
+    def __init__(self, file: IO[str]):
+        self.file = file
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _read(self, size: int) -> bool:
+        if self.eof:
+            return False
+        if not (chunk := self.file.read(size)):
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def skip_whitespace(self):
+        while True:
+            match = _WHITESPACE.match(self.buffer, self.pos)
+            self.pos = match.end() if match else self.pos
+            if self.pos < len(self.buffer) or not self._read(SARIF_READ_SIZE):
+                return
+
+    def next_char(self) -> str:
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise self._error("Unexpected end of document")
+        char = self.buffer[self.pos]
+        self.pos += 1
+        return char
+
+    def peek_char(self) -> str:
+        self.skip_whitespace()
+        return self.buffer[self.pos] if self.pos < len(self.buffer) else ""
+
+    def expect(self, expected: str):
+        if (char := self.next_char()) != expected:
+            self.pos -= 1
+            raise self._error(f"Expected {expected!r} but found {char!r}")
+
+    def decode(self) -> Any:
+        self.skip_whitespace()
+        read_size = SARIF_READ_SIZE
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Grow geometrically so that a large value is not decoded over and over again
+                if not self._read(read_size):
+                    raise
+                read_size *= 2
+                continue
+
+            if end == len(self.buffer) and self._read(SARIF_READ_SIZE):
+                # A number may continue past the end of the buffer
+                continue
+
+            self.buffer = self.buffer[end:]
+            self.pos = 0
+            return value
+
+
+def _iter_sarif_document(file: IO[str]) -> Iterator[dict]:
+    stream = _JsonStream(file)
+    envelope: dict[str, Any] = {}
+
+    stream.expect("{")
+    if stream.peek_char() == "}":
+        stream.next_char()
+    else:
+        while True:
+            if not isinstance(key := stream.decode(), str):
+                raise stream._error("Expected a property name")
+            stream.expect(":")
+            if key == "runs" and stream.peek_char() == "[":
+                envelope[key] = []
+                stream.next_char()
+                if stream.peek_char() == "]":
+                    stream.next_char()
+                else:
+                    while True:
+                        yield stream.decode()
+                        if stream.next_char() == "]":
+                            break
+                        stream.pos -= 1
+                        stream.expect(",")
+            else:
+                envelope[key] = stream.decode()
+
+            if stream.next_char() == "}":
+                break
+            stream.pos -= 1
+            stream.expect(",")
+
+    if stream.peek_char():
+        raise stream._error("Extra data after the end of the document")
+
+    # Validate everything except the runs, which are validated one at a time as they are read
+    Sarif.model_validate(envelope)
+
+
+def iter_sarif_runs(sarif_file: str | Path) -> Iterator[tuple[Run, list[dict]]]:
+    """
+    Read the runs of a SARIF file one at a time without loading the whole document.
+
+    Each run is validated without its results, which are returned as raw data so that callers only build models for the
+    results they actually need with `iter_run_results`. At most one run is held in memory at a time.
+
+    Raises `ValidationError` if the file is not valid JSON or not a valid SARIF document.
+    """
+    with open(sarif_file, "r", encoding="utf-8-sig") as file:
+        try:
+            for run_data in _iter_sarif_document(file):
+                yield _split_run(run_data)
+        except json.JSONDecodeError as err:
+            raise ValidationError.from_exception_data(
+                Sarif.__name__,
+                [
+                    {
+                        "type": "json_invalid",
+                        "loc": (),
+                        "input": str(sarif_file),
+                        "ctx": {"error": str(err)},
+                    }
+                ],
+                input_type="json",
+            ) from err
+
+
+def iter_document_runs(document: dict) -> Iterator[tuple[Run, list[dict]]]:
+    """
+    Split the runs of a SARIF document that is already in memory the same way as `iter_sarif_runs`.
+
+    The document is modified in place: the results are removed from each run.
+
+    Raises `ValidationError` if it is not a valid SARIF document.
+    """
+    # Validate everything except the runs, which are validated one at a time
+    Sarif.model_validate({**document, "runs": []} if "runs" in document else document)
+    for run_data in document["runs"]:
+        yield _split_run(run_data)
+
+
+def _split_run(run_data: Any) -> tuple[Run, list[dict]]:
+    results = run_data.pop("results", None) if isinstance(run_data, dict) else None
+    return Run.model_validate(run_data), results or []
+
+
+def iter_run_results(results: list[dict]) -> Iterator[ResultModel]:
+    """Validate the raw results of a run returned by `iter_sarif_runs` one at a time."""
+    for result in results:
+        yield ResultModel.model_validate(result)
+
+
+@dataclass
+class _SarifDocument:
+    mtime_ns: int
+    size: int
+    parse_time: float
+    runs: list[tuple[Run, list[dict]]]
+
+    @property
+    def memory_size(self) -> int:
+        return estimate_memory_size(self.size)
+
+
+def estimate_memory_size(file_size: int) -> int:
+    """Estimate how much memory a SARIF file of the given size takes once it has been parsed."""
+    return file_size * SARIF_MEMORY_FACTOR
+
+
+class SarifDocumentCache:
+    """
+    Run-scoped cache of parsed SARIF documents
+
+    Documents are parsed once, when their tool is detected, and the parsed runs are then handed over to the result set
+    that is loaded from the same file, which evicts the document: from then on the result set itself is cached instead.
+    A document is parsed again if the file has changed on disk in the meantime. Documents that would push the estimated
+    in-memory size of the cache above `max_bytes` are not cached and are streamed every time instead.
+    """
+
+    max_bytes: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_SARIF_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._documents: dict[Path, _SarifDocument] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def load(self, sarif_file: str | Path) -> list[tuple[Run, list[dict]]]:
+        """
+        Return every run of a SARIF file, caching the parsed document if possible.
+        """
+        if (document := self._get(sarif_file)) is not None:
+            return document.runs
+
+        path = Path(sarif_file)
+        stat = path.stat()
+        start = time.perf_counter()
+        runs = list(iter_sarif_runs(sarif_file))
+        if self._fits(path, estimate_memory_size(stat.st_size)):
+            self._store(
+                path,
+                _SarifDocument(
+                    stat.st_mtime_ns, stat.st_size, time.perf_counter() - start, runs
+                ),
+            )
+        return runs
+
+    def load_runs(self, sarif_file: str | Path) -> list[Run]:
+        """
+        Return the runs of a SARIF file without their results, which is all that is needed to detect its tool.
+
+        The whole document is parsed and cached if it fits in the cache, so that its results can be reused later.
+        Otherwise the runs are streamed and the results of each run are discarded as soon as it has been read.
+        """
+        if (document := self._get(sarif_file)) is None:
+            path = Path(sarif_file)
+            if not self._fits(path, estimate_memory_size(path.stat().st_size)):
+                logger.debug("SARIF file %s is too large to keep in memory", path)
+                return [run for run, _ in iter_sarif_runs(sarif_file)]
+            return [run for run, _ in self.load(sarif_file)]
+        return [run for run, _ in document.runs]
+
+    def iter_runs(self, sarif_file: str | Path) -> Iterator[tuple[Run, list[dict]]]:
+        """
+        Yield the runs of a SARIF file from the cache, or stream them from the file if the document is not cached.
+
+        This is used to build result sets, which are cached on their own, so the document is evicted from the cache
+        rather than kept in memory a second time.
+        """
+        if (document := self._get(sarif_file, evict=True)) is not None:
+            return iter(document.runs)
+        return iter_sarif_runs(sarif_file)
+
+    def _get(
+        self, sarif_file: str | Path, evict: bool = False
+    ) -> _SarifDocument | None:
+        path = Path(sarif_file)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        with self._lock:
+            document = self._documents.get(path)
+            if (
+                document is None
+                or document.mtime_ns != stat.st_mtime_ns
+                or document.size != stat.st_size
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+            if evict:
+                del self._documents[path]
+                self._total_bytes -= document.memory_size
+
+        logger.debug(
+            "reusing parsed SARIF file %s: saved reading %s bytes and %.0f ms of parsing",
+            path,
+            document.size,
+            document.parse_time * 1000,
+        )
+        return document
+
+    def _fits(self, path: Path, size: int) -> bool:
+        """Whether a document of the given estimated in-memory size can be cached, checked before it is parsed."""
+        with self._lock:
+            previous = self._documents.get(path)
+            total = self._total_bytes - (previous.memory_size if previous else 0)
+        return total + size <= self.max_bytes
+
+    def _store(self, path: Path, document: _SarifDocument):
+        with self._lock:
+            if (previous := self._documents.pop(path, None)) is not None:
+                self._total_bytes -= previous.memory_size
+            if self._total_bytes + document.memory_size > self.max_bytes:
+                logger.debug("SARIF file %s is too large to keep in memory", path)
+                return
+            self._documents[path] = document
+            self._total_bytes += document.memory_size
+
+
+def detect_sarif_tools(
+    filenames: list[Path], documents: SarifDocumentCache | None = None
+) -> DefaultDict[str, list[Path]]:
     results: DefaultDict[str, list[Path]] = defaultdict(list)
 
     logger.debug("loading registered SARIF tool detectors")
@@ -25,17 +343,22 @@ def detect_sarif_tools(filenames: list[Path]) -> DefaultDict[str, list[Path]]:
         ent.name: ent.load() for ent in entry_points().select(group="sarif_detectors")
     }
     for fname in filenames:
+        # Only the tool information of each run is needed, the results are never validated
         try:
-            data = Sarif.model_validate_json(fname.read_text(encoding="utf-8-sig"))
+            runs = (
+                documents.load_runs(fname)
+                if documents
+                else [run for run, _ in iter_sarif_runs(fname)]
+            )
         except ValidationError:
             logger.exception("Invalid SARIF file: %s", fname)
             raise
 
-        if not data.runs:
+        if not runs:
             raise ValueError(f"SARIF file without `runs` data: {fname}")
 
         for name, det in detectors.items():
-            for run in data.runs:
+            for run in runs:
                 try:
                     if det.detect(run):
                         logger.debug("detected %s sarif: %s", name, fname)
@@ -1,25 +1,42 @@
 import itertools
 import json
+import math
+import os
 import subprocess
 import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 from typing import Iterable, Optional
 
-from sarif_pydantic import Sarif
 from typing_extensions import Self, override
 
 from codemodder.context import CodemodExecutionContext
 from codemodder.logging import logger
 from codemodder.result import (
     LocationModel,
-    Result,
     ResultModel,
     ResultSet,
     SarifLocation,
     SarifResult,
+    normalize_path,
 )
-from codemodder.sarifs import AbstractSarifToolDetector, Run
+from codemodder.sarifs import (
+    AbstractSarifToolDetector,
+    Run,
+    SarifDocumentCache,
+    iter_document_runs,
+    iter_run_results,
+    iter_sarif_runs,
+)
+from codemodder.semgrep_cache import rules_digest, semgrep_version
+
+# Target length of the paths given to each semgrep process, and the smallest shard worth a process of its own
+SEMGREP_SHARD_ARGS_LENGTH = 64 * 1024
+SEMGREP_MIN_SHARD_FILES = 200
+
+_GUID_NAMESPACE = uuid.UUID("46bb9cb3-ff17-41e7-9482-3e7789daee62")
 
 
 class SemgrepSarifToolDetector(AbstractSarifToolDetector):
@@ -56,12 +73,35 @@ class SemgrepResult(SarifResult):
 
 class SemgrepResultSet(ResultSet):
     @classmethod
-    def from_sarif(cls, sarif_file: str | Path, truncate_rule_id: bool = False) -> Self:
-        data = Sarif.model_validate_json(Path(sarif_file).read_text())
+    def from_sarif(
+        cls,
+        sarif_file: str | Path,
+        truncate_rule_id: bool = False,
+        documents: SarifDocumentCache | None = None,
+    ) -> Self:
+        return cls._from_runs(
+            (
+                documents.iter_runs(sarif_file)
+                if documents
+                else iter_sarif_runs(sarif_file)
+            ),
+            truncate_rule_id,
+        )
+
+    @classmethod
+    def from_sarif_document(
+        cls, document: dict, truncate_rule_id: bool = False
+    ) -> Self:
+        """Build the result set from a SARIF document that has already been parsed."""
+        return cls._from_runs(iter_document_runs(document), truncate_rule_id)
 
+    @classmethod
+    def _from_runs(
+        cls, runs: Iterable[tuple[Run, list[dict]]], truncate_rule_id: bool
+    ) -> Self:
         result_set = cls()
-        for sarif_run in data.runs:
-            for result in sarif_run.results or []:
+        for sarif_run, results in runs:
+            for result in iter_run_results(results):
                 sarif_result = SemgrepResult.from_sarif(
                     result, sarif_run, truncate_rule_id
                 )
@@ -71,14 +111,17 @@ class SemgrepResultSet(ResultSet):
 
 
 class InternalSemgrepResultSet(SemgrepResultSet):
+    # Semgrep is run on paths within the target directory, so they are used as is
+
+    @override
+    def index_path(self, context: CodemodExecutionContext, file: Path) -> Path:
+        del context
+        return normalize_path(file)
+
     @override
-    def results_for_rule_and_file(
-        self, context: CodemodExecutionContext, rule_id: str, file: Path
-    ) -> list[Result]:
+    def target_path(self, context: CodemodExecutionContext, file: Path) -> Path:
         del context
-        paths_for_rule = self.get(rule_id, {})
-        # Do not normalize the path
-        return paths_for_rule.get(file, [])
+        return file
 
 
 def run(
@@ -88,10 +131,109 @@ def run(
 ) -> SemgrepResultSet:
     """
     Runs Semgrep and outputs a dict with the results organized by rule_id.
+
+    When the context has a semgrep cache, only files that are not already in it are scanned.
     """
     if not yaml_files:
         raise ValueError("No Semgrep rules were provided")
 
+    files = list(files_to_analyze or [])
+    if (
+        (cache := execution_context.semgrep_cache) is not None
+        and files
+        and (version := semgrep_version())
+    ):
+        sarif = cache.get(
+            rules_digest(version, yaml_files),
+            files,
+            lambda to_scan: _scan(execution_context, yaml_files, to_scan),
+        )
+    else:
+        sarif = _scan(execution_context, yaml_files, files)
+
+    # semgrep prepends the folders into the rule-id, we want the base name only
+    return InternalSemgrepResultSet.from_sarif_document(sarif, truncate_rule_id=True)
+
+
+def _scan(
+    execution_context: CodemodExecutionContext,
+    yaml_files: Iterable[Path],
+    files_to_analyze: list[Path],
+) -> dict:
+    """
+    Runs Semgrep on the given files, or the whole directory if there are none, and returns the SARIF output.
+
+    Large file lists are split into shards that each run in a separate semgrep process, concurrently when the
+    context allows more than one worker.
+    """
+    shards = shard_files(files_to_analyze, execution_context.max_workers)
+    if len(shards) <= 1:
+        sarif = _scan_shard(execution_context, yaml_files, files_to_analyze)
+    else:
+        workers = max(1, min(execution_context.max_workers, len(shards)))
+        # Each semgrep process parallelizes on its own, so share the CPUs between them
+        jobs = max(1, (os.cpu_count() or 1) // workers)
+        logger.debug(
+            "running semgrep on %s files in %s shards with %s workers",
+            len(files_to_analyze),
+            len(shards),
+            workers,
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            sarifs = list(
+                executor.map(
+                    lambda shard: _scan_shard(
+                        execution_context, yaml_files, shard, jobs
+                    ),
+                    shards,
+                )
+            )
+        sarif = _merge_sarif(sarifs)
+
+    _assign_guids(sarif)
+    return sarif
+
+
+def shard_files(files: list[Path], shards: int) -> list[list[Path]]:
+    """
+    Split files into up to `shards` shards with a similar number of files and bytes in each.
+
+    Each shard has at least `SEMGREP_MIN_SHARD_FILES` files, but more shards are used if needed to keep the paths
+    of each shard well within command line length limits.
+    """
+    total_length = sum(len(str(file)) + 1 for file in files)
+    count = min(
+        len(files),
+        max(
+            # Starting semgrep is slow, so small file lists are not worth splitting
+            min(shards, len(files) // SEMGREP_MIN_SHARD_FILES),
+            math.ceil(total_length / SEMGREP_SHARD_ARGS_LENGTH),
+        ),
+    )
+    if count <= 1:
+        return [files] if files else []
+
+    result: list[list[Path]] = [[] for _ in range(count)]
+    for index, file in enumerate(sorted(files, key=_file_size, reverse=True)):
+        # Deal the files out back and forth, largest first, so that sizes even out
+        lap, position = divmod(index, count)
+        result[position if lap % 2 == 0 else count - 1 - position].append(file)
+    return result
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _scan_shard(
+    execution_context: CodemodExecutionContext,
+    yaml_files: Iterable[Path],
+    files_to_analyze: list[Path],
+    jobs: int | None = None,
+) -> dict:
     with NamedTemporaryFile(
         prefix="semgrep", suffix=".sarif", mode="w+"
     ) as temp_sarif_file:
@@ -104,6 +246,8 @@ def run(
             "-o",
             temp_sarif_file.name,
         ]
+        if jobs is not None:
+            command.extend(["--jobs", str(jobs)])
         command.extend(
             itertools.chain.from_iterable(
                 map(lambda f: ["--config", str(f)], yaml_files)
@@ -118,16 +262,6 @@ def run(
             stdout=None if execution_context.verbose else subprocess.PIPE,
             stderr=None if execution_context.verbose else subprocess.PIPE,
         )
-        # Insert guid in results
-        temp_sarif_file.seek(0)
-        sarif = Sarif.model_validate(json.load(temp_sarif_file))
-        for run in sarif.runs:
-            for result in run.results or []:
-                if not result.guid:
-                    result.guid = uuid.uuid4()
-        temp_sarif_file.seek(0)
-        temp_sarif_file.write(sarif.model_dump_json(exclude_none=True, by_alias=True))
-        temp_sarif_file.seek(0)
 
         if call.returncode != 0:
             if not execution_context.verbose:
@@ -138,8 +272,43 @@ def run(
                 logger.error("failed to read semgrep sarif output: %s", e)
 
             raise subprocess.CalledProcessError(call.returncode, command)
-        # semgrep prepends the folders into the rule-id, we want the base name only
-        results = InternalSemgrepResultSet.from_sarif(
-            temp_sarif_file.name, truncate_rule_id=True
-        )
-        return results
+
+        return json.load(temp_sarif_file)
+
+
+def _merge_sarif(sarifs: list[dict]) -> dict:
+    """Merge the results and invocations of each run of the given SARIF documents into the first document."""
+    merged = sarifs[0]
+    for sarif in sarifs[1:]:
+        for merged_run, run in zip(merged.get("runs") or [], sarif.get("runs") or []):
+            for key in ("results", "invocations"):
+                if key in run:
+                    merged_run[key] = (merged_run.get(key) or []) + run[key]
+    return merged
+
+
+def _assign_guids(sarif: dict):
+    """
+    Insert a guid in results that do not have one.
+
+    The guid is derived from the contents of the result so that it does not depend on how the files were sharded.
+    Identical results are told apart by the order in which they occur.
+    """
+    for run in sarif.get("runs") or []:
+        occurrences: Counter[str] = Counter()
+        for result in run.get("results") or []:
+            if result.get("guid"):
+                continue
+            key = json.dumps(
+                [
+                    # semgrep prepends the folders of the rule file, which are usually temporary
+                    (result.get("ruleId") or "").split(".")[-1],
+                    result.get("locations"),
+                    result.get("message"),
+                ],
+                sort_keys=True,
+            )
+            occurrences[key] += 1
+            result["guid"] = str(
+                uuid.uuid5(_GUID_NAMESPACE, f"{key}\0{occurrences[key]}")
+            )
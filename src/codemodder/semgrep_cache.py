@@ -0,0 +1,226 @@
+import functools
+import hashlib
+import importlib.metadata
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+from codemodder.logging import logger
+from codemodder.module_cache import content_digest
+from codemodder.result import normalize_path
+
+CACHE_DIR_NAME = "semgrep"
+CACHE_FORMAT_VERSION = 1
+
+
+@functools.cache
+def semgrep_version() -> str | None:
+    """
+    Version of semgrep, from its distribution metadata or else from `semgrep --version`.
+
+    Returns `None` if neither is available, in which case semgrep results are not cached.
+    """
+    try:
+        return importlib.metadata.version("semgrep")
+    except importlib.metadata.PackageNotFoundError:
+        pass
+
+    try:
+        call = subprocess.run(
+            ["semgrep", "--version"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as err:
+        logger.warning(
+            "could not determine the semgrep version, semgrep results will not be cached: %s",
+            err,
+        )
+        return None
+    return call.stdout.strip() or None
+
+
+def rules_digest(version: str, yaml_files: Iterable[Path]) -> str:
+    """
+    Digest of the semgrep version and the contents of the given rule files.
+
+    Rule files are identified by their contents only since they are usually temporary files.
+    """
+    digest = hashlib.sha256(f"{CACHE_FORMAT_VERSION}:{version}".encode("utf-8"))
+    for rule_digest in sorted(
+        content_digest(Path(file).read_bytes()) for file in yaml_files
+    ):
+        digest.update(rule_digest.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _result_path(result: dict) -> str | None:
+    try:
+        uri = result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"]
+    except (KeyError, IndexError, TypeError):
+        return None
+    return str(normalize_path(Path(uri)))
+
+
+class SemgrepResultCache:
+    """
+    Persistent cache of the SARIF results of semgrep for each file
+
+    Results for a file are reused while its path and contents, the rules and the semgrep version are all the same as
+    when it was last scanned, so only new or changed files have to be passed to semgrep. Each distinct set of rules and
+    semgrep version is stored in a separate file under the cache directory and is only read when it is first needed.
+    Only the files that have been requested during the current run are saved, so results for deleted or excluded files
+    are dropped from the cache.
+    """
+
+    directory: Path
+    hits: int
+    misses: int
+
+    def __init__(self, cache_dir: Path):
+        self.directory = cache_dir / CACHE_DIR_NAME
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, dict] = {}
+        self._requested: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        rules_key: str,
+        files: Sequence[Path],
+        scan: Callable[[list[Path]], dict],
+    ) -> dict:
+        """
+        Return a SARIF document with the results for the given files, calling `scan` for the files that are not cached.
+
+        `scan` must return the SARIF document produced by semgrep for the files it is given. The cache is only locked
+        while its entries are read and updated, so scans for different files or rules can run concurrently.
+        """
+        keys = [str(normalize_path(file)) for file in files]
+        digests: dict[str, str] = {}
+        for file, key in zip(files, keys):
+            try:
+                digests[key] = content_digest(Path(file).read_bytes())
+            except OSError:
+                continue
+
+        cached_results: list[dict] = []
+        to_scan: list[Path] = []
+        scanned_digests: dict[str, str] = {}
+        with self._lock:
+            entry = self._load(rules_key)
+            self._requested.setdefault(rules_key, set()).update(keys)
+            for file, key in zip(files, keys):
+                cached = entry["files"].get(key)
+                if (
+                    key in digests
+                    and cached is not None
+                    and cached["sha256"] == digests[key]
+                ):
+                    self.hits += 1
+                    cached_results.extend(cached["results"])
+                    continue
+                to_scan.append(file)
+                if key in digests:
+                    scanned_digests[key] = digests[key]
+            self.misses += len(to_scan)
+            tool = entry["tool"]
+
+        if not to_scan:
+            logger.debug("using cached semgrep results for %s files", len(files))
+            return {
+                "version": "2.1.0",
+                "runs": [{"tool": tool, "results": cached_results}],
+            }
+
+        logger.debug(
+            "scanning %s of %s files with semgrep, %s cached",
+            len(to_scan),
+            len(files),
+            len(files) - len(to_scan),
+        )
+        sarif = scan(to_scan)
+        if len(runs := sarif.get("runs") or []) != 1:
+            return sarif
+
+        run = runs[0]
+        results = run.get("results") or []
+        with self._lock:
+            if self._store(entry, run, results, scanned_digests):
+                self._save(rules_key, entry)
+        run["results"] = cached_results + results
+        return sarif
+
+    def _store(
+        self, entry: dict, run: dict, results: list[dict], digests: dict[str, str]
+    ) -> bool:
+        if not all(
+            invocation.get("executionSuccessful", True)
+            for invocation in run.get("invocations") or []
+        ):
+            logger.debug("semgrep did not run successfully, not caching results")
+            return False
+
+        results_by_file: dict[str, list[dict]] = {key: [] for key in digests}
+        for result in results:
+            if (key := _result_path(result)) not in results_by_file:
+                logger.debug("semgrep result for unexpected file %s, not caching", key)
+                return False
+            results_by_file[key].append(result)
+
+        entry["tool"] = run.get("tool")
+        for key, file_results in results_by_file.items():
+            entry["files"][key] = {"sha256": digests[key], "results": file_results}
+        return True
+
+    def _path(self, rules_key: str) -> Path:
+        return self.directory / f"{rules_key}.json"
+
+    def _load(self, rules_key: str) -> dict:
+        if (entry := self._entries.get(rules_key)) is not None:
+            return entry
+
+        entry = {"tool": None, "files": {}}
+        path = self._path(rules_key)
+        try:
+            data = json.loads(path.read_text("utf-8"))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as err:
+            logger.debug("ignoring unreadable semgrep cache %s: %s", path, err)
+        else:
+            if isinstance(data, dict) and isinstance(data.get("files"), dict):
+                entry = data
+
+        self._entries[rules_key] = entry
+        return entry
+
+    def _save(self, rules_key: str, entry: dict):
+        path = self._path(rules_key)
+        requested = self._requested.get(rules_key, set())
+        # Files that were not requested in this run are left out so the cache does not keep growing
+        entry = {
+            **entry,
+            "files": {
+                key: value for key, value in entry["files"].items() if key in requested
+            },
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so that an interrupted run never leaves a corrupt cache
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as err:
+            logger.warning("failed to save semgrep cache %s: %s", path, err)
@@ -1,238 +1,552 @@
-from codemodder.registry import CodemodCollection
+import importlib
 
-from .add_requests_timeouts import AddRequestsTimeouts
-from .break_or_continue_out_of_loop import BreakOrContinueOutOfLoop
-from .combine_isinstance_issubclass import CombineIsinstanceIssubclass
-from .combine_startswith_endswith import CombineStartswithEndswith
-from .defectdojo.semgrep.avoid_insecure_deserialization import (
-    AvoidInsecureDeserialization,
-)
-from .defectdojo.semgrep.django_secure_set_cookie import DjangoSecureSetCookie
-from .disable_graphql_introspection import DisableGraphQLIntrospection
-from .django_debug_flag_on import DjangoDebugFlagOn
-from .django_json_response_type import DjangoJsonResponseType
-from .django_model_without_dunder_str import DjangoModelWithoutDunderStr
-from .django_receiver_on_top import DjangoReceiverOnTop
-from .django_session_cookie_secure_off import DjangoSessionCookieSecureOff
-from .enable_jinja2_autoescape import EnableJinja2Autoescape
-from .exception_without_raise import ExceptionWithoutRaise
-from .file_resource_leak import FileResourceLeak
-from .fix_assert_tuple import FixAssertTuple
-from .fix_async_task_instantiation import FixAsyncTaskInstantiation
-from .fix_dataclass_defaults import FixDataclassDefaults
-from .fix_deprecated_abstractproperty import FixDeprecatedAbstractproperty
-from .fix_deprecated_logging_warn import FixDeprecatedLoggingWarn
-from .fix_empty_sequence_comparison import FixEmptySequenceComparison
-from .fix_float_equality import FixFloatEquality
-from .fix_hasattr_call import TransformFixHasattrCall
-from .fix_math_isclose import FixMathIsClose
-from .fix_missing_self_or_cls import FixMissingSelfOrCls
-from .fix_mutable_params import FixMutableParams
-from .flask_enable_csrf_protection import FlaskEnableCSRFProtection
-from .flask_json_response_type import FlaskJsonResponseType
-from .harden_pickle_load import HardenPickleLoad
-from .harden_pyyaml import HardenPyyaml
-from .harden_ruamel import HardenRuamel
-from .https_connection import HTTPSConnection
-from .invert_boolean_check import InvertedBooleanCheck
-from .jwt_decode_verify import JwtDecodeVerify
-from .lazy_logging import LazyLogging
-from .limit_readline import LimitReadline
-from .literal_or_new_object_identity import LiteralOrNewObjectIdentity
-from .lxml_safe_parser_defaults import LxmlSafeParserDefaults
-from .lxml_safe_parsing import LxmlSafeParsing
-from .numpy_nan_equality import NumpyNanEquality
-from .order_imports import OrderImports
-from .process_creation_sandbox import ProcessSandbox
-from .remove_assertion_in_pytest_raises import RemoveAssertionInPytestRaises
-from .remove_debug_breakpoint import RemoveDebugBreakpoint
-from .remove_future_imports import RemoveFutureImports
-from .remove_module_global import RemoveModuleGlobal
-from .remove_unnecessary_f_str import RemoveUnnecessaryFStr
-from .remove_unused_imports import RemoveUnusedImports
-from .replace_flask_send_file import ReplaceFlaskSendFile
-from .requests_verify import RequestsVerify
-from .secure_flask_cookie import SecureFlaskCookie
-from .secure_flask_session_config import SecureFlaskSessionConfig
-from .secure_random import SecureRandom
-from .semgrep.semgrep_django_secure_set_cookie import SemgrepDjangoSecureSetCookie
-from .semgrep.semgrep_enable_jinja2_autoescape import SemgrepEnableJinja2Autoescape
-from .semgrep.semgrep_harden_pyyaml import SemgrepHardenPyyaml
-from .semgrep.semgrep_jwt_decode_verify import SemgrepJwtDecodeVerify
-from .semgrep.semgrep_nan_injection import SemgrepNanInjection
-from .semgrep.semgrep_no_csrf_exempt import SemgrepNoCsrfExempt
-from .semgrep.semgrep_rsa_key_size import SemgrepRsaKeySize
-from .semgrep.semgrep_sandbox_process_creation import SemgrepSandboxProcessCreation
-from .semgrep.semgrep_sql_parameterization import SemgrepSQLParameterization
-from .semgrep.semgrep_subprocess_shell_false import SemgrepSubprocessShellFalse
-from .semgrep.semgrep_url_sandbox import SemgrepUrlSandbox
-from .semgrep.semgrep_use_defused_xml import SemgrepUseDefusedXml
-from .sonar.sonar_break_or_continue_out_of_loop import SonarBreakOrContinueOutOfLoop
-from .sonar.sonar_disable_graphql_introspection import SonarDisableGraphQLIntrospection
-from .sonar.sonar_django_json_response_type import SonarDjangoJsonResponseType
-from .sonar.sonar_django_model_without_dunder_str import (
-    SonarDjangoModelWithoutDunderStr,
-)
-from .sonar.sonar_django_receiver_on_top import SonarDjangoReceiverOnTop
-from .sonar.sonar_enable_jinja2_autoescape import SonarEnableJinja2Autoescape
-from .sonar.sonar_exception_without_raise import SonarExceptionWithoutRaise
-from .sonar.sonar_fix_assert_tuple import SonarFixAssertTuple
-from .sonar.sonar_fix_float_equality import SonarFixFloatEquality
-from .sonar.sonar_fix_math_isclose import SonarFixMathIsClose
-from .sonar.sonar_fix_missing_self_or_cls import SonarFixMissingSelfOrCls
-from .sonar.sonar_flask_json_response_type import SonarFlaskJsonResponseType
-from .sonar.sonar_invert_boolean_check import SonarInvertedBooleanCheck
-from .sonar.sonar_jwt_decode_verify import SonarJwtDecodeVerify
-from .sonar.sonar_literal_or_new_object_identity import SonarLiteralOrNewObjectIdentity
-from .sonar.sonar_numpy_nan_equality import SonarNumpyNanEquality
-from .sonar.sonar_remove_assertion_in_pytest_raises import (
-    SonarRemoveAssertionInPytestRaises,
-)
-from .sonar.sonar_sandbox_process_creation import SonarSandboxProcessCreation
-from .sonar.sonar_secure_cookie import SonarSecureCookie
-from .sonar.sonar_secure_random import SonarSecureRandom
-from .sonar.sonar_sql_parameterization import SonarSQLParameterization
-from .sonar.sonar_tempfile_mktemp import SonarTempfileMktemp
-from .sonar.sonar_timezone_aware_datetime import SonarTimezoneAwareDatetime
-from .sonar.sonar_url_sandbox import SonarUrlSandbox
-from .sonar.sonar_use_secure_protocols import SonarUseSecureProtocols
-from .sql_parameterization import SQLQueryParameterization
-from .str_concat_in_seq_literal import StrConcatInSeqLiteral
-from .subprocess_shell_false import SubprocessShellFalse
-from .tempfile_mktemp import TempfileMktemp
-from .timezone_aware_datetime import TimezoneAwareDatetime
-from .upgrade_sslcontext_minimum_version import UpgradeSSLContextMinimumVersion
-from .upgrade_sslcontext_tls import UpgradeSSLContextTLS
-from .url_sandbox import UrlSandbox
-from .use_defused_xml import UseDefusedXml
-from .use_generator import UseGenerator
-from .use_set_literal import UseSetLiteral
-from .use_walrus_if import UseWalrusIf
-from .with_threading_lock import WithThreadingLock
+from codemodder.registry import CodemodCollection, CodemodEntry
 
+# Static manifest of the core codemods. Each codemod module is only imported once the codemod is selected to run.
 registry = CodemodCollection(
     origin="pixee",
     codemods=[
-        AddRequestsTimeouts,
-        DjangoDebugFlagOn,
-        DjangoSessionCookieSecureOff,
-        EnableJinja2Autoescape,
-        FixDeprecatedAbstractproperty,
-        FixMutableParams,
-        HardenPickleLoad,
-        HardenPyyaml,
-        HardenRuamel,
-        HTTPSConnection,
-        JwtDecodeVerify,
-        LimitReadline,
-        LxmlSafeParserDefaults,
-        LxmlSafeParsing,
-        OrderImports,
-        ProcessSandbox,
-        RemoveFutureImports,
-        RemoveUnnecessaryFStr,
-        RemoveUnusedImports,
-        RequestsVerify,
-        SecureFlaskCookie,
-        SecureRandom,
-        TempfileMktemp,
-        UpgradeSSLContextMinimumVersion,
-        UpgradeSSLContextTLS,
-        UrlSandbox,
-        UseDefusedXml,
-        UseGenerator,
-        UseSetLiteral,
-        TimezoneAwareDatetime,
-        UseWalrusIf,
-        WithThreadingLock,
-        SQLQueryParameterization,
-        SecureFlaskSessionConfig,
-        SubprocessShellFalse,
-        FileResourceLeak,
-        DjangoReceiverOnTop,
-        NumpyNanEquality,
-        DjangoJsonResponseType,
-        FlaskJsonResponseType,
-        ExceptionWithoutRaise,
-        LiteralOrNewObjectIdentity,
-        RemoveModuleGlobal,
-        RemoveDebugBreakpoint,
-        CombineStartswithEndswith,
-        CombineIsinstanceIssubclass,
-        FixDeprecatedLoggingWarn,
-        FlaskEnableCSRFProtection,
-        ReplaceFlaskSendFile,
-        FixEmptySequenceComparison,
-        RemoveAssertionInPytestRaises,
-        FixAssertTuple,
-        FixFloatEquality,
-        LazyLogging,
-        StrConcatInSeqLiteral,
-        FixAsyncTaskInstantiation,
-        DjangoModelWithoutDunderStr,
-        TransformFixHasattrCall,
-        FixDataclassDefaults,
-        FixMissingSelfOrCls,
-        FixMathIsClose,
-        BreakOrContinueOutOfLoop,
-        DisableGraphQLIntrospection,
-        InvertedBooleanCheck,
+        CodemodEntry(
+            "pixee:python/add-requests-timeouts",
+            "core_codemods.add_requests_timeouts",
+            "AddRequestsTimeouts",
+        ),
+        CodemodEntry(
+            "pixee:python/django-debug-flag-on",
+            "core_codemods.django_debug_flag_on",
+            "DjangoDebugFlagOn",
+        ),
+        CodemodEntry(
+            "pixee:python/django-session-cookie-secure-off",
+            "core_codemods.django_session_cookie_secure_off",
+            "DjangoSessionCookieSecureOff",
+        ),
+        CodemodEntry(
+            "pixee:python/enable-jinja2-autoescape",
+            "core_codemods.enable_jinja2_autoescape",
+            "EnableJinja2Autoescape",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-deprecated-abstractproperty",
+            "core_codemods.fix_deprecated_abstractproperty",
+            "FixDeprecatedAbstractproperty",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-mutable-params",
+            "core_codemods.fix_mutable_params",
+            "FixMutableParams",
+        ),
+        CodemodEntry(
+            "pixee:python/harden-pickle-load",
+            "core_codemods.harden_pickle_load",
+            "HardenPickleLoad",
+        ),
+        CodemodEntry(
+            "pixee:python/harden-pyyaml",
+            "core_codemods.harden_pyyaml",
+            "HardenPyyaml",
+        ),
+        CodemodEntry(
+            "pixee:python/harden-ruamel",
+            "core_codemods.harden_ruamel",
+            "HardenRuamel",
+        ),
+        CodemodEntry(
+            "pixee:python/https-connection",
+            "core_codemods.https_connection",
+            "HTTPSConnection",
+        ),
+        CodemodEntry(
+            "pixee:python/jwt-decode-verify",
+            "core_codemods.jwt_decode_verify",
+            "JwtDecodeVerify",
+        ),
+        CodemodEntry(
+            "pixee:python/limit-readline",
+            "core_codemods.limit_readline",
+            "LimitReadline",
+        ),
+        CodemodEntry(
+            "pixee:python/safe-lxml-parser-defaults",
+            "core_codemods.lxml_safe_parser_defaults",
+            "LxmlSafeParserDefaults",
+        ),
+        CodemodEntry(
+            "pixee:python/safe-lxml-parsing",
+            "core_codemods.lxml_safe_parsing",
+            "LxmlSafeParsing",
+        ),
+        CodemodEntry(
+            "pixee:python/order-imports",
+            "core_codemods.order_imports",
+            "OrderImports",
+        ),
+        CodemodEntry(
+            "pixee:python/sandbox-process-creation",
+            "core_codemods.process_creation_sandbox",
+            "ProcessSandbox",
+        ),
+        CodemodEntry(
+            "pixee:python/remove-future-imports",
+            "core_codemods.remove_future_imports",
+            "RemoveFutureImports",
+        ),
+        CodemodEntry(
+            "pixee:python/remove-unnecessary-f-str",
+            "core_codemods.remove_unnecessary_f_str",
+            "RemoveUnnecessaryFStr",
+        ),
+        CodemodEntry(
+            "pixee:python/unused-imports",
+            "core_codemods.remove_unused_imports",
+            "RemoveUnusedImports",
+        ),
+        CodemodEntry(
+            "pixee:python/requests-verify",
+            "core_codemods.requests_verify",
+            "RequestsVerify",
+        ),
+        CodemodEntry(
+            "pixee:python/secure-flask-cookie",
+            "core_codemods.secure_flask_cookie",
+            "SecureFlaskCookie",
+        ),
+        CodemodEntry(
+            "pixee:python/secure-random",
+            "core_codemods.secure_random",
+            "SecureRandom",
+        ),
+        CodemodEntry(
+            "pixee:python/secure-tempfile",
+            "core_codemods.tempfile_mktemp",
+            "TempfileMktemp",
+        ),
+        CodemodEntry(
+            "pixee:python/upgrade-sslcontext-minimum-version",
+            "core_codemods.upgrade_sslcontext_minimum_version",
+            "UpgradeSSLContextMinimumVersion",
+        ),
+        CodemodEntry(
+            "pixee:python/upgrade-sslcontext-tls",
+            "core_codemods.upgrade_sslcontext_tls",
+            "UpgradeSSLContextTLS",
+        ),
+        CodemodEntry(
+            "pixee:python/url-sandbox",
+            "core_codemods.url_sandbox",
+            "UrlSandbox",
+        ),
+        CodemodEntry(
+            "pixee:python/use-defusedxml",
+            "core_codemods.use_defused_xml",
+            "UseDefusedXml",
+        ),
+        CodemodEntry(
+            "pixee:python/use-generator",
+            "core_codemods.use_generator",
+            "UseGenerator",
+        ),
+        CodemodEntry(
+            "pixee:python/use-set-literal",
+            "core_codemods.use_set_literal",
+            "UseSetLiteral",
+        ),
+        CodemodEntry(
+            "pixee:python/timezone-aware-datetime",
+            "core_codemods.timezone_aware_datetime",
+            "TimezoneAwareDatetime",
+        ),
+        CodemodEntry(
+            "pixee:python/use-walrus-if",
+            "core_codemods.use_walrus_if",
+            "UseWalrusIf",
+        ),
+        CodemodEntry(
+            "pixee:python/bad-lock-with-statement",
+            "core_codemods.with_threading_lock",
+            "WithThreadingLock",
+        ),
+        CodemodEntry(
+            "pixee:python/sql-parameterization",
+            "core_codemods.sql_parameterization",
+            "SQLQueryParameterization",
+        ),
+        CodemodEntry(
+            "pixee:python/secure-flask-session-configuration",
+            "core_codemods.secure_flask_session_config",
+            "SecureFlaskSessionConfig",
+        ),
+        CodemodEntry(
+            "pixee:python/subprocess-shell-false",
+            "core_codemods.subprocess_shell_false",
+            "SubprocessShellFalse",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-file-resource-leak",
+            "core_codemods.file_resource_leak",
+            "FileResourceLeak",
+        ),
+        CodemodEntry(
+            "pixee:python/django-receiver-on-top",
+            "core_codemods.django_receiver_on_top",
+            "DjangoReceiverOnTop",
+        ),
+        CodemodEntry(
+            "pixee:python/numpy-nan-equality",
+            "core_codemods.numpy_nan_equality",
+            "NumpyNanEquality",
+        ),
+        CodemodEntry(
+            "pixee:python/django-json-response-type",
+            "core_codemods.django_json_response_type",
+            "DjangoJsonResponseType",
+        ),
+        CodemodEntry(
+            "pixee:python/flask-json-response-type",
+            "core_codemods.flask_json_response_type",
+            "FlaskJsonResponseType",
+        ),
+        CodemodEntry(
+            "pixee:python/exception-without-raise",
+            "core_codemods.exception_without_raise",
+            "ExceptionWithoutRaise",
+        ),
+        CodemodEntry(
+            "pixee:python/literal-or-new-object-identity",
+            "core_codemods.literal_or_new_object_identity",
+            "LiteralOrNewObjectIdentity",
+        ),
+        CodemodEntry(
+            "pixee:python/remove-module-global",
+            "core_codemods.remove_module_global",
+            "RemoveModuleGlobal",
+        ),
+        CodemodEntry(
+            "pixee:python/remove-debug-breakpoint",
+            "core_codemods.remove_debug_breakpoint",
+            "RemoveDebugBreakpoint",
+        ),
+        CodemodEntry(
+            "pixee:python/combine-startswith-endswith",
+            "core_codemods.combine_startswith_endswith",
+            "CombineStartswithEndswith",
+        ),
+        CodemodEntry(
+            "pixee:python/combine-isinstance-issubclass",
+            "core_codemods.combine_isinstance_issubclass",
+            "CombineIsinstanceIssubclass",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-deprecated-logging-warn",
+            "core_codemods.fix_deprecated_logging_warn",
+            "FixDeprecatedLoggingWarn",
+        ),
+        CodemodEntry(
+            "pixee:python/flask-enable-csrf-protection",
+            "core_codemods.flask_enable_csrf_protection",
+            "FlaskEnableCSRFProtection",
+        ),
+        CodemodEntry(
+            "pixee:python/replace-flask-send-file",
+            "core_codemods.replace_flask_send_file",
+            "ReplaceFlaskSendFile",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-empty-sequence-comparison",
+            "core_codemods.fix_empty_sequence_comparison",
+            "FixEmptySequenceComparison",
+        ),
+        CodemodEntry(
+            "pixee:python/remove-assertion-in-pytest-raises",
+            "core_codemods.remove_assertion_in_pytest_raises",
+            "RemoveAssertionInPytestRaises",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-assert-tuple",
+            "core_codemods.fix_assert_tuple",
+            "FixAssertTuple",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-float-equality",
+            "core_codemods.fix_float_equality",
+            "FixFloatEquality",
+        ),
+        CodemodEntry(
+            "pixee:python/lazy-logging",
+            "core_codemods.lazy_logging",
+            "LazyLogging",
+        ),
+        CodemodEntry(
+            "pixee:python/str-concat-in-sequence-literals",
+            "core_codemods.str_concat_in_seq_literal",
+            "StrConcatInSeqLiteral",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-async-task-instantiation",
+            "core_codemods.fix_async_task_instantiation",
+            "FixAsyncTaskInstantiation",
+        ),
+        CodemodEntry(
+            "pixee:python/django-model-without-dunder-str",
+            "core_codemods.django_model_without_dunder_str",
+            "DjangoModelWithoutDunderStr",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-hasattr-call",
+            "core_codemods.fix_hasattr_call",
+            "TransformFixHasattrCall",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-dataclass-defaults",
+            "core_codemods.fix_dataclass_defaults",
+            "FixDataclassDefaults",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-missing-self-or-cls",
+            "core_codemods.fix_missing_self_or_cls",
+            "FixMissingSelfOrCls",
+        ),
+        CodemodEntry(
+            "pixee:python/fix-math-isclose",
+            "core_codemods.fix_math_isclose",
+            "FixMathIsClose",
+        ),
+        CodemodEntry(
+            "pixee:python/break-or-continue-out-of-loop",
+            "core_codemods.break_or_continue_out_of_loop",
+            "BreakOrContinueOutOfLoop",
+        ),
+        CodemodEntry(
+            "pixee:python/disable-graphql-introspection",
+            "core_codemods.disable_graphql_introspection",
+            "DisableGraphQLIntrospection",
+        ),
+        CodemodEntry(
+            "pixee:python/invert-boolean-check",
+            "core_codemods.invert_boolean_check",
+            "InvertedBooleanCheck",
+        ),
     ],
 )
 
 sonar_registry = CodemodCollection(
     origin="sonar",
     codemods=[
-        SonarNumpyNanEquality,
-        SonarLiteralOrNewObjectIdentity,
-        SonarDjangoReceiverOnTop,
-        SonarExceptionWithoutRaise,
-        SonarFixAssertTuple,
-        SonarRemoveAssertionInPytestRaises,
-        SonarFlaskJsonResponseType,
-        SonarDjangoJsonResponseType,
-        SonarJwtDecodeVerify,
-        SonarFixMissingSelfOrCls,
-        SonarTempfileMktemp,
-        SonarSecureRandom,
-        SonarEnableJinja2Autoescape,
-        SonarUrlSandbox,
-        SonarFixFloatEquality,
-        SonarFixMathIsClose,
-        SonarSQLParameterization,
-        SonarDjangoModelWithoutDunderStr,
-        SonarBreakOrContinueOutOfLoop,
-        SonarDisableGraphQLIntrospection,
-        SonarInvertedBooleanCheck,
-        SonarTimezoneAwareDatetime,
-        SonarSandboxProcessCreation,
-        SonarSecureCookie,
-        SonarUseSecureProtocols,
+        CodemodEntry(
+            "sonar:python/numpy-nan-equality",
+            "core_codemods.sonar.sonar_numpy_nan_equality",
+            "SonarNumpyNanEquality",
+        ),
+        CodemodEntry(
+            "sonar:python/literal-or-new-object-identity",
+            "core_codemods.sonar.sonar_literal_or_new_object_identity",
+            "SonarLiteralOrNewObjectIdentity",
+        ),
+        CodemodEntry(
+            "sonar:python/django-receiver-on-top",
+            "core_codemods.sonar.sonar_django_receiver_on_top",
+            "SonarDjangoReceiverOnTop",
+        ),
+        CodemodEntry(
+            "sonar:python/exception-without-raise",
+            "core_codemods.sonar.sonar_exception_without_raise",
+            "SonarExceptionWithoutRaise",
+        ),
+        CodemodEntry(
+            "sonar:python/fix-assert-tuple",
+            "core_codemods.sonar.sonar_fix_assert_tuple",
+            "SonarFixAssertTuple",
+        ),
+        CodemodEntry(
+            "sonar:python/remove-assertion-in-pytest-raises",
+            "core_codemods.sonar.sonar_remove_assertion_in_pytest_raises",
+            "SonarRemoveAssertionInPytestRaises",
+        ),
+        CodemodEntry(
+            "sonar:python/flask-json-response-type",
+            "core_codemods.sonar.sonar_flask_json_response_type",
+            "SonarFlaskJsonResponseType",
+        ),
+        CodemodEntry(
+            "sonar:python/django-json-response-type",
+            "core_codemods.sonar.sonar_django_json_response_type",
+            "SonarDjangoJsonResponseType",
+        ),
+        CodemodEntry(
+            "sonar:python/jwt-decode-verify",
+            "core_codemods.sonar.sonar_jwt_decode_verify",
+            "SonarJwtDecodeVerify",
+        ),
+        CodemodEntry(
+            "sonar:python/fix-missing-self-or-cls",
+            "core_codemods.sonar.sonar_fix_missing_self_or_cls",
+            "SonarFixMissingSelfOrCls",
+        ),
+        CodemodEntry(
+            "sonar:python/secure-tempfile",
+            "core_codemods.sonar.sonar_tempfile_mktemp",
+            "SonarTempfileMktemp",
+        ),
+        CodemodEntry(
+            "sonar:python/secure-random",
+            "core_codemods.sonar.sonar_secure_random",
+            "SonarSecureRandom",
+        ),
+        CodemodEntry(
+            "sonar:python/enable-jinja2-autoescape",
+            "core_codemods.sonar.sonar_enable_jinja2_autoescape",
+            "SonarEnableJinja2Autoescape",
+        ),
+        CodemodEntry(
+            "sonar:python/url-sandbox",
+            "core_codemods.sonar.sonar_url_sandbox",
+            "SonarUrlSandbox",
+        ),
+        CodemodEntry(
+            "sonar:python/fix-float-equality",
+            "core_codemods.sonar.sonar_fix_float_equality",
+            "SonarFixFloatEquality",
+        ),
+        CodemodEntry(
+            "sonar:python/fix-math-isclose",
+            "core_codemods.sonar.sonar_fix_math_isclose",
+            "SonarFixMathIsClose",
+        ),
+        CodemodEntry(
+            "sonar:python/sql-parameterization",
+            "core_codemods.sonar.sonar_sql_parameterization",
+            "SonarSQLParameterization",
+        ),
+        CodemodEntry(
+            "sonar:python/django-model-without-dunder-str",
+            "core_codemods.sonar.sonar_django_model_without_dunder_str",
+            "SonarDjangoModelWithoutDunderStr",
+        ),
+        CodemodEntry(
+            "sonar:python/break-or-continue-out-of-loop",
+            "core_codemods.sonar.sonar_break_or_continue_out_of_loop",
+            "SonarBreakOrContinueOutOfLoop",
+        ),
+        CodemodEntry(
+            "sonar:python/disable-graphql-introspection",
+            "core_codemods.sonar.sonar_disable_graphql_introspection",
+            "SonarDisableGraphQLIntrospection",
+        ),
+        CodemodEntry(
+            "sonar:python/invert-boolean-check",
+            "core_codemods.sonar.sonar_invert_boolean_check",
+            "SonarInvertedBooleanCheck",
+        ),
+        CodemodEntry(
+            "sonar:python/timezone-aware-datetime",
+            "core_codemods.sonar.sonar_timezone_aware_datetime",
+            "SonarTimezoneAwareDatetime",
+        ),
+        CodemodEntry(
+            "sonar:python/sandbox-process-creation",
+            "core_codemods.sonar.sonar_sandbox_process_creation",
+            "SonarSandboxProcessCreation",
+        ),
+        CodemodEntry(
+            "sonar:python/secure-cookie",
+            "core_codemods.sonar.sonar_secure_cookie",
+            "SonarSecureCookie",
+        ),
+        CodemodEntry(
+            "sonar:python/use-secure-protocols",
+            "core_codemods.sonar.sonar_use_secure_protocols",
+            "SonarUseSecureProtocols",
+        ),
     ],
 )
 
 defectdojo_registry = CodemodCollection(
     origin="defectdojo",
     codemods=[
-        AvoidInsecureDeserialization,
-        DjangoSecureSetCookie,
+        CodemodEntry(
+            "defectdojo:python/avoid-insecure-deserialization",
+            "core_codemods.defectdojo.semgrep.avoid_insecure_deserialization",
+            "AvoidInsecureDeserialization",
+        ),
+        CodemodEntry(
+            "defectdojo:python/django-secure-set-cookie",
+            "core_codemods.defectdojo.semgrep.django_secure_set_cookie",
+            "DjangoSecureSetCookie",
+        ),
     ],
 )
 
 semgrep_registry = CodemodCollection(
     origin="semgrep",
     codemods=[
-        SemgrepUrlSandbox,
-        SemgrepEnableJinja2Autoescape,
-        SemgrepNoCsrfExempt,
-        SemgrepJwtDecodeVerify,
-        SemgrepUseDefusedXml,
-        SemgrepSandboxProcessCreation,
-        SemgrepSubprocessShellFalse,
-        SemgrepDjangoSecureSetCookie,
-        SemgrepHardenPyyaml,
-        SemgrepRsaKeySize,
-        SemgrepSQLParameterization,
-        SemgrepNanInjection,
+        CodemodEntry(
+            "semgrep:python/url-sandbox",
+            "core_codemods.semgrep.semgrep_url_sandbox",
+            "SemgrepUrlSandbox",
+        ),
+        CodemodEntry(
+            "semgrep:python/enable-jinja2-autoescape",
+            "core_codemods.semgrep.semgrep_enable_jinja2_autoescape",
+            "SemgrepEnableJinja2Autoescape",
+        ),
+        CodemodEntry(
+            "semgrep:python/no-csrf-exempt",
+            "core_codemods.semgrep.semgrep_no_csrf_exempt",
+            "SemgrepNoCsrfExempt",
+        ),
+        CodemodEntry(
+            "semgrep:python/jwt-decode-verify",
+            "core_codemods.semgrep.semgrep_jwt_decode_verify",
+            "SemgrepJwtDecodeVerify",
+        ),
+        CodemodEntry(
+            "semgrep:python/use-defusedxml",
+            "core_codemods.semgrep.semgrep_use_defused_xml",
+            "SemgrepUseDefusedXml",
+        ),
+        CodemodEntry(
+            "semgrep:python/sandbox-process-creation",
+            "core_codemods.semgrep.semgrep_sandbox_process_creation",
+            "SemgrepSandboxProcessCreation",
+        ),
+        CodemodEntry(
+            "semgrep:python/subprocess-shell-false",
+            "core_codemods.semgrep.semgrep_subprocess_shell_false",
+            "SemgrepSubprocessShellFalse",
+        ),
+        CodemodEntry(
+            "semgrep:python/django-secure-set-cookie",
+            "core_codemods.semgrep.semgrep_django_secure_set_cookie",
+            "SemgrepDjangoSecureSetCookie",
+        ),
+        CodemodEntry(
+            "semgrep:python/harden-pyyaml",
+            "core_codemods.semgrep.semgrep_harden_pyyaml",
+            "SemgrepHardenPyyaml",
+        ),
+        CodemodEntry(
+            "semgrep:python/rsa-key-size",
+            "core_codemods.semgrep.semgrep_rsa_key_size",
+            "SemgrepRsaKeySize",
+        ),
+        CodemodEntry(
+            "semgrep:python/sql-parameterization",
+            "core_codemods.semgrep.semgrep_sql_parameterization",
+            "SemgrepSQLParameterization",
+        ),
+        CodemodEntry(
+            "semgrep:python/nan-injection",
+            "core_codemods.semgrep.semgrep_nan_injection",
+            "SemgrepNanInjection",
+        ),
     ],
 )
+
+
+def __getattr__(name: str):
+    # Codemods used to be imported here, so they can still be imported from this package
+    for collection in (registry, sonar_registry, defectdojo_registry, semgrep_registry):
+        for entry in collection.codemods:
+            if entry.name == name:
+                return getattr(importlib.import_module(entry.module), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,7 +8,6 @@ from typing_extensions import override
 from codemodder.codemods.api import Metadata, Reference, ToolMetadata, ToolRule
 from codemodder.codemods.base_detector import BaseDetector
 from codemodder.context import CodemodExecutionContext
-from codemodder.llm import TokenUsage
 from codemodder.result import ResultSet
 from core_codemods.api import CoreCodemod, SASTCodemod
 
@@ -73,20 +72,8 @@ class DefectDojoCodemod(SASTCodemod):
             requested_rules=[rule_id],
         )
 
+    @property
     @override
-    def apply(
-        self,
-        context: CodemodExecutionContext,
-        remediation: bool = False,
-    ) -> None | TokenUsage:
-        if remediation:
-            return self._apply_remediation(
-                context,
-                # We know this has a tool because we created it with `from_core_codemod`
-                cast(ToolMetadata, self._metadata.tool).rule_ids,
-            )
-        return self._apply_hardening(
-            context,
-            # We know this has a tool because we created it with `from_core_codemod`
-            cast(ToolMetadata, self._metadata.tool).rule_ids,
-        )
+    def rules(self) -> list[str]:
+        # We know this has a tool because we created it with `from_core_codemod`
+        return cast(ToolMetadata, self._metadata.tool).rule_ids
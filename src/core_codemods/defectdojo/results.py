@@ -53,6 +53,11 @@ class DefectDojoResult(SASTResult):
             for location in self.locations
         )
 
+    @override
+    def match_lines(self) -> None:
+        # Any node that contains the start line of the result may match
+        return None
+
 
 class DefectDojoResultSet(ResultSet):
     @classmethod
@@ -5,7 +5,9 @@ import mock
 import pytest
 from libcst.codemod import CodemodContext
 
+from codemodder.codemods import process_pool
 from codemodder.codemods.api import Metadata, ReviewGuidance, SimpleCodemod
+from codemodder.codemods.test.utils import validate_codemod_registration
 from codemodder.context import CodemodExecutionContext
 from codemodder.result import ResultSet
 from core_codemods.api import CoreCodemod, SASTCodemod
@@ -73,7 +75,7 @@ def test_core_codemod_filter_apply_by_extension(mocker, ext, call_count):
         default_extensions=[ext],
     )
 
-    context = mocker.MagicMock()
+    context = mocker.MagicMock(max_workers=2, executor="thread")
     context.find_and_fix_paths = [
         Path("file.py"),
         Path("file.txt"),
@@ -217,3 +219,94 @@ def test_sast_codemod_filter_by_findings_with_path_include(mocker):
     )
 
     assert codemod.get_files_to_analyze(context, results) == [Path("file.py")]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_apply_with_executor(tmp_path, executor):
+    codemod = validate_codemod_registration("pixee:python/fix-mutable-params")
+    for name in ("first", "second", "third"):
+        (tmp_path / f"{name}.py").write_text("def func(foo=[]):\n    return foo\n")
+
+    context = CodemodExecutionContext(
+        directory=tmp_path,
+        dry_run=True,
+        verbose=False,
+        registry=mock.MagicMock(),
+        providers=mock.MagicMock(),
+        repo_manager=mock.MagicMock(),
+        max_workers=2,
+        executor=executor,
+    )
+
+    codemod.apply(context)
+
+    changesets = context.get_changesets(codemod.id)
+    assert sorted(changeset.path for changeset in changesets) == [
+        "first.py",
+        "second.py",
+        "third.py",
+    ]
+    assert all("foo=None" in changeset.diff for changeset in changesets)
+    assert context.timer.get_time_ms("parse") >= 0
+    assert not context.get_failed_files()
+    context.shutdown_process_pool()
+
+
+@pytest.mark.parametrize(
+    "max_workers, executor", [(1, "thread"), (2, "thread"), (2, "process")]
+)
+def test_process_files_includes_skipped_files(tmp_path, mocker, max_workers, executor):
+    codemod = validate_codemod_registration("pixee:python/fix-mutable-params")
+    paths = [tmp_path / f"{name}.py" for name in ("first", "second", "third")]
+    for path in paths:
+        path.write_text("def func(foo=[]):\n    return foo\n")
+
+    context = CodemodExecutionContext(
+        directory=tmp_path,
+        dry_run=True,
+        verbose=False,
+        registry=mock.MagicMock(),
+        providers=mock.MagicMock(),
+        repo_manager=mock.MagicMock(),
+        max_workers=max_workers,
+        executor=executor,
+    )
+    context.incremental_cache = mocker.MagicMock()
+    context.incremental_cache.check.side_effect = lambda codemod_id, path: (
+        path.name == "second.py",
+        "digest",
+    )
+
+    contexts = codemod._process_files(context, paths, [None] * len(paths), [])
+    context.shutdown_process_pool()
+
+    assert [len(file_context.changesets) for file_context in contexts] == [1, 0, 1]
+    assert context.incremental_cache.record.call_count == 2
+
+
+def test_process_pool_shared_between_codemods(tmp_path, mocker):
+    (tmp_path / "code.py").write_text(
+        "import os\n\ndef func(foo=[]):\n    return foo\n"
+    )
+    context = CodemodExecutionContext(
+        directory=tmp_path,
+        dry_run=True,
+        verbose=False,
+        registry=mock.MagicMock(),
+        providers=mock.MagicMock(),
+        repo_manager=mock.MagicMock(),
+        max_workers=2,
+        executor="process",
+    )
+    create_pool = mocker.spy(process_pool, "create_process_pool")
+
+    for codemod_id in (
+        "pixee:python/fix-mutable-params",
+        "pixee:python/unused-imports",
+    ):
+        validate_codemod_registration(codemod_id).apply(context)
+    context.shutdown_process_pool()
+
+    create_pool.assert_called_once()
+    assert context.get_changesets("pixee:python/fix-mutable-params")
+    assert context.get_changesets("pixee:python/unused-imports")
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from pathlib import Path
 from textwrap import dedent
 
 import libcst as cst
@@ -7,6 +8,24 @@ from libcst.codemod import CodemodContext
 from libcst.metadata import PositionProvider
 
 from codemodder.codemods.base_visitor import BaseTransformer
+from codemodder.codetf import Finding, Rule
+from codemodder.result import LineInfo, SarifLocation, SASTResult
+from core_codemods.defectdojo.results import DefectDojoResult
+
+
+def _result(line, start_column, end_column):
+    return SASTResult(
+        rule_id="rule",
+        finding_id=str(line),
+        locations=[
+            SarifLocation(
+                file=Path("code.py"),
+                start=LineInfo(line, start_column),
+                end=LineInfo(line, end_column),
+            )
+        ],
+        finding=Finding(id=str(line), rule=Rule(id="rule", name="rule")),
+    )
 
 
 class DeleteStatementLinesCodemod(BaseTransformer):
@@ -31,6 +50,22 @@ class DeleteStatementLinesCodemod(BaseTransformer):
         return original_node
 
 
+class SelectedStatementLinesCodemod(BaseTransformer):
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
+    def __init__(self, context, results):
+        BaseTransformer.__init__(self, context, results, [], [])
+        self.selected = []
+
+    def leave_SimpleStatementLine(
+        self, original_node: cst.SimpleStatementLine, updated_node
+    ):
+        if results := self.results_for_node(original_node):
+            self.selected.append(results)
+            return cst.RemovalSentinel.REMOVE
+        return original_node
+
+
 class AssertPositionCodemod(BaseTransformer):
     METADATA_DEPENDENCIES = (PositionProvider,)
 
@@ -114,6 +149,19 @@ class TestBaseVisitor:
         line_include = [1]
         self.run_and_assert(input_code, expected, line_exclude, line_include)
 
+    def test_results_for_node(self):
+        input_code = "a = 1\nb = 2\nc = 3\nd = 4\n"
+        defectdojo = DefectDojoResult.from_result(
+            {"id": 1, "title": "rule", "file_path": "code.py", "line": 4}
+        )
+        results = [_result(2, 1, 6), _result(3, 2, 3), defectdojo]
+        command_instance = SelectedStatementLinesCodemod(CodemodContext(), results)
+
+        output_tree = command_instance.transform_module(cst.parse_module(input_code))
+
+        assert output_tree.code == "a = 1\nc = 3\n"
+        assert command_instance.selected == [[results[0]], [defectdojo]]
+
 
 class TestNodePosition:
     def run_and_assert(self, input_code, expected_pos):
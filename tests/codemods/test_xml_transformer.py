@@ -4,6 +4,8 @@ import mock
 
 from codemodder.codemods.xml_transformer import (
     ElementAttributeXMLTransformer,
+    NewElement,
+    NewElementXMLTransformer,
     XMLTransformerPipeline,
 )
 from codemodder.context import CodemodExecutionContext
@@ -69,3 +71,72 @@ def test_transformer(mocker):
         results=None,
     )
     assert changeset is not None
+
+
+class SetFlagTransformer(ElementAttributeXMLTransformer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(
+            *args,
+            name_attributes_map={"element": {"flag": "true"}},
+            line_only_matching=True,
+            **kwargs,
+        )
+
+
+def _result(line):
+    location = mock.MagicMock()
+    location.start.line = line
+    return mock.MagicMock(locations=[location])
+
+
+class AddChildTransformer(NewElementXMLTransformer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(
+            *args, new_elements=[NewElement(name="child", parent_name="root")], **kwargs
+        )
+
+
+def _apply(tmp_path, results, dry_run=False, transformer=SetFlagTransformer):
+    file_path = tmp_path / "file.xml"
+    file_path.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<root>\n<element></element>\n</root>'
+    )
+    execution_context = CodemodExecutionContext(
+        directory=tmp_path,
+        dry_run=dry_run,
+        verbose=False,
+        registry=mock.MagicMock(),
+        providers=None,
+        repo_manager=mock.MagicMock(),
+    )
+    file_context = FileContext(tmp_path, file_path)
+    pipeline = XMLTransformerPipeline(transformer)
+    return file_path, pipeline.apply(execution_context, file_context, results)
+
+
+def test_transformer_in_memory(tmp_path):
+    file_path, changeset = _apply(tmp_path, [_result(3)])
+
+    assert changeset is not None
+    assert changeset.path == "file.xml"
+    assert [change.lineNumber for change in changeset.changes] == [3]
+    assert '+<element flag="true"></element>\n' in changeset.diff
+    assert file_path.read_text() == (
+        '<?xml version="1.0" encoding="utf-8"?>\n<root>\n<element flag="true"></element>\n</root>'
+    )
+
+
+def test_transformer_skips_files_without_result_lines(tmp_path, mocker):
+    make_parser = mocker.patch("codemodder.codemods.xml_transformer.make_parser")
+
+    # Line 5 does not exist and line 4 only has an end tag
+    assert _apply(tmp_path, [_result(5), _result(4)])[1] is None
+    assert _apply(tmp_path, [])[1] is None
+    make_parser.assert_not_called()
+
+
+def test_transformer_without_result_lines_not_skipped_by_default(tmp_path):
+    file_path, changeset = _apply(tmp_path, [], transformer=AddChildTransformer)
+
+    assert changeset is not None
+    assert "<child></child></root>" in file_path.read_text()
@@ -1,3 +1,5 @@
+import os
+
 import pytest
 
 from codemodder.codetf import ChangeSet
@@ -7,7 +9,10 @@ from codemodder.project_analysis.file_parsers import (
     RequirementsTxtParser,
     SetupCfgParser,
 )
-from codemodder.project_analysis.file_parsers.package_store import PackageStore
+from codemodder.project_analysis.file_parsers.package_store import (
+    FileType,
+    PackageStore,
+)
 
 
 @pytest.fixture(autouse=True, scope="module")
@@ -48,3 +53,69 @@ class TestDependencyManager:
         changeset = dm.write(dependencies)
         assert isinstance(changeset, ChangeSet)
         assert len(changeset.changes)
+
+    @pytest.mark.parametrize(
+        "file_name,contents",
+        [
+            ("requirements.txt", "requests\n"),
+            ("pyproject.toml", '[project]\ndependencies = [\n    "requests",\n]\n'),
+            (
+                "setup.py",
+                'from setuptools import setup\nsetup(\n    install_requires=[\n        "requests",\n    ],\n)\n',
+            ),
+            (
+                "setup.cfg",
+                "[options]\ninstall_requires =\n    requests\n",
+            ),
+        ],
+    )
+    def test_deferred_write(self, tmp_path, file_name, contents):
+        changesets = {}
+        for deferred in (False, True):
+            path = tmp_path / str(deferred) / file_name
+            path.parent.mkdir()
+            path.write_text(contents)
+            store = PackageStore(
+                type=FileType(file_name), file=path, dependencies=set(), py_versions=[]
+            )
+            dm = DependencyManager(store, path.parent, deferred=deferred)
+
+            changesets[deferred] = [dm.write([DefusedXML]), dm.write([Security])]
+            if deferred:
+                assert path.read_text() == contents
+                dm.flush()
+
+        assert changesets[True] == changesets[False]
+        assert all(changesets[True])
+        assert (tmp_path / "True" / file_name).read_text() == (
+            tmp_path / "False" / file_name
+        ).read_text()
+
+    def test_deferred_dry_run(self, tmp_path):
+        path = tmp_path / "requirements.txt"
+        path.write_text("requests\n")
+        store = PackageStore(
+            type=FileType.REQ_TXT, file=path, dependencies=set(), py_versions=[]
+        )
+        dm = DependencyManager(store, tmp_path, deferred=True)
+
+        first = dm.write([DefusedXML], dry_run=True)
+        second = dm.write([Security], dry_run=True)
+        dm.flush()
+
+        assert path.read_text() == "requests\n"
+        assert first and second
+        assert str(DefusedXML.requirement) not in second.diff
+
+    def test_deferred_read_only(self, tmp_path, mocker):
+        path = tmp_path / "requirements.txt"
+        path.write_text("requests\n")
+        access = mocker.patch("os.access", return_value=False)
+        store = PackageStore(
+            type=FileType.REQ_TXT, file=path, dependencies=set(), py_versions=[]
+        )
+
+        assert (
+            DependencyManager(store, tmp_path, deferred=True).write([Security]) is None
+        )
+        access.assert_called_once_with(path, os.W_OK)
@@ -1,4 +1,13 @@
+import chardet
+import pytest
+
 from codemodder.project_analysis.file_parsers import RequirementsTxtParser
+from codemodder.project_analysis.file_parsers.requirements_txt_file_parser import (
+    ENCODING_SAMPLE_SIZE,
+    decode_text,
+)
+
+REQUIREMENTS = "# comment\nrequests==2.31.0\nblack==23.7.*\nmypy~=1.4\npylint>1\n"
 
 
 class TestRequirementsTxtParser:
@@ -57,3 +66,24 @@ class TestRequirementsTxtParser:
         assert store.file == pkg_with_reqs_r_line / parser.file_type.value
         assert store.py_versions == []
         assert len(store.dependencies) == 4
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16", "utf-32"])
+    def test_parse_encoding(self, tmp_path, mocker, encoding):
+        detect = mocker.spy(chardet, "detect")
+        (tmp_path / "requirements.txt").write_bytes(REQUIREMENTS.encode(encoding))
+
+        found = RequirementsTxtParser(tmp_path).parse()
+
+        assert len(found) == 1
+        assert len(found[0].dependencies) == 4
+        detect.assert_not_called()
+
+
+def test_decode_text_detects_sample(mocker):
+    detect = mocker.patch(
+        "chardet.detect", return_value={"encoding": "cp1252", "confidence": 0.95}
+    )
+    data = "caf\xe9==1.0\n".encode("cp1252") * ENCODING_SAMPLE_SIZE
+
+    assert decode_text(data) == "caf\xe9==1.0\n" * ENCODING_SAMPLE_SIZE
+    assert detect.call_args.args[0] == data[:ENCODING_SAMPLE_SIZE]
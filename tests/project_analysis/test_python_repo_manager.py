@@ -1,3 +1,4 @@
+from codemodder.code_directory import list_directory
 from codemodder.project_analysis.python_repo_manager import PythonRepoManager
 
 
@@ -6,3 +7,41 @@ class TestPythonRepoManager:
         rm = PythonRepoManager(pkg_with_reqs_txt)
         stores = rm.package_stores
         assert len(stores) == 1
+
+    def test_package_stores_from_file_listing(self, pkg_with_reqs_txt, mocker):
+        rglob = mocker.spy(type(pkg_with_reqs_txt), "rglob")
+        rm = PythonRepoManager(pkg_with_reqs_txt)
+        files = [pkg_with_reqs_txt / "requirements.txt", pkg_with_reqs_txt / "a.py"]
+
+        stores = rm.parse_project(files)
+
+        assert [store.file for store in stores] == [files[0]]
+        assert rm.package_stores is stores
+        assert rm.dependencies_store is stores[0]
+        rglob.assert_not_called()
+
+    def test_package_stores_order(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "requirements.txt").write_text("requests\n")
+        (tmp_path / "pyproject.toml").write_text(
+            '[project]\nname = "pkg"\ndependencies = ["requests"]\n'
+        )
+
+        stores = PythonRepoManager(tmp_path).package_stores
+
+        assert [store.file for store in stores] == [
+            tmp_path / "pyproject.toml",
+            tmp_path / "sub" / "requirements.txt",
+        ]
+
+    def test_symlinked_dependency_file(self, tmp_path):
+        (tmp_path / "shared").mkdir()
+        (tmp_path / "shared" / "reqs.txt").write_text("requests\n")
+        (tmp_path / "requirements.txt").symlink_to(tmp_path / "shared" / "reqs.txt")
+        listing = list_directory(tmp_path)
+
+        stores = PythonRepoManager(tmp_path).parse_project(listing.all_files)
+
+        # Symbolic links are never analyzed but dependency files are still found through them
+        assert (tmp_path / "requirements.txt") not in listing.files
+        assert [store.file for store in stores] == [tmp_path / "requirements.txt"]
@@ -1,10 +1,17 @@
+import fnmatch
+import os
 from pathlib import Path
 
 import pytest
 
 from codemodder.code_directory import (
+    DEFAULT_EXCLUDED_PATHS,
+    compile_patterns,
     file_line_patterns,
     files_for_directory,
+    filter_files,
+    in_pruned_directory,
+    list_directory,
     match_files,
 )
 
@@ -147,39 +154,142 @@ class TestMatchFiles:
         )
         self._assert_expected(files, expected)
 
-    def test_include_test_overridden_by_default_excludes(self, mocker):
-        mocker.patch(
-            "codemodder.code_directory.Path.rglob",
-            return_value=[
-                Path("foo/tests/test_insecure_random.py"),
-                Path("foo/tests/test_make_request.py"),
-            ],
-        )
-        mocker.patch(
-            "codemodder.code_directory.Path.is_file",
-            return_value=True,
+    def test_include_test_overridden_by_default_excludes(self, tmp_path):
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_insecure_random.py").touch()
+        (tmp_path / "tests" / "test_make_request.py").touch()
+        files = match_files(
+            tmp_path, files_for_directory(tmp_path), include_paths=["tests/**"]
         )
-        path = Path(".")
-        files = match_files(path, files_for_directory(path), include_paths=["tests/**"])
         self._assert_expected(files, [])
 
-    def test_include_test_without_default_includes(self, mocker):
+    def test_include_test_without_default_includes(self, tmp_path):
         files = [
-            Path("foo/tests/test_insecure_random.py"),
-            Path("foo/tests/test_make_request.py"),
+            tmp_path / "foo" / "tests" / "test_insecure_random.py",
+            tmp_path / "foo" / "tests" / "test_make_request.py",
         ]
-        mocker.patch(
-            "codemodder.code_directory.Path.rglob",
-            return_value=files,
-        )
-        mocker.patch(
-            "codemodder.code_directory.Path.is_file",
-            return_value=True,
-        )
-        path = Path(".")
-        result = match_files(path, files_for_directory(path), exclude_paths=[])
-        assert result == [Path(x) for x in files]
+        files[0].parent.mkdir(parents=True)
+        for file in files:
+            file.touch()
+        result = match_files(tmp_path, files_for_directory(tmp_path), exclude_paths=[])
+        assert result == files
 
     def test_extract_line_from_pattern(self):
         lines = file_line_patterns(Path("insecure_random.py"), ["insecure_*.py:3"])
         assert lines == [3]
+
+
+class TestFilesForDirectory:
+    def test_same_as_rglob(self, tmp_path):
+        for name in ("a.py", "pkg/b.py", "pkg/sub/c.txt", "other/d.py", ".hidden/e"):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).touch()
+        (tmp_path / "link.py").symlink_to(tmp_path / "a.py")
+        (tmp_path / "linked_dir").symlink_to(tmp_path / "pkg")
+
+        expected = [
+            path
+            for path in tmp_path.rglob("*")
+            if path.is_file() and not path.is_symlink()
+        ]
+
+        assert files_for_directory(tmp_path) == expected
+
+    def test_list_directory_symlinks(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "shared").mkdir()
+        (tmp_path / "shared" / "requirements.txt").write_text("requests\n")
+        (tmp_path / "pkg" / "code.py").touch()
+        (tmp_path / "pkg" / "requirements.txt").symlink_to(
+            tmp_path / "shared" / "requirements.txt"
+        )
+        (tmp_path / "pkg" / "broken.txt").symlink_to(tmp_path / "missing.txt")
+
+        listing = list_directory(tmp_path)
+
+        assert listing.files == files_for_directory(tmp_path)
+        assert (tmp_path / "pkg" / "requirements.txt") not in listing.files
+        assert listing.all_files == [
+            path for path in tmp_path.rglob("*") if path.is_file()
+        ]
+
+    def test_prune_excluded_directories(self, tmp_path, mocker):
+        for name in ("code.py", ".git/config", "build/lib/code.py", "pkg/tests/a.py"):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).touch()
+        scandir = mocker.spy(os, "scandir")
+
+        files = files_for_directory(tmp_path, DEFAULT_EXCLUDED_PATHS + ["**/tests/**"])
+
+        assert {path.relative_to(tmp_path) for path in files} == {Path("code.py")}
+        assert [call.args[0] for call in scandir.call_args_list] == [
+            tmp_path,
+            tmp_path / "pkg",
+        ]
+
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("code.py", False),
+            ("build/lib/code.py", True),
+            ("pkg/tests/a.py", True),
+            ("pkg/test_a.py", False),
+            ("tests", False),
+        ],
+    )
+    def test_in_pruned_directory(self, path, expected):
+        exclude_paths = DEFAULT_EXCLUDED_PATHS + ["**/tests/**"]
+        assert in_pruned_directory(Path(path), exclude_paths) is expected
+
+    @pytest.mark.parametrize(
+        "exclude_paths", [None, [], ["tests/**", "*request.py"], ["samples/*"]]
+    )
+    def test_match_files_unchanged_by_pruning(self, dir_structure, exclude_paths):
+        excluded = (
+            exclude_paths if exclude_paths is not None else DEFAULT_EXCLUDED_PATHS
+        )
+
+        assert match_files(
+            dir_structure,
+            files_for_directory(dir_structure, excluded),
+            exclude_paths,
+        ) == match_files(
+            dir_structure, files_for_directory(dir_structure), exclude_paths
+        )
+
+
+class TestCompiledPatterns:
+    @pytest.mark.parametrize(
+        "patterns",
+        [
+            DEFAULT_EXCLUDED_PATHS,
+            ["**.py", "**/*.py"],
+            ["*a*b*", "[!t]*/more_?amples/*", "samples/make_request.py"],
+        ],
+    )
+    def test_same_as_fnmatch(self, dir_structure, patterns):
+        names = [
+            str(path.relative_to(dir_structure))
+            for path in files_for_directory(dir_structure)
+        ] + ["tests/conftest.py", ".coverage.xml", "lib/site-packages/a.py"]
+
+        expected = {
+            name
+            for pattern in patterns
+            for name in names
+            if fnmatch.fnmatch(name, pattern)
+        }
+
+        assert set(filter_files([Path(name) for name in names], patterns)) == expected
+
+    def test_cached_per_pattern_set(self):
+        patterns = ("tests/**", "*.py")
+
+        assert compile_patterns(patterns) is compile_patterns(tuple(list(patterns)))
+        assert compile_patterns(()) is None
+
+    def test_line_patterns_indexed(self):
+        patterns = ["*.py:3", "tests/**", "insecure_*.py:5", "other.py:1"]
+
+        assert file_line_patterns(Path("insecure_random.py"), patterns) == [3, 5]
+        assert file_line_patterns(Path("insecure_random.py"), ["tests/**"]) == []
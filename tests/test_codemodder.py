@@ -1,4 +1,6 @@
 import logging
+import os
+from pathlib import Path
 
 import libcst as cst
 import mock
@@ -6,8 +8,13 @@ import pytest
 
 from codemodder import run
 from codemodder.codemodder import _run_cli, find_semgrep_results
+from codemodder.codemods.base_codemod import BaseCodemod
+from codemodder.codemods.libcst_transformer import update_code
+from codemodder.codetf import CodeTF
+from codemodder.codetf import common as codetf_common
 from codemodder.diff import create_diff_from_tree
 from codemodder.llm import TokenUsage
+from codemodder.project_analysis.python_repo_manager import PythonRepoManager
 from codemodder.registry import load_registered_codemods
 from codemodder.result import ResultSet
 from codemodder.semgrep import run as semgrep_run
@@ -29,6 +36,11 @@ def disable_codemod_apply(mocker, request):
         "test_cst_parsing_fails",
         "test_dry_run",
         "test_run_codemod_name_or_id",
+        "test_file_major_schedule",
+        "test_file_major_rescans_once_per_change",
+        "test_incremental_cache",
+        "test_incremental_cache_same_contents",
+        "test_report_results_written_as_codemods_finish",
     ):
         return
     mocker.patch(
@@ -94,8 +106,7 @@ class TestRunCli:
         assert res == 0
 
     @mock.patch("libcst.parse_module", side_effect=Exception)
-    @mock.patch("codemodder.codetf.CodeTF.build")
-    def test_cst_parsing_fails(self, build_report, mock_parse, dir_structure):
+    def test_cst_parsing_fails(self, mock_parse, dir_structure):
         code_dir, codetf = dir_structure
         args = [
             str(code_dir),
@@ -112,10 +123,7 @@ class TestRunCli:
         assert res == 0
         mock_parse.assert_called()
 
-        build_report.assert_called_once()
-        args_to_reporting = build_report.call_args_list[0][0]
-        assert len(args_to_reporting) == 4
-        _, _, _, results_by_codemod = args_to_reporting
+        results_by_codemod = CodeTF.model_validate_json(codetf.read_text()).results
         assert results_by_codemod != []
 
         requests_report = results_by_codemod[0]
@@ -125,8 +133,6 @@ class TestRunCli:
             str(code_dir / "test_request.py"),
         ]
 
-        build_report.return_value.write_report.assert_called_once()
-
     def test_dry_run(self, mocker, dir_structure):
         mock_update_code = mocker.patch(
             "codemodder.codemods.libcst_transformer.update_code"
@@ -135,6 +141,7 @@ class TestRunCli:
             "codemodder.codemods.libcst_transformer.LibcstTransformerPipeline.apply",
             new_callable=mock.PropertyMock,
         )
+        mocker.patch("codemodder.context.CodemodExecutionContext.spool_result")
         mocker.patch("codemodder.context.CodemodExecutionContext.compile_results")
 
         code_dir, codetf = dir_structure
@@ -156,8 +163,7 @@ class TestRunCli:
         mock_update_code.assert_not_called()
 
     @pytest.mark.parametrize("dry_run", [True, False])
-    @mock.patch("codemodder.codetf.CodeTF.build")
-    def test_reporting(self, mock_reporting, dry_run, dir_structure):
+    def test_reporting(self, dry_run, dir_structure):
         code_dir, codetf = dir_structure
         args = [
             str(code_dir),
@@ -172,14 +178,187 @@ class TestRunCli:
         res = _run_cli(args)
         assert res == 0
 
-        mock_reporting.assert_called_once()
-        args_to_reporting = mock_reporting.call_args_list[0][0]
-        assert len(args_to_reporting) == 4
-        _, _, _, results_by_codemod = args_to_reporting
+        results_by_codemod = CodeTF.model_validate_json(codetf.read_text()).results
 
         assert len(results_by_codemod) == 3
 
-        mock_reporting.return_value.write_report.assert_called_once()
+    @pytest.mark.parametrize("max_workers, executor", [(1, "thread"), (2, "process")])
+    def test_file_major_schedule(self, mocker, tmp_path, max_workers, executor):
+        mocker.patch("codemodder.codemods.semgrep.semgrep_run", semgrep_run)
+        mocker.patch("codemodder.codemods.libcst_transformer.update_code", update_code)
+        files = {
+            "make_request.py": "import random\nimport requests\n\nrequests.get(random.random())\n",
+            "mutable.py": "import random\n\ndef func(foo=[]):\n    return random.random()\n",
+            # Fixing the defaults moves the call that secure-random has to fix
+            "one_line.py": "import random\ndef f(foo=[], bar={}): return random.random()\n",
+        }
+        codemods = [
+            "pixee:python/add-requests-timeouts",
+            "pixee:python/fix-mutable-params",
+            "pixee:python/secure-random",
+        ]
+
+        outputs = {}
+        for schedule in ("codemod-major", "file-major"):
+            code_dir = tmp_path / schedule
+            code_dir.mkdir()
+            for name, contents in files.items():
+                (code_dir / name).write_text(contents)
+
+            codetf, status, _ = run(
+                code_dir,
+                dry_run=False,
+                codemod_include=codemods,
+                schedule=schedule,
+                max_workers=max_workers,
+                executor=executor,
+            )
+            assert status == 0
+            assert codetf is not None
+            # Semgrep finding IDs are random so only compare the changes themselves
+            outputs[schedule] = (
+                [
+                    (
+                        result.codemod,
+                        result.failedFiles,
+                        [
+                            (
+                                changeset.path,
+                                changeset.diff,
+                                [change.lineNumber for change in changeset.changes],
+                            )
+                            for changeset in result.changeset
+                        ],
+                    )
+                    for result in codetf.results
+                ],
+                {name: (code_dir / name).read_text() for name in files},
+            )
+
+        results, contents = outputs["file-major"]
+        assert len([changes for _, _, changes in results if changes]) == 3
+        assert "secrets.SystemRandom().random()" in contents["one_line.py"]
+        assert outputs["file-major"] == outputs["codemod-major"]
+
+    def test_file_major_rescans_once_per_change(self, mocker, tmp_path):
+        rescan = mocker.patch(
+            "codemodder.codemods.semgrep.semgrep_run", side_effect=semgrep_run
+        )
+        mocker.patch("codemodder.codemods.libcst_transformer.update_code", update_code)
+        (tmp_path / "make_request.py").write_text(
+            "import requests\n\nrequests.get('https://example.com')\n"
+        )
+        (tmp_path / "one_line.py").write_text(
+            "import random\ndef f(foo=[]): return random.random()\n"
+        )
+
+        _, status, _ = run(
+            tmp_path,
+            dry_run=False,
+            codemod_include=[
+                "pixee:python/fix-mutable-params",
+                "pixee:python/add-requests-timeouts",
+                "pixee:python/secure-random",
+            ],
+            schedule="file-major",
+        )
+
+        assert status == 0
+        # Each changed file is scanned once for the rest of its chain, so both semgrep
+        # codemods after fix-mutable-params share a single scan of one_line.py
+        assert sorted(call.args[2] for call in rescan.call_args_list) == [
+            [tmp_path / "make_request.py"],
+            [tmp_path / "one_line.py"],
+        ]
+        assert (
+            "secrets.SystemRandom().random()" in (tmp_path / "one_line.py").read_text()
+        )
+
+    def test_incremental_cache_same_contents(self, tmp_path):
+        code_dir = tmp_path / "code"
+        (code_dir / "pkg").mkdir(parents=True)
+        # unused-imports leaves __init__.py alone but not another file with the same contents
+        (code_dir / "pkg" / "__init__.py").write_text("import os\n")
+        (code_dir / "pkg" / "mod.py").write_text("import os\n")
+        codemods = ["pixee:python/unused-imports"]
+
+        for _ in range(2):
+            codetf, status, _ = run(
+                code_dir,
+                dry_run=True,
+                codemod_include=codemods,
+                cache_dir=tmp_path / "cache",
+            )
+            assert status == 0
+            assert codetf is not None
+            assert [c.path for c in codetf.results[0].changeset] == ["pkg/mod.py"]
+
+    def test_report_results_written_as_codemods_finish(self, mocker, tmp_path):
+        code_dir = tmp_path / "code"
+        code_dir.mkdir()
+        (code_dir / "mod.py").write_text("import os\nimport random\nrandom.random()\n")
+        output = tmp_path / "results.codetf"
+        codemods = ["pixee:python/unused-imports", "pixee:python/secure-random"]
+
+        spooled = []
+        apply = BaseCodemod.apply
+
+        def spy(codemod, context, remediation=False):
+            spooled.append(list(context.result_spool.keys))
+            return apply(codemod, context, remediation)
+
+        mocker.patch.object(BaseCodemod, "apply", spy)
+        adapter = mocker.spy(codetf_common, "_item_adapter")
+
+        codetf, status, _ = run(
+            code_dir, dry_run=True, output=output, codemod_include=codemods
+        )
+
+        assert status == 0
+        assert codetf is not None
+        # Each result is spooled as soon as its codemod finishes
+        assert spooled == [[], [codemods[0]]]
+        # The results are only kept in the report
+        assert codetf.results == []
+        adapter.assert_not_called()
+        report = CodeTF.model_validate_json(output.read_text(encoding="utf-8"))
+        assert report.run == codetf.run
+        assert [result.codemod for result in report.results] == codemods
+        assert all(result.changeset for result in report.results)
+
+    def test_incremental_cache(self, tmp_path, caplog):
+        code_dir = tmp_path / "code"
+        code_dir.mkdir()
+        (code_dir / "mutable.py").write_text("def func(foo=[]):\n    return foo\n")
+        (code_dir / "clean.py").write_text("def func(foo=None):\n    return foo\n")
+        cache_dir = tmp_path / "cache"
+        codemods = ["pixee:python/fix-mutable-params"]
+
+        first, status, _ = run(
+            code_dir, dry_run=True, codemod_include=codemods, cache_dir=cache_dir
+        )
+        assert status == 0
+
+        caplog.set_level(logging.INFO)
+        second, status, _ = run(
+            code_dir, dry_run=True, codemod_include=codemods, cache_dir=cache_dir
+        )
+        assert status == 0
+        assert "incremental cache: 1 hits, 1 misses" in caplog.text
+
+        assert first is not None and second is not None
+        assert [c.path for c in second.results[0].changeset] == ["mutable.py"]
+        assert second.results[0].changeset == first.results[0].changeset
+
+        caplog.clear()
+        run(
+            code_dir,
+            dry_run=True,
+            codemod_include=codemods,
+            cache_dir=cache_dir,
+            path_exclude=["other.py"],
+        )
+        assert "incremental cache: 0 hits, 2 misses" in caplog.text
 
 
 class TestCliCodemodIncludeExclude:
@@ -310,6 +489,19 @@ class TestCliExitCode:
         exit_code = _run_cli(args)
         assert exit_code == 1
 
+    @mock.patch("codemodder.codetf.CodeTF.write_report")
+    def test_file_major_remediation(self, mock_report, tmp_path):
+        del mock_report
+        args = [
+            str(tmp_path),
+            "--output",
+            "here.txt",
+            "--schedule",
+            "file-major",
+        ]
+
+        assert _run_cli(args, remediation=True) == 1
+
     @mock.patch("codemodder.codetf.CodeTF.write_report")
     def test_conflicting_include_exclude(self, mock_report):
         del mock_report
@@ -421,3 +613,50 @@ class TestRun:
         assert codetf_output.run.directory == str(code_dir)
         mock_parse.assert_not_called()
         assert codetf.exists()
+
+    @pytest.mark.parametrize(
+        "path_exclude, walked, dependency_files",
+        [
+            # The default excluded paths are only pruned when there are no others
+            (None, {".", "vendor"}, ["requirements.txt", "vendor/requirements.txt"]),
+            (
+                ["vendor/**"],
+                {".", ".git", ".git/objects", "venv", "venv/lib"},
+                ["requirements.txt", "venv/requirements.txt"],
+            ),
+        ],
+    )
+    def test_run_prunes_excluded_directories(
+        self, mocker, tmp_path, path_exclude, walked, dependency_files
+    ):
+        for name in (
+            "code.py",
+            "requirements.txt",
+            ".git/objects/pack",
+            "venv/lib/module.py",
+            "venv/requirements.txt",
+            "vendor/lib.py",
+            "vendor/requirements.txt",
+        ):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text("requests\n")
+        scandir = mocker.spy(os, "scandir")
+        parse_project = mocker.spy(PythonRepoManager, "parse_project")
+
+        _, status, _ = run(
+            tmp_path,
+            dry_run=True,
+            path_exclude=path_exclude,
+            codemod_include=["pixee:python/url-sandbox"],
+        )
+
+        assert status == 0
+        assert {
+            Path(call.args[0]).relative_to(tmp_path)
+            for call in scandir.call_args_list
+            if call.args and Path(call.args[0]).is_relative_to(tmp_path)
+        } == {Path(name) for name in walked}
+        # Dependency files are found in the same listing
+        assert sorted(store.file for store in parse_project.spy_return) == [
+            tmp_path / name for name in dependency_files
+        ]
@@ -16,6 +16,7 @@ from codemodder.codetf import (
     Result,
     Rule,
 )
+from codemodder.codetf.common import ResultSpool
 from codemodder.codetf.v2.codetf import (
     Action,
     DetectionTool,
@@ -157,6 +158,91 @@ def test_write_codetf_with_results(tmpdir, mocker, codetf_schema):
     jsonschema.validate(json.loads(data), codetf_schema)
 
 
+@pytest.mark.parametrize("count", [0, 1, 3])
+def test_write_codetf_streams_results(tmpdir, mocker, count):
+    path = tmpdir / "test.codetf.json"
+
+    context = mocker.MagicMock(directory=Path("/foo/bar/whatever"))
+    results = [
+        Result(
+            codemod=f"test-{i}",
+            summary="test",
+            description="Ünïcode description",
+            changeset=[
+                ChangeSet(
+                    path="test",
+                    diff="--- a/test\n+++ b/test\n@@ -1,1 +1,1 @@\n-1\n+2\n",
+                    changes=[Change(lineNumber=1, description=None)],
+                ),
+            ],
+        )
+        for i in range(count)
+    ]
+    codetf = CodeTF.build(context, 42, [], results)
+    spy = mocker.spy(CodeTF, "model_dump_json")
+
+    assert codetf.write_report(path) == 0
+
+    expected = codetf.model_dump_json(exclude_none=True)
+    assert path.read_text(encoding="utf-8") == expected
+    # Only the run is serialized as part of the report itself
+    assert spy.call_args_list[0].kwargs["exclude"] == {"results"}
+    assert from_v2(codetf).model_dump_json(exclude_none=True) == "".join(
+        from_v2(codetf).iter_json()
+    )
+
+
+@pytest.mark.parametrize("count, spooled", [(0, 0), (1, 1), (3, 3), (3, 2), (3, 0)])
+def test_write_codetf_spooled_results(tmpdir, mocker, count, spooled):
+    path = tmpdir / "test.codetf.json"
+
+    context = mocker.MagicMock(directory=Path("/foo/bar/whatever"))
+    # The spool is copied in many chunks, which end in the middle of results
+    mocker.patch.object(ResultSpool, "CHUNK_SIZE", 7)
+    results = [
+        Result(
+            codemod=f"test-{i}",
+            summary="test",
+            description="Ünïcode description",
+            changeset=[
+                ChangeSet(
+                    path="test",
+                    diff="--- a/test\n+++ b/test\n@@ -1,1 +1,1 @@\n-1\n+2\n",
+                    changes=[Change(lineNumber=1, description=None)],
+                ),
+            ],
+        )
+        for i in range(count)
+    ]
+
+    with ResultSpool(tmpdir) as spool:
+        # Results are spooled as each codemod finishes, and only the rest are kept with the report
+        for result in results[:spooled]:
+            spool.add(result.codemod, result)
+        codetf = CodeTF.build(context, 42, [], results[spooled:])
+        spy = mocker.spy(Result, "model_dump_json")
+
+        assert codetf.write_report(path, spool) == 0
+
+    assert spy.call_count == 0
+    expected = CodeTF.build(context, 42, [], results)
+    assert path.read_text(encoding="utf-8") == expected.model_dump_json(
+        exclude_none=True
+    )
+
+
+def test_result_spooled_once(tmpdir):
+    result = Result(codemod="test", summary="test", description="test", changeset=[])
+
+    with ResultSpool(tmpdir) as spool:
+        spool.add(result.codemod, result)
+        with pytest.raises(ValueError):
+            spool.add(result.codemod, result)
+
+        assert "test" in spool
+        assert len(spool) == 1
+
+
 def test_reference_use_url_for_description():
     ref = Reference(url="https://example.com")
     assert ref.description == "https://example.com"
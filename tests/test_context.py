@@ -216,3 +216,28 @@ class TestContext:
                 rule=rule,
             )
         ]
+
+    @pytest.mark.parametrize(
+        "path_exclude, excluded",
+        [([], "tests/test_code.py"), (["vendor/**"], "vendor/lib.py")],
+    )
+    def test_is_project_file(self, tmp_path, path_exclude, excluded):
+        for name in ("code.py", "tests/test_code.py", "vendor/lib.py"):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).touch()
+        (tmp_path / "link.py").symlink_to(tmp_path / "code.py")
+        context = Context(
+            tmp_path,
+            dry_run=True,
+            registry=load_registered_codemods(),
+            repo_manager=PythonRepoManager(tmp_path),
+            path_exclude=path_exclude,
+        )
+
+        # Files in excluded directories are not listed but still belong to the project
+        assert tmp_path / excluded not in context.files_to_analyze
+        assert context.is_project_file(tmp_path / "code.py")
+        assert context.is_project_file(tmp_path / "tests" / "test_code.py")
+        assert context.is_project_file(tmp_path / "vendor" / "lib.py")
+        assert not context.is_project_file(tmp_path / "link.py")
+        assert not context.is_project_file(tmp_path / "tests" / "missing.py")
@@ -9,3 +9,17 @@ def test_file_context(mocker):
     assert file_context.file_path is path
     assert file_context.line_exclude == []
     assert file_context.line_include == []
+
+
+def test_file_context_compact(mocker):
+    file_context = FileContext(mocker.MagicMock(), mocker.MagicMock())
+    file_context.changesets.append(mocker.MagicMock())
+    file_context.failures.append(mocker.MagicMock())
+
+    processed = file_context.compact()
+
+    assert processed.changesets == file_context.changesets
+    assert processed.failures == file_context.failures
+    assert processed.dependencies == file_context.dependencies
+    assert processed.unfixed_findings == file_context.unfixed_findings
+    assert processed.timer is file_context.timer
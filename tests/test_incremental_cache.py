@@ -0,0 +1,144 @@
+import json
+
+from codemodder.file_context import FileContext
+from codemodder.incremental_cache import (
+    CACHE_FILE_NAME,
+    IncrementalCache,
+    run_fingerprint,
+)
+
+
+class TestIncrementalCache:
+    def test_record_and_skip(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = IncrementalCache.load(tmp_path / "cache", "fingerprint")
+
+        skip, digest = cache.check("codemod", code)
+        assert not skip
+        assert digest is not None
+        cache.record("codemod", code, digest, FileContext(tmp_path, code))
+        cache.save()
+
+        cache = IncrementalCache.load(tmp_path / "cache", "fingerprint")
+        assert cache.check("codemod", code) == (True, digest)
+        assert cache.check("other-codemod", code) == (False, digest)
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_changed_contents(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = IncrementalCache.load(tmp_path, "fingerprint")
+        _, digest = cache.check("codemod", code)
+        cache.record("codemod", code, digest, FileContext(tmp_path, code))
+        cache.save()
+
+        code.write_text("x = 2\n")
+
+        cache = IncrementalCache.load(tmp_path, "fingerprint")
+        assert not cache.check("codemod", code)[0]
+
+    def test_not_recorded_with_changes(self, mocker, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = IncrementalCache.load(tmp_path, "fingerprint")
+        _, digest = cache.check("codemod", code)
+
+        file_context = FileContext(tmp_path, code)
+        file_context.changesets.append(mocker.MagicMock())
+        cache.record("codemod", code, digest, file_context)
+        cache.save()
+
+        cache = IncrementalCache.load(tmp_path, "fingerprint")
+        assert not cache.check("codemod", code)[0]
+
+    def test_stale_fingerprint(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = IncrementalCache.load(tmp_path, "fingerprint")
+        _, digest = cache.check("codemod", code)
+        cache.record("codemod", code, digest, FileContext(tmp_path, code))
+        cache.save()
+
+        cache = IncrementalCache.load(tmp_path, "other-fingerprint")
+
+        assert not cache.check("codemod", code)[0]
+
+    def test_unreadable_cache(self, tmp_path):
+        (tmp_path / CACHE_FILE_NAME).write_text("not json")
+        cache = IncrementalCache.load(tmp_path, "fingerprint")
+        cache.save()
+
+        assert json.loads((tmp_path / CACHE_FILE_NAME).read_text()) == {
+            "fingerprint": "fingerprint",
+            "unchanged": {},
+        }
+
+    def test_unused_entries_not_saved(self, tmp_path):
+        first = tmp_path / "first.py"
+        first.write_text("x = 1\n")
+        second = tmp_path / "second.py"
+        second.write_text("y = 1\n")
+        cache = IncrementalCache.load(tmp_path, "fingerprint")
+        for path in (first, second):
+            _, digest = cache.check("codemod", path)
+            cache.record("codemod", path, digest, FileContext(tmp_path, path))
+        cache.save()
+
+        cache = IncrementalCache.load(tmp_path, "fingerprint")
+        cache.check("codemod", first)
+        cache.save()
+
+        cache = IncrementalCache.load(tmp_path, "fingerprint")
+        assert cache.check("codemod", first)[0]
+        assert not cache.check("codemod", second)[0]
+
+    def test_keyed_by_path(self, tmp_path):
+        code_dir = tmp_path / "code"
+        code_dir.mkdir()
+        first = code_dir / "first.py"
+        second = code_dir / "second.py"
+        first.write_text("import os\n")
+        second.write_text("import os\n")
+        cache = IncrementalCache.load(tmp_path / "cache", "fingerprint", code_dir)
+
+        _, digest = cache.check("codemod", first)
+        cache.record("codemod", first, digest, FileContext(code_dir, first))
+        # Entries recorded during this run are not used until the next one
+        assert not cache.check("codemod", first)[0]
+        assert not cache.check("codemod", second)[0]
+        cache.save()
+
+        data = json.loads((tmp_path / "cache" / CACHE_FILE_NAME).read_text())
+        assert data["unchanged"] == {"codemod": {"first.py": digest}}
+
+        cache = IncrementalCache.load(tmp_path / "cache", "fingerprint", code_dir)
+        assert cache.check("codemod", first) == (True, digest)
+        assert cache.check("codemod", second) == (False, digest)
+
+
+def test_run_fingerprint(tmp_path):
+    sarif = tmp_path / "results.sarif"
+    sarif.write_text("{}")
+
+    def fingerprint(**kwargs):
+        args = {
+            "codemodder_version": "1.0",
+            "codemod_ids": ["codemod"],
+            "path_include": [],
+            "path_exclude": [],
+            "tool_result_files": [sarif],
+        }
+        args.update(kwargs)
+        return run_fingerprint(**args)
+
+    original = fingerprint()
+    assert fingerprint() == original
+    assert fingerprint(codemodder_version="1.1") != original
+    assert fingerprint(codemod_ids=["codemod", "other"]) != original
+    assert fingerprint(path_include=["*.py"]) != original
+    assert fingerprint(path_exclude=["tests"]) != original
+
+    sarif.write_text('{"runs": []}')
+    assert fingerprint() != original
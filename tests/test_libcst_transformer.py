@@ -1,7 +1,9 @@
 from pathlib import Path
 
+import libcst as cst
 import mock
 from libcst._exceptions import ParserSyntaxError
+from libcst.metadata import BatchableMetadataProvider
 
 from codemodder.codemods.libcst_transformer import (
     LibcstResultTransformer,
@@ -157,3 +159,58 @@ def test_transformer_error_with_sonar(mocker, caplog):
         file_context.unfixed_findings[0].rule.url
         == "https://rules.sonarsource.com/python/RSPEC-1716/"
     )
+
+
+class CountingProvider(BatchableMetadataProvider[bool]):
+    resolved = 0
+
+    def visit_Module(self, node: cst.Module) -> None:
+        CountingProvider.resolved += 1
+        self.set_metadata(node, True)
+
+
+class UsesMetadata(LibcstResultTransformer):
+    METADATA_DEPENDENCIES = (CountingProvider,)
+
+    def visit_Module(self, node: cst.Module) -> None:
+        assert self.get_metadata(CountingProvider, node)
+
+
+class RenamesX(UsesMetadata):
+    change_description = "Rename x to y"
+
+    def leave_Name(self, original_node: cst.Name, updated_node: cst.Name):
+        if updated_node.value == "x":
+            self.report_change(original_node)
+            return updated_node.with_changes(value="y")
+        return updated_node
+
+
+def test_metadata_shared_until_tree_changes(mocker, tmp_path):
+    code = tmp_path / "code.py"
+    code.write_text("x = 1\n")
+    execution_context = CodemodExecutionContext(
+        directory=tmp_path,
+        dry_run=True,
+        verbose=False,
+        registry=mocker.MagicMock(),
+        providers=None,
+        repo_manager=mocker.MagicMock(),
+    )
+    mocker.patch.object(CountingProvider, "resolved", 0)
+
+    file_context = FileContext(tmp_path, code)
+    change_set = LibcstTransformerPipeline(
+        UsesMetadata, UsesMetadata, RenamesX, UsesMetadata
+    ).apply(execution_context, file_context, None)
+
+    assert change_set is not None
+    assert "+y = 1" in change_set.diff
+    # Once for the parsed tree and once more after it was renamed
+    assert CountingProvider.resolved == 2
+
+    # Another codemod on the same file reuses the metadata of the parsed tree
+    LibcstTransformerPipeline(UsesMetadata).apply(
+        execution_context, FileContext(tmp_path, code), None
+    )
+    assert CountingProvider.resolved == 2
@@ -0,0 +1,136 @@
+import os
+
+import libcst as cst
+import pytest
+
+from codemodder.module_cache import MODULE_MEMORY_FACTOR, ModuleCache
+
+
+class TestModuleCache:
+    def test_parse_once(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = ModuleCache()
+
+        first = cache.get(code)
+        second = cache.get(code)
+
+        assert first is second
+        assert first.module.code == "x = 1\n"
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_changed_on_disk(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = ModuleCache()
+
+        cache.get(code)
+        code.write_text("x = 2\n")
+
+        assert cache.get(code).module.code == "x = 2\n"
+        assert cache.misses == 2
+        assert len(cache) == 1
+
+    def test_unchanged_not_read(self, tmp_path, mocker):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = ModuleCache()
+        first = cache.get(code)
+
+        read_bytes = mocker.spy(type(code), "read_bytes")
+
+        assert cache.get(code) is first
+        read_bytes.assert_not_called()
+
+    def test_touched(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = ModuleCache()
+        first = cache.get(code)
+
+        stat = code.stat()
+        os.utime(code, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.get(code) is first
+        assert first.mtime_ns == code.stat().st_mtime_ns
+        assert cache.hits == 1
+
+    def test_update(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = ModuleCache()
+        cache.get(code)
+
+        new_tree = cst.parse_module("x = 2\n")
+        code.write_text(new_tree.code)
+        cache.update(code, new_tree)
+
+        assert cache.get(code).module is new_tree
+        assert cache.hits == 1
+
+    def test_update_not_written(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        cache = ModuleCache()
+
+        cache.update(code, cst.parse_module("x = 2\n"))
+
+        assert cache.get(code).module.code == "x = 1\n"
+
+    def test_lru_eviction(self, tmp_path):
+        first = tmp_path / "first.py"
+        first.write_text("a = 1\n")
+        second = tmp_path / "second.py"
+        second.write_text("b = 1\n")
+        third = tmp_path / "third.py"
+        third.write_text("c = 1\n")
+        cache = ModuleCache(max_bytes=12 * MODULE_MEMORY_FACTOR)
+
+        cache.get(first)
+        cache.get(second)
+        # Touch the first file so the second becomes least recently used
+        cache.get(first)
+        cache.get(third)
+
+        assert first in cache
+        assert second not in cache
+        assert third in cache
+        assert cache.total_bytes == 12 * MODULE_MEMORY_FACTOR
+
+    def test_too_large(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        # The source fits but the estimated size of the module and its metadata does not
+        cache = ModuleCache(max_bytes=len("x = 1\n"))
+
+        assert cache.get(code).module.code == "x = 1\n"
+        assert not len(cache)
+
+    def test_parse_error_not_cached(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = \n")
+        cache = ModuleCache()
+
+        with pytest.raises(cst.ParserSyntaxError):
+            cache.get(code)
+
+        assert not len(cache)
+
+    def test_wrapper_shares_module(self, tmp_path):
+        code = tmp_path / "code.py"
+        code.write_text("x = 1\n")
+        entry = ModuleCache().get(code)
+
+        assert entry.wrapper.module is entry.module
+        assert entry.wrapper is entry.wrapper
+
+    def test_updated_wrapper_copies_module(self, tmp_path):
+        code = tmp_path / "code.py"
+        new_tree = cst.parse_module("x = 2\n")
+        code.write_text(new_tree.code)
+
+        entry = ModuleCache().update(code, new_tree)
+
+        assert entry.wrapper.module is not new_tree
+        assert entry.wrapper.module.deep_equals(new_tree)
@@ -2,8 +2,9 @@ from textwrap import dedent
 
 import libcst as cst
 from libcst.codemod import Codemod, CodemodContext
+from libcst.metadata.scope_provider import GlobalScope
 
-from codemodder.codemods.utils_mixin import NameResolutionMixin
+from codemodder.codemods.utils_mixin import NameResolutionMixin, ScopeIndex
 
 
 class TestNameResolutionMixin:
@@ -185,3 +186,33 @@ class TestNameResolutionMixin:
         )
         tree = cst.parse_module(input_code)
         TestCodemod(CodemodContext()).transform_module(tree)
+
+    def test_scope_index_built_once(self, mocker):
+        build = mocker.spy(ScopeIndex, "__init__")
+
+        class TestCodemod(Codemod, NameResolutionMixin):
+            def transform_module_impl(self, tree: cst.Module) -> cst.Module:
+                func = cst.ensure_type(tree.body[-1], cst.FunctionDef)
+                stmt = func.body.body[0]
+
+                assert self.generate_available_name(stmt, ["a", "c"]) == "c"
+                assert self.generate_available_name(stmt, ["a", "b"]) == "a_1"
+                assert self.find_used_names_within_nodes_scope(stmt) == {"a", "b", "f"}
+                assert sorted(self.find_used_names_in_module()) == ["a", "b", "f"]
+                assert isinstance(self.find_global_scope(), GlobalScope)
+                return tree
+
+        input_code = dedent(
+            """\
+        import a
+        def f():
+            b = 1
+        """
+        )
+        codemod = TestCodemod(CodemodContext())
+        codemod.transform_module(cst.parse_module(input_code))
+        assert build.call_count == 1
+
+        # A new module gets a new index
+        codemod.transform_module(cst.parse_module(input_code))
+        assert build.call_count == 2
@@ -0,0 +1,96 @@
+import logging
+
+import mock
+
+from codemodder.providers import BaseProvider, ProviderRegistry, load_providers
+
+
+class ResourceProvider(BaseProvider):
+    def load(self):
+        return object()
+
+
+class MissingResourceProvider(BaseProvider):
+    def load(self):
+        return None
+
+
+def test_provider_loaded_on_first_use(caplog):
+    caplog.set_level(logging.DEBUG, logger="codemodder")
+    factory = mock.MagicMock(side_effect=ResourceProvider)
+    registry = ProviderRegistry()
+    registry.add_factory("resource", factory)
+
+    assert "resource" in registry
+    factory.assert_not_called()
+
+    provider = registry.get_provider("resource")
+    assert isinstance(provider, ResourceProvider)
+    assert provider.is_available
+    assert registry.get_provider("resource") is provider
+    assert registry["resource"] is provider
+    factory.assert_called_once_with("resource")
+    assert 'loaded provider "resource" in' in caplog.text
+
+
+def test_unavailable_provider():
+    registry = ProviderRegistry()
+    registry.add_factory("missing", MissingResourceProvider)
+
+    provider = registry.get_provider("missing")
+    assert provider is not None
+    assert not provider.is_available
+    assert registry.get_provider("other") is None
+
+
+def test_failed_provider(caplog):
+    factory = mock.MagicMock(side_effect=RuntimeError("boom"))
+    registry = ProviderRegistry()
+    registry.add_factory("broken", factory)
+
+    assert registry.get_provider("broken") is None
+    assert registry.get_provider("broken") is None
+    factory.assert_called_once()
+    assert 'Failed to load provider "broken"' in caplog.text
+
+
+def test_add_provider():
+    provider = ResourceProvider("resource")
+    registry = ProviderRegistry()
+    registry.add_provider("resource", provider)
+
+    assert registry.get_provider("resource") is provider
+
+
+def test_factories_listed():
+    provider = ResourceProvider("resource")
+    factory = mock.MagicMock(side_effect=ResourceProvider)
+    registry = ProviderRegistry()
+    registry.add_provider("resource", provider)
+    registry.add_factory("lazy", factory)
+
+    assert list(registry) == ["resource", "lazy"]
+    assert list(registry.keys()) == ["resource", "lazy"]
+    assert len(registry) == 2
+    factory.assert_not_called()
+
+    items = dict(registry.items())
+    assert items["resource"] is provider
+    assert isinstance(items["lazy"], ResourceProvider)
+    assert len(registry) == 2
+
+
+def test_load_providers_does_not_load_entry_points(mocker):
+    entry_point = mocker.MagicMock()
+    entry_point.name = "resource"
+    entry_point.load.return_value = ResourceProvider
+    mocker.patch(
+        "codemodder.providers.entry_points"
+    ).return_value.select.return_value = [entry_point]
+
+    registry = load_providers()
+
+    assert "resource" in registry
+    entry_point.load.assert_not_called()
+    assert isinstance(registry.get_provider("resource"), ResourceProvider)
+    entry_point.load.assert_called_once()
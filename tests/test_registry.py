@@ -1,8 +1,14 @@
+import pytest
+
 from codemodder.registry import (
     CodemodCollection,
+    CodemodEntry,
     CodemodRegistry,
     load_registered_codemods,
 )
+from core_codemods import defectdojo_registry
+from core_codemods import registry as core_registry
+from core_codemods import semgrep_registry, sonar_registry
 
 
 def test_default_extensions(mocker):
@@ -26,7 +32,7 @@ def test_default_extensions(mocker):
 
 def test_codemods_by_tool(mocker):
     registry = CodemodRegistry()
-    assert not registry._codemods_by_tool
+    assert not registry._ids_by_tool
 
     CodemodA = mocker.MagicMock()
     CodemodB = mocker.MagicMock()
@@ -43,3 +49,69 @@ def test_current_codemods_by_tool():
     assert len(codemod_registry.codemods_by_tool("sonar")) > 0
     assert len(codemod_registry.codemods_by_tool("semgrep")) > 0
     assert len(codemod_registry.codemods_by_tool("pixee")) > 0
+
+
+def test_codemods_loaded_on_demand(mocker):
+    module = mocker.MagicMock()
+    module.SecureRandom.id = "pixee:python/secure-random"
+    import_module = mocker.patch("importlib.import_module", return_value=module)
+    registry = CodemodRegistry()
+    registry.add_codemod_collection(
+        CodemodCollection(
+            origin="pixee",
+            codemods=[
+                CodemodEntry(
+                    "pixee:python/secure-random", "some.module", "SecureRandom"
+                ),
+                CodemodEntry("pixee:python/url-sandbox", "other.module", "UrlSandbox"),
+            ],
+        )
+    )
+
+    assert registry.ids == ["pixee:python/secure-random", "pixee:python/url-sandbox"]
+    assert sorted(registry.default_include_paths) == ["**/*.py", "*.py"]
+    import_module.assert_not_called()
+
+    assert registry.match_codemods(["pixee:python/secure-random"]) == [
+        module.SecureRandom
+    ]
+    assert registry.match_codemods(["pixee:python/secure-random"]) == [
+        module.SecureRandom
+    ]
+    import_module.assert_called_once_with("some.module")
+
+
+def test_codemod_entry_wrong_id(mocker):
+    module = mocker.MagicMock()
+    module.SecureRandom.id = "pixee:python/secure-random"
+    mocker.patch("importlib.import_module", return_value=module)
+
+    with pytest.raises(ValueError):
+        CodemodEntry("pixee:python/other", "some.module", "SecureRandom").load()
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        entry
+        for collection in (
+            core_registry,
+            sonar_registry,
+            semgrep_registry,
+            defectdojo_registry,
+        )
+        for entry in collection.codemods
+    ],
+    ids=lambda entry: entry.id,
+)
+def test_core_manifest(entry):
+    codemod = entry.load()
+
+    assert codemod.origin == entry.origin
+    assert list(codemod.default_extensions) == list(entry.default_extensions)
+
+
+def test_all_tool_rules():
+    rules = load_registered_codemods().all_tool_rules
+
+    assert "python.flask.security.injection.ssrf-requests.ssrf-requests" in rules
@@ -0,0 +1,69 @@
+import os
+
+from codemodder.result import ResultSet
+from codemodder.result_cache import ResultSetCache
+
+
+class TestResultSetCache:
+    def test_shared_result_set(self, tmp_path):
+        sarif = tmp_path / "results.sarif"
+        sarif.write_text("{}")
+        cache = ResultSetCache()
+        loaded = []
+
+        def load():
+            loaded.append(ResultSet())
+            return loaded[-1]
+
+        first = cache.get("tool", [sarif], load)
+        second = cache.get("tool", [str(sarif)], load)
+
+        assert first is second
+        assert len(loaded) == 1
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_keyed_by_tool(self, tmp_path):
+        sarif = tmp_path / "results.sarif"
+        sarif.write_text("{}")
+        cache = ResultSetCache()
+
+        assert cache.get("codeql", [sarif], ResultSet) is not cache.get(
+            "semgrep", [sarif], ResultSet
+        )
+
+    def test_rewritten_in_place(self, tmp_path):
+        sarif = tmp_path / "results.sarif"
+        sarif.write_text("{}")
+        cache = ResultSetCache()
+        first = cache.get("tool", [sarif], ResultSet)
+
+        sarif.write_text('{"runs": []}')
+
+        assert cache.get("tool", [sarif], ResultSet) is not first
+        assert cache.misses == 2
+
+    def test_touched(self, tmp_path):
+        sarif = tmp_path / "results.sarif"
+        sarif.write_text("{}")
+        cache = ResultSetCache()
+        first = cache.get("tool", [sarif], ResultSet)
+
+        stat = sarif.stat()
+        os.utime(sarif, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.get("tool", [sarif], ResultSet) is first
+
+    def test_bounded(self, tmp_path):
+        cache = ResultSetCache(max_entries=2)
+        files = []
+        for name in ("first", "second", "third"):
+            files.append(tmp_path / f"{name}.sarif")
+            files[-1].write_text("{}")
+
+        first = cache.get("tool", [files[0]], ResultSet)
+        cache.get("tool", [files[1]], ResultSet)
+        cache.get("tool", [files[2]], ResultSet)
+
+        assert len(cache) == 2
+        assert cache.get("tool", [files[0]], ResultSet) is not first
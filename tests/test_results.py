@@ -336,3 +336,43 @@ class TestResults:
         result = result_set.result_by_finding_id(uuid)
         assert result is not None
         assert result.finding.rule.id == "python:fake.rule.name"
+
+    def test_files_for_rules(self, tmpdir, mocker):
+        def issue(rule, component):
+            return {
+                "rule": rule,
+                "status": "OPEN",
+                "component": component,
+                "textRange": {
+                    "startLine": 1,
+                    "endLine": 1,
+                    "startOffset": 1,
+                    "endOffset": 1,
+                },
+            }
+
+        issues = {
+            "issues": [
+                issue("python:S5659", "code.py"),
+                issue("python:S5659", "pkg/../other.py"),
+                issue("python:S1234", "pkg/module.py"),
+                issue("python:S5678", "ignored.py"),
+            ]
+        }
+        sonar_json = Path(tmpdir) / "sonar1.json"
+        sonar_json.write_text(json.dumps(issues))
+        context = mocker.MagicMock(directory=Path("/project"))
+
+        result_set = SonarResultSet.from_json(sonar_json)
+
+        assert result_set.files_for_rules(
+            context, ["python:S5659", "python:S1234"]
+        ) == {
+            Path("/project/code.py"),
+            Path("/project/other.py"),
+            Path("/project/pkg/module.py"),
+        }
+        assert result_set.files_for_rules(context, ["python:S0000"]) == set()
+        assert result_set.results_for_rule_and_file(
+            context, "python:S5659", Path("/project/other.py")
+        )
@@ -1,3 +1,5 @@
+import json
+import logging
 import subprocess
 from pathlib import Path
 
@@ -6,7 +8,14 @@ from pydantic import ValidationError
 from sarif_pydantic import Sarif
 
 from codemodder.codemods.semgrep import process_semgrep_findings
-from codemodder.sarifs import detect_sarif_tools
+from codemodder.sarifs import (
+    SarifDocumentCache,
+    detect_sarif_tools,
+    estimate_memory_size,
+    iter_document_runs,
+    iter_run_results,
+    iter_sarif_runs,
+)
 from codemodder.semgrep import SemgrepResult, SemgrepResultSet
 
 
@@ -124,6 +133,59 @@ class TestSarifProcessing:
             detect_sarif_tools([bad_json])
         assert f"Invalid SARIF file: {str(bad_json)}" in caplog.text
 
+    @pytest.mark.parametrize("read_size", [7, 1024 * 1024])
+    @pytest.mark.parametrize(
+        "sarif_file",
+        [
+            Path("tests") / "samples" / "semgrep.sarif",
+            Path("tests") / "samples" / "webgoat_v8.2.0_codeql.sarif",
+        ],
+    )
+    def test_iter_sarif_runs(self, mocker, sarif_file, read_size):
+        mocker.patch("codemodder.sarifs.SARIF_READ_SIZE", read_size)
+        data = Sarif.model_validate_json(sarif_file.read_text(encoding="utf-8-sig"))
+
+        runs = list(iter_sarif_runs(sarif_file))
+
+        assert len(runs) == len(data.runs)
+        for (sarif_run, results), expected in zip(runs, data.runs):
+            assert sarif_run.tool == expected.tool
+            assert sarif_run.results is None
+            assert list(iter_run_results(results)) == expected.results
+
+    def test_iter_sarif_runs_truncated(self, tmpdir):
+        sarif_file = Path("tests") / "samples" / "semgrep.sarif"
+        truncated = Path(tmpdir) / "truncated.sarif"
+        truncated.write_text(sarif_file.read_text(encoding="utf-8")[:-10])
+
+        with pytest.raises(ValidationError):
+            list(iter_sarif_runs(truncated))
+
+    @pytest.mark.parametrize(
+        "sarif_file",
+        [
+            Path("tests") / "samples" / "semgrep.sarif",
+            Path("tests") / "samples" / "webgoat_v8.2.0_codeql.sarif",
+        ],
+    )
+    def test_iter_document_runs(self, sarif_file):
+        document = json.loads(sarif_file.read_text(encoding="utf-8-sig"))
+
+        assert list(iter_document_runs(document)) == list(iter_sarif_runs(sarif_file))
+
+    def test_result_set_from_sarif_document(self):
+        sarif_file = Path("tests") / "samples" / "semgrep.sarif"
+        document = json.loads(sarif_file.read_text(encoding="utf-8"))
+
+        results = SemgrepResultSet.from_sarif_document(document, truncate_rule_id=True)
+
+        assert results == SemgrepResultSet.from_sarif(sarif_file, truncate_rule_id=True)
+        assert results.tools
+
+    def test_bad_sarif_document(self):
+        with pytest.raises(ValidationError):
+            list(iter_document_runs({"version": "2.1.0"}))
+
     def test_bad_sarif_no_runs_data(self, tmpdir, caplog):
         bad_json = tmpdir / "bad.sarif"
         data = """
@@ -157,3 +219,88 @@ class TestSarifProcessing:
         result_set = process_semgrep_findings(tuple([str(sarif_file)]))
         assert result_set.tools
         assert result_set.tools[0]["driver"]["rules"]
+
+
+class TestSarifDocumentCache:
+    def test_reuse_detected_document(self, tmpdir, caplog):
+        caplog.set_level(logging.DEBUG, logger="codemodder")
+        sarif_file = Path(tmpdir) / "semgrep.sarif"
+        sarif_file.write_text(
+            (Path("tests") / "samples" / "semgrep.sarif").read_text(encoding="utf-8")
+        )
+        documents = SarifDocumentCache()
+
+        assert detect_sarif_tools([sarif_file], documents)["semgrep"] == [sarif_file]
+        results = SemgrepResultSet.from_sarif(sarif_file, documents=documents)
+
+        assert documents.hits == 1
+        assert f"reusing parsed SARIF file {sarif_file}" in caplog.text
+        assert results == SemgrepResultSet.from_sarif(sarif_file)
+
+    def test_changed_document(self, tmpdir):
+        sarif_file = Path(tmpdir) / "semgrep.sarif"
+        sarif_file.write_text(
+            (Path("tests") / "samples" / "semgrep.sarif").read_text(encoding="utf-8")
+        )
+        documents = SarifDocumentCache()
+        documents.load(sarif_file)
+
+        sarif_file.write_text(
+            '{"version": "2.1.0", "runs": [{"tool": {"driver": {"name": "Semgrep"}}}]}'
+        )
+
+        assert not SemgrepResultSet.from_sarif(sarif_file, documents=documents)
+        assert documents.hits == 0
+
+    def test_evicted_once_results_are_built(self):
+        sarif_file = Path("tests") / "samples" / "semgrep.sarif"
+        documents = SarifDocumentCache()
+        documents.load(sarif_file)
+
+        SemgrepResultSet.from_sarif(sarif_file, documents=documents)
+        SemgrepResultSet.from_sarif(sarif_file, documents=documents)
+
+        # The second result set is streamed from the file again
+        assert documents.hits == 1
+        assert documents.misses == 2
+        assert documents._total_bytes == 0
+
+    def test_budget_estimates_memory_size(self):
+        sarif_file = Path("tests") / "samples" / "semgrep.sarif"
+        documents = SarifDocumentCache(max_bytes=sarif_file.stat().st_size)
+
+        documents.load(sarif_file)
+        documents.load(sarif_file)
+
+        assert documents.hits == 0
+
+        documents = SarifDocumentCache(
+            max_bytes=estimate_memory_size(sarif_file.stat().st_size)
+        )
+        documents.load(sarif_file)
+        documents.load(sarif_file)
+
+        assert documents.hits == 1
+
+    def test_too_large(self):
+        sarif_file = Path("tests") / "samples" / "semgrep.sarif"
+        documents = SarifDocumentCache(max_bytes=1)
+
+        documents.load(sarif_file)
+        documents.load(sarif_file)
+
+        assert documents.hits == 0
+        assert documents.misses == 2
+
+    def test_detect_too_large(self, mocker):
+        sarif_file = Path("tests") / "samples" / "semgrep.sarif"
+        documents = SarifDocumentCache(max_bytes=1)
+        load = mocker.spy(documents, "load")
+
+        assert detect_sarif_tools([sarif_file], documents) == detect_sarif_tools(
+            [sarif_file]
+        )
+
+        # The document is only streamed for its tool data and never parsed in full
+        load.assert_not_called()
+        assert documents.hits == 0
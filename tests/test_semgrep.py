@@ -1,11 +1,30 @@
+import hashlib
+import itertools
+import subprocess
+import tempfile
 from pathlib import Path
 
+import mock
 import pytest
+import yaml
 from sarif_pydantic import Sarif
 
-from codemodder.codemods.semgrep import SemgrepSarifFileDetector
+from codemodder.codemods.semgrep import (
+    SemgrepRuleDetector,
+    SemgrepSarifFileDetector,
+    semgrep_rule_file,
+)
+from codemodder.codetf import ChangeSet
 from codemodder.context import CodemodExecutionContext
-from codemodder.semgrep import SemgrepResultSet, SemgrepSarifToolDetector
+from codemodder.result_cache import ResultSetCache
+from codemodder.sarifs import SarifDocumentCache
+from codemodder.semgrep import (
+    InternalSemgrepResultSet,
+    SemgrepResultSet,
+    SemgrepSarifToolDetector,
+    run,
+    shard_files,
+)
 
 SAMPLE_DATA_PATH = Path(__file__).parent / "samples"
 
@@ -28,6 +47,8 @@ def test_semgrep_sarif_codemode_detector(mocker):
     detector = SemgrepSarifFileDetector()
 
     context = mocker.MagicMock(spec=CodemodExecutionContext)
+    context.sarif_documents = SarifDocumentCache()
+    context.result_sets = ResultSetCache()
     context.tool_result_files_map = {
         "semgrep": [SAMPLE_DATA_PATH / "pygoat.semgrep.sarif.json"]
     }
@@ -38,3 +59,167 @@ def test_semgrep_sarif_codemode_detector(mocker):
         "python.django.security.audit.secure-cookies.django-secure-set-cookie"
         in results
     )
+
+
+def _prefilter_results(mocker, files):
+    results = InternalSemgrepResultSet()
+    for file in files:
+        results.add_result(
+            mocker.MagicMock(rule_id="foo", locations=[mocker.MagicMock(file=file)])
+        )
+    results.add_result(
+        mocker.MagicMock(rule_id="bar", locations=[mocker.MagicMock(file=files[0])])
+    )
+    results.store_tool_data({"driver": {"name": "Semgrep OSS"}})
+    return results
+
+
+def _context(tmp_path, dry_run):
+    return CodemodExecutionContext(
+        directory=tmp_path,
+        dry_run=dry_run,
+        verbose=False,
+        registry=mock.MagicMock(),
+        providers=mock.MagicMock(),
+        repo_manager=mock.MagicMock(),
+    )
+
+
+@pytest.mark.parametrize("dry_run", [True, False])
+def test_semgrep_rule_detector_uses_prefilter(mocker, tmp_path, dry_run):
+    semgrep_run = mocker.patch("codemodder.codemods.semgrep.semgrep_run")
+    context = _context(tmp_path, dry_run)
+    context.semgrep_prefilter_results = _prefilter_results(
+        mocker, [tmp_path / "a.py", tmp_path / "b.py"]
+    )
+
+    results = SemgrepRuleDetector("- pattern: eval(...)").apply("foo", context)
+
+    semgrep_run.assert_not_called()
+    assert isinstance(results, InternalSemgrepResultSet)
+    assert results.all_rule_ids() == ["foo"]
+    assert sorted(results.files_for_rule("foo")) == [
+        tmp_path / "a.py",
+        tmp_path / "b.py",
+    ]
+    assert results.tools == [{"driver": {"name": "Semgrep OSS"}}]
+
+
+def test_semgrep_rule_detector_rescans_modified_files(mocker, tmp_path):
+    rescanned = InternalSemgrepResultSet()
+    rescanned.add_result(
+        mocker.MagicMock(
+            rule_id="foo", locations=[mocker.MagicMock(file=tmp_path / "b.py")]
+        )
+    )
+    semgrep_run = mocker.patch(
+        "codemodder.codemods.semgrep.semgrep_run", return_value=rescanned
+    )
+    context = _context(tmp_path, dry_run=False)
+    context.semgrep_prefilter_results = _prefilter_results(
+        mocker, [tmp_path / "a.py", tmp_path / "b.py"]
+    )
+    context.add_changesets("other", [ChangeSet(path="b.py", diff="")])
+
+    results = SemgrepRuleDetector("- pattern: eval(...)").apply("foo", context)
+
+    semgrep_run.assert_called_once()
+    assert semgrep_run.call_args.args[2] == [tmp_path / "b.py"]
+    assert sorted(results.files_for_rule("foo")) == [
+        tmp_path / "a.py",
+        tmp_path / "b.py",
+    ]
+    assert len(results.results_for_rule["foo"]) == 2
+    assert rescanned.results_for_rule["foo"][0] in results.results_for_rule["foo"]
+
+
+@pytest.mark.parametrize("shards", [1, 2, 3])
+def test_shard_files(tmp_path, mocker, shards):
+    mocker.patch("codemodder.semgrep.SEMGREP_MIN_SHARD_FILES", 2)
+    files = []
+    for size in range(7):
+        files.append(tmp_path / f"file{size}.py")
+        files[-1].write_text("x" * size)
+
+    result = shard_files(files, shards)
+
+    assert len(result) == min(shards, 3)
+    assert sorted(itertools.chain.from_iterable(result)) == sorted(files)
+    assert max(map(len, result)) - min(map(len, result)) <= 1
+
+
+def test_shard_files_command_line_length(mocker):
+    mocker.patch("codemodder.semgrep.SEMGREP_SHARD_ARGS_LENGTH", 100)
+    files = [Path(f"/some/directory/file{i}.py") for i in range(20)]
+
+    result = shard_files(files, 1)
+
+    # 510 characters of paths
+    assert len(result) == 6
+    assert max(map(len, result)) - min(map(len, result)) <= 1
+    assert shard_files([], 4) == []
+
+
+def test_semgrep_run_sharded(tmp_path, mocker):
+    mocker.patch("codemodder.semgrep.SEMGREP_MIN_SHARD_FILES", 1)
+    rule = tmp_path / "rule.yaml"
+    rule.write_text(
+        "rules:\n- id: rule\n  pattern: eval(...)\n  message: eval\n  severity: WARNING\n  languages: [python]\n"
+    )
+    files = [tmp_path / f"file{i}.py" for i in range(4)]
+    for file in files:
+        file.write_text("eval(x)\neval(x)\n")
+    context = _context(tmp_path, dry_run=True)
+
+    unsharded = run(context, [rule], files)
+    context.max_workers = 2
+    spy = mocker.spy(subprocess, "run")
+    sharded = run(context, [rule], files)
+
+    assert spy.call_count == 2
+    assert all("--jobs" in call.args[0] for call in spy.call_args_list)
+    assert sorted(sharded.files_for_rule("rule")) == files
+    assert len(sharded.results_for_rule["rule"]) == 8
+    assert sorted(r.finding_id for r in sharded.results_for_rule["rule"]) == sorted(
+        r.finding_id for r in unsharded.results_for_rule["rule"]
+    )
+    assert len({r.finding_id for r in sharded.results_for_rule["rule"]}) == 8
+
+
+def test_semgrep_rule_file_reused(mocker):
+    mkstemp = mocker.spy(tempfile, "mkstemp")
+    detector = SemgrepRuleDetector("- pattern: hash(...)\n")
+
+    first = detector.get_yaml_files("hash-rule")
+    second = SemgrepRuleDetector("- pattern: hash(...)\n").get_yaml_files("hash-rule")
+
+    assert first == second
+    assert mkstemp.call_count == 1
+    assert yaml.safe_load(first[0].read_text()) == {
+        "rules": [
+            {
+                "id": "hash-rule",
+                "pattern": "hash(...)",
+                "message": "Semgrep found a match",
+                "severity": "WARNING",
+                "languages": ["python"],
+            }
+        ]
+    }
+
+
+def test_semgrep_rule_file_merged():
+    first = SemgrepRuleDetector("- pattern: first(...)\n")
+    second = SemgrepRuleDetector(
+        "rules:\n  - id: explicit-id\n    pattern: second(...)\n"
+    )
+    rules = [*first.get_rules("first"), *second.get_rules("second")]
+
+    path = semgrep_rule_file(rules)
+
+    assert path == semgrep_rule_file(reversed(rules))
+    assert path.name == f"{hashlib.sha256(path.read_bytes()).hexdigest()}.yaml"
+    assert [rule["id"] for rule in yaml.safe_load(path.read_text())["rules"]] == [
+        "explicit-id",
+        "first",
+    ]
@@ -0,0 +1,196 @@
+import importlib.metadata
+import json
+import subprocess
+
+import mock
+import pytest
+
+from codemodder.context import CodemodExecutionContext
+from codemodder.semgrep import run as semgrep_run
+from codemodder.semgrep_cache import SemgrepResultCache, rules_digest, semgrep_version
+
+TOOL = {"driver": {"name": "Semgrep OSS"}}
+
+
+def _sarif(files):
+    return {
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": TOOL,
+                "results": [
+                    {
+                        "ruleId": "rule",
+                        "locations": [
+                            {"physicalLocation": {"artifactLocation": {"uri": str(f)}}}
+                        ],
+                    }
+                    for f in files
+                    if "eval" in f.read_text()
+                ],
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def files(tmp_path):
+    files = [tmp_path / "a.py", tmp_path / "b.py", tmp_path / "c.py"]
+    files[0].write_text("eval(x)\n")
+    files[1].write_text("x = 1\n")
+    files[2].write_text("eval(y)\n")
+    return files
+
+
+def _uris(sarif):
+    return sorted(
+        result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"]
+        for result in sarif["runs"][0]["results"]
+    )
+
+
+class TestSemgrepResultCache:
+    def test_only_changed_files_scanned(self, tmp_path, files):
+        scan = mock.MagicMock(side_effect=_sarif)
+        cache = SemgrepResultCache(tmp_path / "cache")
+
+        first = cache.get("rules", files, scan)
+        assert scan.call_args.args[0] == files
+        assert _uris(first) == [str(files[0]), str(files[2])]
+
+        files[1].write_text("eval(z)\n")
+        # A fresh cache reads what was saved by the previous one
+        cache = SemgrepResultCache(tmp_path / "cache")
+        second = cache.get("rules", files, scan)
+
+        assert scan.call_count == 2
+        assert scan.call_args.args[0] == [files[1]]
+        assert _uris(second) == sorted(str(f) for f in files)
+        assert second["runs"][0]["tool"] == TOOL
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_all_cached(self, tmp_path, files):
+        scan = mock.MagicMock(side_effect=_sarif)
+        cache = SemgrepResultCache(tmp_path / "cache")
+        cache.get("rules", files, scan)
+
+        sarif = cache.get("rules", files[:2], scan)
+
+        scan.assert_called_once()
+        assert _uris(sarif) == [str(files[0])]
+        assert sarif["runs"][0]["tool"] == TOOL
+
+    def test_keyed_by_rules(self, tmp_path, files):
+        scan = mock.MagicMock(side_effect=_sarif)
+        cache = SemgrepResultCache(tmp_path / "cache")
+        cache.get("rules", files, scan)
+        cache.get("other-rules", files, scan)
+
+        assert scan.call_count == 2
+        assert sorted(p.name for p in (tmp_path / "cache" / "semgrep").iterdir()) == [
+            "other-rules.json",
+            "rules.json",
+        ]
+
+    def test_unexpected_results_not_cached(self, tmp_path, files):
+        def scan(to_scan):
+            return _sarif(to_scan + [files[2]])
+
+        cache = SemgrepResultCache(tmp_path / "cache")
+        cache.get("rules", files[:2], scan)
+
+        assert not (tmp_path / "cache" / "semgrep").exists()
+
+    def test_unreadable_cache(self, tmp_path, files):
+        (tmp_path / "cache" / "semgrep").mkdir(parents=True)
+        (tmp_path / "cache" / "semgrep" / "rules.json").write_text("{not json")
+        scan = mock.MagicMock(side_effect=_sarif)
+
+        sarif = SemgrepResultCache(tmp_path / "cache").get("rules", files, scan)
+
+        assert _uris(sarif) == [str(files[0]), str(files[2])]
+
+    def test_unrequested_files_dropped(self, tmp_path, files):
+        scan = mock.MagicMock(side_effect=_sarif)
+        SemgrepResultCache(tmp_path / "cache").get("rules", files, scan)
+
+        files[0].write_text("eval(z)\n")
+        cache = SemgrepResultCache(tmp_path / "cache")
+        cache.get("rules", files[:2], scan)
+
+        saved = json.loads(
+            (tmp_path / "cache" / "semgrep" / "rules.json").read_text("utf-8")
+        )
+        assert sorted(saved["files"]) == [str(files[0]), str(files[1])]
+
+    def test_not_locked_during_scan(self, tmp_path, files):
+        cache = SemgrepResultCache(tmp_path / "cache")
+
+        def scan(to_scan):
+            assert not cache._lock.locked()
+            return _sarif(to_scan)
+
+        sarif = cache.get("rules", files, scan)
+
+        assert _uris(sarif) == [str(files[0]), str(files[2])]
+
+
+def test_semgrep_version_from_command(mocker, caplog):
+    mocker.patch(
+        "importlib.metadata.version",
+        side_effect=importlib.metadata.PackageNotFoundError,
+    )
+    run = mocker.patch(
+        "subprocess.run",
+        return_value=subprocess.CompletedProcess([], 0, stdout="1.2.3\n"),
+    )
+    semgrep_version.cache_clear()
+    try:
+        assert semgrep_version() == "1.2.3"
+        assert run.call_args.args[0] == ["semgrep", "--version"]
+
+        run.side_effect = FileNotFoundError("semgrep")
+        semgrep_version.cache_clear()
+        assert semgrep_version() is None
+        assert "could not determine the semgrep version" in caplog.text
+    finally:
+        semgrep_version.cache_clear()
+
+
+def test_rules_digest(tmp_path):
+    rule, same_rule, other_rule = (tmp_path / name for name in "abc")
+    rule.write_text("rules: []")
+    same_rule.write_text("rules: []")
+    other_rule.write_text("rules: [{}]")
+
+    assert rules_digest("1.0", [rule]) == rules_digest("1.0", [same_rule])
+    assert rules_digest("1.0", [rule]) != rules_digest("1.0", [other_rule])
+    assert rules_digest("1.0", [rule]) != rules_digest("1.1", [rule])
+
+
+@pytest.mark.skipif(semgrep_version() is None, reason="semgrep is not installed")
+def test_run_with_cache(tmp_path, files, mocker):
+    rule = tmp_path / "rule.yaml"
+    rule.write_text(
+        "rules:\n- id: rule\n  pattern: eval(...)\n  message: eval\n  severity: WARNING\n  languages: [python]\n"
+    )
+    context = CodemodExecutionContext(
+        directory=tmp_path,
+        dry_run=True,
+        verbose=False,
+        registry=mock.MagicMock(),
+        providers=mock.MagicMock(),
+        repo_manager=mock.MagicMock(),
+    )
+    context.semgrep_cache = SemgrepResultCache(tmp_path / "cache")
+    spy = mocker.spy(subprocess, "run")
+
+    first = semgrep_run(context, [rule], files)
+    second = semgrep_run(context, [rule], files)
+
+    assert spy.call_count == 1
+    assert sorted(first.files_for_rule("rule")) == [files[0], files[2]]
+    assert sorted(second.files_for_rule("rule")) == [files[0], files[2]]
+    assert [r.finding_id for r in first.results_for_rule["rule"]] == [
+        r.finding_id for r in second.results_for_rule["rule"]
+    ]